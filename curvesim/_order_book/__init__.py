@@ -3,12 +3,15 @@ Contains order_book function for computing and optionally plotting orderbook
 representations of exchange rates between two tokens.
 """
 
+from math import ceil
+
 import matplotlib.pyplot as plt
 from pandas import DataFrame
 
 from curvesim.pool import CurveMetaPool
 
 
+# pylint: disable-next=too-many-locals
 def order_book(pool, i, j, *, width=0.1, resolution=10**23, use_fee=True, show=True):
     """
     Computes and optionally plots an orderbook representation of exchange rates
@@ -16,8 +19,8 @@ def order_book(pool, i, j, *, width=0.1, resolution=10**23, use_fee=True, show=T
 
     Parameters
     ----------
-    pool : CurvePool or CurveMetaPool
-        A pool object to compute the bonding curve for.
+    pool : CurvePool, CurveMetaPool, or CurveCryptoPool
+        A pool object to compute the order book for.
 
     i : int
         The index of the "base" token to compute exchange rates for.
@@ -49,43 +52,30 @@ def order_book(pool, i, j, *, width=0.1, resolution=10**23, use_fee=True, show=T
         DataFrame of prices and depths for each point on the "ask" side of the orderbook
 
     """
-    snapshot = pool.get_snapshot()
     i, j, functions = _orderbook_args(pool, i, j)
-    get_price, exchange = functions
+    get_price, get_dy_batch = functions
 
     # Bids
-    depth = 0
     price = get_price(i, j, use_fee=use_fee)
+    min_price = price * (1 - width)
 
-    bids = [(price, depth)]
-
-    while bids[-1][0] > bids[0][0] * (1 - width):
-        depth += resolution
-
-        dy, _ = exchange(i, j, depth)
-        price = get_price(i, j, use_fee=use_fee)
-
+    bids = [(price, 0)]
+    for depth, _, price in _quote_depths(
+        get_dy_batch, i, j, resolution, use_fee, price, min_price
+    ):
         bids.append((price, depth / 10**18))
 
-        # Return to initial state
-        pool.revert_to_snapshot(snapshot)
-
     # Asks
-    depth = 0
     price = get_price(j, i, use_fee=use_fee)
+    max_price = 1 / price * (1 + width)
 
-    asks = [(1 / price, depth)]
-
-    while asks[-1][0] < asks[0][0] * (1 + width):
-        depth += resolution
-        dy, _ = exchange(j, i, depth)
-        price = get_price(j, i, use_fee=use_fee)
-
+    asks = [(1 / price, 0)]
+    # pylint: disable-next=arguments-out-of-order
+    for _, dy, price in _quote_depths(
+        get_dy_batch, j, i, resolution, use_fee, price, 1 / max_price
+    ):
         asks.append((1 / price, dy / 10**18))
 
-        # Return to initial state
-        pool.revert_to_snapshot(snapshot)
-
     # Format DataFrames
     bids = DataFrame(bids, columns=["price", "depth"]).set_index("price")
     asks = DataFrame(asks, columns=["price", "depth"]).set_index("price")
@@ -100,11 +90,41 @@ def order_book(pool, i, j, *, width=0.1, resolution=10**23, use_fee=True, show=T
     return bids, asks
 
 
+# pylint: disable-next=too-many-arguments
+def _quote_depths(get_dy_batch, i, j, resolution, use_fee, price, stop_price):
+    """
+    Yield (depth, dy, post-trade price) for increasing multiples of
+    `resolution`, up to the first with a price at or below `stop_price`.
+
+    Depths are quoted in batches that double in size, but are clamped to
+    the number of points left until `stop_price`, extrapolated from the
+    last two prices.  This avoids quoting trades far past the stopping
+    point, which may be more than the pool can handle.
+    """
+    n_quoted = 0
+    batch_size = 1
+    while True:
+        depths = [(n_quoted + k + 1) * resolution for k in range(batch_size)]
+        dys, _, prices = get_dy_batch(i, j, depths, use_fee=use_fee)
+        for depth, dy, new_price in zip(depths, dys, prices):
+            yield depth, dy, new_price
+            if new_price <= stop_price:
+                return
+
+        n_quoted += batch_size
+        last_price = prices[-1]
+        step = (prices[-2] if batch_size > 1 else price) - last_price
+        batch_size *= 2
+        if step > 0:
+            batch_size = min(batch_size, ceil((last_price - stop_price) / step))
+        price = last_price
+
+
 def _orderbook_args(pool, i, j):
     if isinstance(pool, CurveMetaPool):
         # Set functions/parameters
         get_price = pool.dydx
-        exchange = pool.exchange_underlying
+        get_dy_batch = pool.get_dy_underlying_batch
 
         # Price function closure if bp_token used
         def get_meta_price(i, j, use_fee):
@@ -116,15 +136,27 @@ def _orderbook_args(pool, i, j):
         if i == "bp_token":
             i = pool.max_coin
             get_price = get_meta_price
-            exchange = pool.exchange
+            get_dy_batch = pool.get_dy_batch
 
         if j == "bp_token":
             j = pool.max_coin
             get_price = get_meta_price
-            exchange = pool.exchange
+            get_dy_batch = pool.get_dy_batch
+
+    elif hasattr(pool, "get_dy_batch"):
+        get_price = pool.dydx
+        get_dy_batch = pool.get_dy_batch
 
     else:
+        # cryptoswap pools quote each size with an exchange on a snapshot
         get_price = pool.dydx
-        exchange = pool.exchange
 
-    return i, j, (get_price, exchange)
+        def get_dy_batch(i, j, dxs, use_fee):
+            quotes = []
+            for dx in dxs:
+                with pool.use_snapshot_context():
+                    dy, fee = pool.exchange(i, j, dx)
+                    quotes.append((dy, fee, get_price(i, j, use_fee=use_fee)))
+            return zip(*quotes)
+
+    return i, j, (get_price, get_dy_batch)
@@ -2,6 +2,12 @@
 Iterators that generate pools with updated parameters for each simulation run.
 """
 
-__all__ = ["ParameterizedPoolIterator"]
+__all__ = [
+    "AdaptivePoolSampler",
+    "ParameterizedPoolIterator",
+    "QuasiRandomPoolIterator",
+]
 
+from .adaptive import AdaptivePoolSampler
 from .parameterized_pool_iterator import ParameterizedPoolIterator
+from .quasi_random import QuasiRandomPoolIterator
@@ -0,0 +1,393 @@
+"""
+Parameter sampler that proposes parameters adaptively, based on the results
+of completed runs.
+
+Grids grow exponentially with the number of parameters, so cryptoswap's
+parameters (A, gamma, mid_fee, out_fee, fee_gamma) can't be gridded densely.
+:class:`AdaptivePoolSampler` instead fits a Gaussian-process surrogate model
+to the objective values of completed runs, and proposes batches of parameters
+with the highest expected improvement over the best run so far.
+
+Each iteration over the sampler yields the current batch, so a batch runs in
+parallel through :func:`~curvesim.pipelines.run_pipeline`; results are then
+passed back with :meth:`AdaptivePoolSampler.tell`.
+"""
+from abc import abstractmethod
+from copy import deepcopy
+
+import numpy as np
+from pandas import DataFrame
+from scipy.stats import norm
+
+from curvesim.exceptions import ParameterSamplerError
+from curvesim.logging import get_logger
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+    SimCurveRaiPool,
+)
+from curvesim.templates import ParameterSampler
+
+from .bounds import ParameterBounds
+from .pool_mixins import CurveCryptoPoolMixin, CurveMetaPoolMixin, CurvePoolMixin
+
+logger = get_logger(__name__)
+
+
+# pylint: disable-next=too-many-instance-attributes
+class AdaptivePoolSampler(ParameterSampler):
+    """
+    Proposes batches of pool parameters within bounds, adapting to the
+    objective values of previous batches.
+    """
+
+    # pylint: disable-next=unused-argument
+    def __new__(cls, pool, bounds, *args, pool_map=None, **kwargs):
+        """
+        Returns a pool-specific AdaptivePoolSampler subclass.
+
+        Parameters
+        ----------
+        pool_map : dict, optional
+            A mapping between pool types and subclasses. Overrides default mapping.
+
+        Returns
+        -------
+            :class:`.AdaptivePoolSampler` subclass
+
+        """
+        pool_map = pool_map or DEFAULT_POOL_MAP
+
+        if cls is not AdaptivePoolSampler:
+            return super().__new__(cls)
+
+        try:
+            pool_type = type(pool)
+            subclass = pool_map[pool_type]
+
+        except KeyError as e:
+            pool_type_name = pool_type.__name__
+            raise ParameterSamplerError(
+                f"No subclass for pool type `{pool_type_name}` found in "
+                "AdaptivePoolSampler pool map."
+            ) from e
+
+        return super().__new__(subclass)
+
+    # pylint: disable-next=too-many-arguments,unused-argument
+    def __init__(
+        self,
+        pool,
+        bounds,
+        fixed_params=None,
+        *,
+        batch_size=4,
+        n_initial=None,
+        maximize=True,
+        log_scale=None,
+        n_candidates=1000,
+        seed=None,
+        pool_map=None,
+    ):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.templates.SimPool`
+            The "template" pool that will have its parameters modified.
+
+        bounds : dict
+            Lower and upper bound for each parameter to optimize.  Parameters
+            with integer bounds are rounded to integers.
+
+            Example
+            --------
+            .. code-block ::
+
+                {"A": (10, 10000), "fee": (10**6, 10**8)}
+
+        fixed_params : dict, optional
+            Pool parameters set before all simulations.
+
+        batch_size : int, default=4
+            Number of parameter sets proposed per batch, e.g. the number of
+            cores to run them on.
+
+        n_initial : int, optional
+            Number of random parameter sets to run before proposing from the
+            surrogate model.  Defaults to twice the number of parameters, and
+            at least `batch_size`.
+
+        maximize : bool, default=True
+            Whether higher objective values are better.
+
+        log_scale : iterable of str, optional
+            Parameters to search on a log scale.  Defaults to all parameters
+            with positive bounds, since pool parameters typically span orders
+            of magnitude.
+
+        n_candidates : int, default=1000
+            Number of random points the expected improvement is evaluated at
+            to choose each proposal.
+
+        seed : int, optional
+            Seed for the random number generator.
+
+        pool_map : dict, optional
+            See __new__ method.
+        """
+        self._validate_pool_type(pool)
+        self.pool_template = deepcopy(pool)
+        self.set_pool_attributes(self.pool_template, fixed_params)
+        self._validate_attributes(self.pool_template, bounds)
+
+        self.bounds = ParameterBounds(bounds, log_scale)
+        self.batch_size = batch_size
+        self.n_initial = n_initial or max(batch_size, 2 * len(bounds))
+        self.maximize = maximize
+        self.n_candidates = n_candidates
+        self.rng = np.random.default_rng(seed)
+
+        self.observed_params = []
+        self.observed_scores = []
+        self._proposals = None
+
+    def __iter__(self):
+        """
+        Yields the current batch of proposals, proposing a new batch if the
+        last one was passed to :meth:`tell`.
+
+        Yields
+        -------
+        pool : :class:`~curvesim.templates.SimPool`
+            A pool object with the current variable parameters set.
+
+        params : dict
+            A dictionary of the pool parameters set on this iteration.
+        """
+        for params in self.proposals:
+            pool = deepcopy(self.pool_template)
+            self.set_pool_attributes(pool, params)
+            yield pool, params
+
+    @property
+    def proposals(self):
+        """The current batch of parameter sets, proposing one if needed."""
+        if self._proposals is None:
+            self._proposals = self.ask()
+        return self._proposals
+
+    def ask(self):
+        """
+        Proposes a batch of parameter sets: random ones until `n_initial`
+        runs are observed, and otherwise those with the highest expected
+        improvement under the surrogate model.
+
+        Returns
+        -------
+        list of dict
+        """
+        n_random = max(0, self.n_initial - len(self.observed_params))
+        if n_random:
+            points = self.rng.random((min(n_random, self.batch_size), len(self.bounds)))
+            return [self.bounds.to_params(x) for x in points]
+
+        return self._propose_batch()
+
+    def tell(self, scores):
+        """
+        Records the objective values of the current batch of proposals.
+
+        Parameters
+        ----------
+        scores : array-like
+            Objective value for each parameter set, in the order yielded.
+        """
+        proposals = self.proposals
+        scores = np.asarray(scores, dtype=float)
+        if len(scores) != len(proposals):
+            raise ParameterSamplerError(
+                f"Expected {len(proposals)} scores, received {len(scores)}."
+            )
+
+        self.observed_params.extend(proposals)
+        self.observed_scores.extend(scores.tolist())
+        self._proposals = None
+
+        logger.info(
+            "Best objective value after %s runs: %s",
+            len(self.observed_scores),
+            self.best[1],
+        )
+
+    @property
+    def best(self):
+        """The best parameter set observed so far and its objective value."""
+        scores = self._signed_scores()
+        if not np.isfinite(scores).any():
+            return None, None
+
+        best = int(np.argmax(np.where(np.isfinite(scores), scores, -np.inf)))
+        return self.observed_params[best], self.observed_scores[best]
+
+    @property
+    def history(self):
+        """DataFrame of observed parameter sets and their objective values."""
+        data = DataFrame(self.observed_params, columns=list(self.bounds))
+        data["score"] = self.observed_scores
+        return data
+
+    def _propose_batch(self):
+        """
+        Proposes parameter sets one at a time, assuming each proposal scores
+        the surrogate model's prediction (a "constant liar") when proposing
+        the next, so the batch is spread out.
+        """
+        x_observed = np.array([self.bounds.to_unit(p) for p in self.observed_params])
+        y_observed = self._signed_scores()
+        finite = np.isfinite(y_observed)
+        if not finite.any():
+            points = self.rng.random((self.batch_size, len(self.bounds)))
+            return [self.bounds.to_params(x) for x in points]
+
+        x_train, y_train = x_observed[finite], y_observed[finite]
+        model = _GaussianProcess(x_train, y_train)
+
+        seen = {_params_key(p) for p in self.observed_params}
+        batch = []
+        while len(batch) < self.batch_size:
+            candidates = self._candidates(x_train[np.argmax(y_train)])
+            improvement = model.expected_improvement(candidates, y_train.max())
+
+            for n in np.argsort(-improvement):
+                params = self.bounds.to_params(candidates[n])
+                if _params_key(params) not in seen:
+                    break
+            else:
+                params = self.bounds.to_params(self.rng.random(len(self.bounds)))
+
+            seen.add(_params_key(params))
+            batch.append(params)
+
+            x_new = self.bounds.to_unit(params)
+            x_train = np.vstack([x_train, x_new])
+            y_train = np.append(y_train, model.predict(x_new[None, :])[0][0])
+            model = _GaussianProcess(x_train, y_train, model.length_scale)
+
+        return batch
+
+    def _candidates(self, x_best):
+        """Random points, half uniform and half near the best point."""
+        n_dims = len(self.bounds)
+        n_local = self.n_candidates // 2
+        uniform = self.rng.random((self.n_candidates - n_local, n_dims))
+        local = x_best + self.rng.normal(0, 0.05, (n_local, n_dims))
+        return np.clip(np.vstack([uniform, local]), 0, 1)
+
+    def _signed_scores(self):
+        scores = np.array(self.observed_scores, dtype=float)
+        return scores if self.maximize else -scores
+
+    def _validate_pool_type(self, pool):
+        """Validates that the input pool is an instance of self._pool_type."""
+        if not isinstance(pool, self._pool_type):
+            input_class = pool.__class__.__name__
+            expected_class = self._pool_type.__name__
+            self_class = self.__class__.__name__
+
+            raise ParameterSamplerError(
+                f"Parameter sampler '{self_class}' only supports pool type "
+                f"'{expected_class}'; recieved '{input_class}'."
+            )
+
+    @property
+    @abstractmethod
+    def _pool_type(self):
+        """The expected pool type for an AdaptivePoolSampler subclass."""
+        raise NotImplementedError
+
+
+class _GaussianProcess:
+    """
+    Gaussian-process regression with a squared-exponential kernel, on inputs
+    in the unit hypercube and standardized outputs.
+    """
+
+    LENGTH_SCALES = (0.05, 0.1, 0.2, 0.5, 1.0)
+    NOISE = 1e-6
+
+    def __init__(self, x, y, length_scale=None):
+        self.x = x
+        self.y_mean = y.mean()
+        self.y_std = y.std() or 1.0
+        self.y = (y - self.y_mean) / self.y_std
+
+        if length_scale is None:
+            length_scale = max(self.LENGTH_SCALES, key=self._log_likelihood)
+        self.length_scale = length_scale
+        self._factor, self._alpha = self._fit(length_scale)
+
+    def predict(self, x):
+        """Returns the predicted mean and standard deviation at each point."""
+        k = self._kernel(x, self.x, self.length_scale)
+        mean = k @ self._alpha
+        v = np.linalg.solve(self._factor, k.T)
+        variance = np.clip(1 - (v**2).sum(axis=0), 1e-12, None)
+        return mean * self.y_std + self.y_mean, np.sqrt(variance) * self.y_std
+
+    def expected_improvement(self, x, y_best):
+        """Returns the expected improvement over `y_best` at each point."""
+        mean, std = self.predict(x)
+        z = (mean - y_best) / std
+        return (mean - y_best) * norm.cdf(z) + std * norm.pdf(z)
+
+    def _fit(self, length_scale):
+        k = self._kernel(self.x, self.x, length_scale)
+        factor = np.linalg.cholesky(k + self.NOISE * np.eye(len(self.x)))
+        alpha = np.linalg.solve(factor.T, np.linalg.solve(factor, self.y))
+        return factor, alpha
+
+    def _log_likelihood(self, length_scale):
+        try:
+            factor, alpha = self._fit(length_scale)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        return -0.5 * self.y @ alpha - np.log(np.diag(factor)).sum()
+
+    @staticmethod
+    def _kernel(x1, x2, length_scale):
+        distances = ((x1[:, None, :] - x2[None, :, :]) ** 2).sum(axis=-1)
+        return np.exp(-0.5 * distances / length_scale**2)
+
+
+def _params_key(params):
+    return tuple(sorted(params.items()))
+
+
+class AdaptiveCurvePoolSampler(CurvePoolMixin, AdaptivePoolSampler):
+    """
+    :class:`AdaptivePoolSampler` parameter sampler specialized
+    for Curve pools.
+    """
+
+
+class AdaptiveCurveMetaPoolSampler(CurveMetaPoolMixin, AdaptivePoolSampler):
+    """
+    :class:`AdaptivePoolSampler` parameter sampler specialized
+    for Curve meta-pools.
+    """
+
+
+class AdaptiveCurveCryptoPoolSampler(CurveCryptoPoolMixin, AdaptivePoolSampler):
+    """
+    :class:`AdaptivePoolSampler` parameter sampler specialized
+    for Curve crypto pools.
+    """
+
+
+DEFAULT_POOL_MAP = {
+    SimCurvePool: AdaptiveCurvePoolSampler,
+    SimCurveRaiPool: AdaptiveCurveMetaPoolSampler,
+    SimCurveMetaPool: AdaptiveCurveMetaPoolSampler,
+    SimCurveCryptoPool: AdaptiveCurveCryptoPoolSampler,
+}
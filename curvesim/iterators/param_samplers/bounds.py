@@ -0,0 +1,116 @@
+"""
+Bounds of continuous pool parameters, for samplers that draw parameter values
+from a range rather than a list.
+"""
+import numpy as np
+
+from curvesim.exceptions import ParameterSamplerError
+
+
+class ParameterBounds:
+    """
+    Lower and upper bounds for pool parameters, mapping points in the unit
+    hypercube to parameter values and back.
+
+    Parameters on a log scale are spaced evenly in their logarithm, and
+    parameters with integer bounds are rounded to integers.
+    """
+
+    def __init__(self, bounds, log_scale=None):
+        """
+        Parameters
+        ----------
+        bounds : dict
+            Lower and upper bound for each parameter.
+
+            Example
+            --------
+            .. code-block ::
+
+                {"A": (10, 10000), "fee": (10**6, 10**8)}
+
+        log_scale : iterable of str, optional
+            Parameters to space on a log scale.  Defaults to all parameters
+            with positive bounds, since pool parameters typically span orders
+            of magnitude.
+        """
+        if log_scale is None:
+            log_scale = [name for name, (low, _) in bounds.items() if low > 0]
+
+        self.bounds = dict(bounds)
+        self.log_scale = set(log_scale)
+        self._validate()
+
+    def __iter__(self):
+        return iter(self.bounds)
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def to_params(self, x):
+        """
+        Maps a point in the unit hypercube to parameters.
+
+        Parameters
+        ----------
+        x : array-like
+            Coordinate in [0, 1] for each parameter, in the order of `bounds`.
+
+        Returns
+        -------
+        dict
+        """
+        params = {}
+        for value, (name, (low, high)) in zip(x, self.bounds.items()):
+            if name in self.log_scale:
+                value = low * (high / low) ** value
+            else:
+                value = low + value * (high - low)
+
+            if isinstance(low, int) and isinstance(high, int):
+                value = int(round(value))
+            else:
+                value = float(value)
+            params[name] = value
+        return params
+
+    def to_unit(self, params):
+        """
+        Maps parameters to a point in the unit hypercube.
+
+        Parameters
+        ----------
+        params : dict
+            A value for each parameter.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        x = []
+        for name, (low, high) in self.bounds.items():
+            value = params[name]
+            if name in self.log_scale:
+                x.append(np.log(value / low) / np.log(high / low))
+            else:
+                x.append((value - low) / (high - low))
+        return np.array(x, dtype=float)
+
+    def _validate(self):
+        for name, (low, high) in self.bounds.items():
+            if not low < high:
+                raise ParameterSamplerError(
+                    f"Lower bound for '{name}' must be less than upper bound."
+                )
+
+        unknown = self.log_scale - set(self.bounds)
+        if unknown:
+            raise ParameterSamplerError(
+                f"Log-scale parameters have no bounds: {sorted(unknown)}"
+            )
+
+        for name in self.log_scale:
+            if self.bounds[name][0] <= 0:
+                raise ParameterSamplerError(
+                    f"Bounds for log-scale parameter '{name}' must be positive."
+                )
@@ -101,6 +101,10 @@ class ParameterizedPoolIterator(ParameterSampler):
             self.set_pool_attributes(pool, params)
             yield pool, params
 
+    def __len__(self):
+        """Returns the number of pools yielded."""
+        return len(self.parameter_sequence)
+
     def make_parameter_sequence(self, variable_params):
         """
         Returns a list of dicts for each possible combination of the input parameters.
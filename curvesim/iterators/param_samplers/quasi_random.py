@@ -0,0 +1,198 @@
+"""
+Parameter samplers that spread a fixed number of runs evenly over parameter
+ranges.
+
+A grid with `k` values for each of `d` parameters takes `k**d` runs, so a
+cryptoswap grid over A, gamma, mid_fee, out_fee, fee_gamma, and ma_half_time
+with 5 values each takes over 15,000.  :class:`QuasiRandomPoolIterator`
+instead draws `n_samples` points from a Sobol sequence or Latin hypercube,
+which cover the space far more evenly than random points, and each of whose
+projections onto a single parameter is close to evenly spaced.
+"""
+from scipy.stats import qmc
+
+from curvesim.exceptions import ParameterSamplerError
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+    SimCurveRaiPool,
+)
+
+from .bounds import ParameterBounds
+from .parameterized_pool_iterator import ParameterizedPoolIterator
+from .pool_mixins import CurveCryptoPoolMixin, CurveMetaPoolMixin, CurvePoolMixin
+
+METHODS = ("sobol", "lhs")
+
+
+# pylint: disable-next=abstract-method
+class QuasiRandomPoolIterator(ParameterizedPoolIterator):
+    """
+    Iterates over pools with parameters drawn from a low-discrepancy design
+    over the input parameter ranges.
+    """
+
+    # pylint: disable-next=unused-argument
+    def __new__(cls, pool, *args, pool_map=None, **kwargs):
+        """
+        Returns a pool-specific QuasiRandomPoolIterator subclass.
+
+        Parameters
+        ----------
+        pool_map : dict, optional
+            A mapping between pool types and subclasses. Overrides default mapping.
+
+        Returns
+        -------
+            :class:`.QuasiRandomPoolIterator` subclass
+
+        """
+        pool_map = pool_map or DEFAULT_POOL_MAP
+
+        if cls is not QuasiRandomPoolIterator:
+            return super().__new__(cls, pool)
+
+        try:
+            pool_type = type(pool)
+            subclass = pool_map[pool_type]
+
+        except KeyError as e:
+            pool_type_name = pool_type.__name__
+            raise ParameterSamplerError(
+                f"No subclass for pool type `{pool_type_name}` found in "
+                "QuasiRandomPoolIterator pool map."
+            ) from e
+
+        return super().__new__(subclass, pool)
+
+    # pylint: disable-next=too-many-arguments,unused-argument
+    def __init__(
+        self,
+        pool,
+        variable_params=None,
+        fixed_params=None,
+        *,
+        n_samples=64,
+        method="sobol",
+        log_scale=None,
+        seed=None,
+        pool_map=None,
+    ):
+        """
+        Parameters
+        ----------
+        pool : :class:`~curvesim.templates.SimPool`
+            The "template" pool that will have its parameters modified.
+
+        variable_params: dict, optional
+            Lower and upper bound for each pool parameter to vary across
+            simulations.  Parameters with integer bounds are rounded to
+            integers.  For metapools, basepool parameters can be referenced
+            by appending "_base" to an attribute name.
+
+            Example
+            --------
+            .. code-block ::
+
+                {"A": (10, 10000), "fee": (10**6, 10**8)}
+
+        fixed_params : dict, optional
+            Pool parameters set before all simulations.
+
+        n_samples : int, default=64
+            Number of parameter sets to draw.  Sobol sequences are most even
+            when this is a power of 2.  Sets that are the same after rounding
+            are only run once.
+
+        method : str, default="sobol"
+            "sobol" for a scrambled Sobol sequence, or "lhs" for a Latin
+            hypercube.
+
+        log_scale : iterable of str, optional
+            Parameters to sample on a log scale.  Defaults to all parameters
+            with positive bounds.
+
+        seed : int, optional
+            Seed for scrambling the design.
+
+        pool_map : dict, optional
+            See __new__ method.
+        """
+        if method not in METHODS:
+            raise ParameterSamplerError(
+                f"Sampling method must be one of {METHODS}; received '{method}'."
+            )
+
+        self.n_samples = n_samples
+        self.method = method
+        self.log_scale = log_scale
+        self.seed = seed
+        super().__init__(pool, variable_params, fixed_params)
+
+    def make_parameter_sequence(self, variable_params):
+        """
+        Returns a list of dicts with parameters drawn from the sampling design.
+
+        Parameters
+        ----------
+        variable_params: dict
+            Pool parameters to vary across simulations.
+
+            Keys: pool parameters, Values: (lower bound, upper bound)
+
+        Returns
+        -------
+        List(dict)
+            A list of dicts defining the parameters for each iteration.
+        """
+        if not variable_params:
+            return []
+
+        self._validate_attributes(self.pool_template, variable_params)
+        bounds = ParameterBounds(variable_params, self.log_scale)
+
+        if self.method == "sobol":
+            engine = qmc.Sobol(len(bounds), seed=self.seed)
+        else:
+            engine = qmc.LatinHypercube(len(bounds), seed=self.seed)
+
+        sequence = []
+        seen = set()
+        for x in engine.random(self.n_samples):
+            params = bounds.to_params(x)
+            key = tuple(params.values())
+            if key not in seen:
+                seen.add(key)
+                sequence.append(params)
+
+        return sequence
+
+
+class QuasiRandomCurvePoolIterator(CurvePoolMixin, QuasiRandomPoolIterator):
+    """
+    :class:`QuasiRandomPoolIterator` parameter sampler specialized
+    for Curve pools.
+    """
+
+
+class QuasiRandomCurveMetaPoolIterator(CurveMetaPoolMixin, QuasiRandomPoolIterator):
+    """
+    :class:`QuasiRandomPoolIterator` parameter sampler specialized
+    for Curve meta-pools.
+    """
+
+
+class QuasiRandomCurveCryptoPoolIterator(CurveCryptoPoolMixin, QuasiRandomPoolIterator):
+    """
+    :class:`QuasiRandomPoolIterator` parameter sampler specialized
+    for Curve crypto pools.
+    """
+
+
+DEFAULT_POOL_MAP = {
+    SimCurvePool: QuasiRandomCurvePoolIterator,
+    SimCurveRaiPool: QuasiRandomCurveMetaPoolIterator,
+    SimCurveMetaPool: QuasiRandomCurveMetaPoolIterator,
+    SimCurveCryptoPool: QuasiRandomCurveCryptoPoolIterator,
+}
@@ -1,10 +1,20 @@
+from contextlib import contextmanager
+from copy import copy
+
+from numpy import float64
+
 from curvesim.logging import get_logger
 from curvesim.price_data import get
 from curvesim.templates.price_samplers import PriceSample, PriceSampler
 from curvesim.utils import dataclass, override
 
+from .shared_memory import SharedFrame
+
 logger = get_logger(__name__)
 
+CHUNK_SIZE = 4096
+"""Number of rows converted to Python objects at a time while iterating."""
+
 
 @dataclass(slots=True)
 class PriceVolumeSample(PriceSample):
@@ -27,6 +37,9 @@ class PriceVolume(PriceSampler):
     An iterator that retrieves price/volume and iterates over timepoints in the data.
     """
 
+    _shared_frames = None
+    _store_args = None
+
     def __init__(
         self,
         assets,
@@ -52,7 +65,10 @@ class PriceVolume(PriceSampler):
             Relative path to saved data folder.
 
         src: str, defaults to "coingecko"
-            Identifies pricing source: coingecko or local.
+            Identifies pricing source: coingecko, local, or store.  Data
+            from a local :class:`~curvesim.price_data.store.PriceStore` is
+            memory-mapped rather than loaded, and worker processes reopen
+            the store instead of receiving a copy of the data.
 
         """
         prices, volumes, _ = get(
@@ -64,8 +80,17 @@ class PriceVolume(PriceSampler):
             end=end,
         )
 
-        self.prices = prices.set_axis(assets.symbol_pairs, axis="columns")
-        self.volumes = volumes.set_axis(assets.symbol_pairs, axis="columns")
+        self.prices = prices.set_axis(assets.symbol_pairs, axis="columns", copy=False)
+        self.volumes = volumes.set_axis(assets.symbol_pairs, axis="columns", copy=False)
+
+        if src == "store":
+            self._store_args = (
+                assets.addresses,
+                data_dir,
+                days,
+                end,
+                assets.symbol_pairs,
+            )
 
     @override
     def __iter__(self) -> PriceVolumeSample:
@@ -74,19 +99,87 @@ class PriceVolume(PriceSampler):
         -------
         :class:`PriceVolumeSample`
         """
-        for price_row, volume_row in zip(
-            self.prices.iterrows(), self.volumes.iterrows()
-        ):
-            price_timestamp, prices = price_row
-            volume_timestamp, volumes = volume_row
-            assert (
-                price_timestamp == volume_timestamp
-            ), "Price/volume timestamps don't match"
-
-            prices = prices.to_dict()
-            volumes = volumes.to_dict()
-
-            yield PriceVolumeSample(price_timestamp, prices, volumes)
+        assert self.prices.index.equals(
+            self.volumes.index
+        ), "Price/volume timestamps don't match"
+
+        # convert rows in bulk: building a Series per row is far slower
+        price_pairs = list(self.prices.columns)
+        volume_pairs = list(self.volumes.columns)
+        for start in range(0, len(self.prices), CHUNK_SIZE):
+            # memory-mapped data is only read a chunk at a time
+            prices = self.prices.iloc[start : start + CHUNK_SIZE]
+            volumes = self.volumes.iloc[start : start + CHUNK_SIZE]
+            for timestamp, price_row, volume_row in zip(
+                prices.index,
+                prices.to_numpy(dtype=float64).tolist(),
+                volumes.to_numpy(dtype=float64).tolist(),
+            ):
+                yield PriceVolumeSample(
+                    timestamp,
+                    dict(zip(price_pairs, price_row)),
+                    dict(zip(volume_pairs, volume_row)),
+                )
+
+    @override
+    @contextmanager
+    def shared(self):
+        """
+        Context manager giving a copy of the sampler with its price and
+        volume data stored in shared memory, which is freed on exit.
+
+        The copy pickles to a small handle to the shared memory, so it can be
+        sent to any number of worker processes without copying the data.
+        Unpickling gives a sampler with DataFrames that are read-only views
+        of the shared memory.
+
+        Samplers with data from a price store are given as is, since they
+        pickle to the location of the data, and the memory-mapped data is
+        shared through the OS's page cache.
+
+        Yields
+        -------
+        :class:`PriceVolume`
+        """
+        if self._store_args is not None:
+            yield self
+            return
+
+        prices = SharedFrame(self.prices)
+        try:
+            volumes = SharedFrame(self.volumes)
+        except Exception:
+            prices.unlink()
+            raise
+
+        sampler = copy(self)
+        sampler._shared_frames = (prices, volumes)  # pylint: disable=protected-access
+        try:
+            yield sampler
+        finally:
+            prices.unlink()
+            volumes.unlink()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._shared_frames is not None or self._store_args is not None:
+            del state["prices"], state["volumes"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._shared_frames is not None:
+            prices, volumes = self._shared_frames
+            self.prices = prices.to_frame()
+            self.volumes = volumes.to_frame()
+
+        elif self._store_args is not None:
+            coins, data_dir, days, end, symbol_pairs = self._store_args
+            prices, volumes, _ = get(
+                coins, data_dir=data_dir, src="store", days=days, end=end
+            )
+            self.prices = prices.set_axis(symbol_pairs, axis="columns", copy=False)
+            self.volumes = volumes.set_axis(symbol_pairs, axis="columns", copy=False)
 
     def total_volumes(self):
         """
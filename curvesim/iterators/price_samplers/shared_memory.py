@@ -0,0 +1,135 @@
+"""
+Shared-memory storage for price sampler data.
+
+Parallel simulation runs all read the same price and volume data.  Storing
+it in :mod:`multiprocessing.shared_memory` lets each run attach to a single
+copy instead of receiving its own pickled copy of the data.
+
+Objects here pickle to the names of their shared memory blocks and a little
+metadata, and rebuild arrays and DataFrames as views of the shared memory
+when unpickled, without copying the data.  The process that creates them owns
+the shared memory and must call `unlink` once all other processes are done.
+"""
+from multiprocessing.shared_memory import SharedMemory
+
+from numpy import ndarray
+from pandas import DataFrame, DatetimeIndex, Index
+
+from curvesim.exceptions import CurvesimValueError
+
+
+class SharedArray:
+    """
+    A read-only numpy array stored in shared memory.
+    """
+
+    def __init__(self, array):
+        """
+        Copies the array into a new shared memory block.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            Array to share; must not have object dtype.
+        """
+        if array.dtype.hasobject:
+            raise CurvesimValueError("Arrays of Python objects can't be shared.")
+
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self._shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.name = self._shm.name
+        ndarray(self.shape, self.dtype, buffer=self._shm.buf)[...] = array
+
+    def __getstate__(self):
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def to_numpy(self):
+        """
+        Returns the array as a read-only view of the shared memory.
+
+        The view is only valid while this object is alive, so references
+        to this object must be kept along with the view.
+        """
+        if self._shm is None:
+            self._shm = SharedMemory(name=self.name)
+
+        array = ndarray(self.shape, self.dtype, buffer=self._shm.buf)
+        array.flags.writeable = False
+        return array
+
+    def unlink(self):
+        """
+        Frees the shared memory.  Only to be called by the process that
+        created this object, once no process needs the data.
+        """
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SharedFrame:
+    """
+    A DataFrame with its values and index stored in shared memory.
+
+    The values must have a single, non-object dtype, e.g. all floats,
+    as for price and volume data.
+    """
+
+    def __init__(self, frame):
+        """
+        Copies the DataFrame's values and index into shared memory.
+
+        Parameters
+        ----------
+        frame : pandas.DataFrame
+            DataFrame to share.
+        """
+        index = frame.index
+        self.tz = getattr(index, "tz", None)
+        if self.tz is not None:
+            # share timestamps as UTC datetime64 since tz-aware ones are objects
+            index = index.tz_convert(None)
+
+        self.columns = frame.columns
+        self.index_name = index.name
+        self.index_freq = getattr(index, "freq", None)
+        self._values = SharedArray(frame.to_numpy())
+        try:
+            self._index = SharedArray(index.to_numpy())
+        except Exception:
+            self._values.unlink()
+            raise
+
+    def to_frame(self):
+        """
+        Returns the DataFrame, with values that are a read-only view of
+        the shared memory.
+
+        The DataFrame is only valid while this object is alive, so references
+        to this object must be kept along with the DataFrame.
+        """
+        index_values = self._index.to_numpy()
+        if index_values.dtype.kind == "M":
+            index = DatetimeIndex(
+                index_values, name=self.index_name, freq=self.index_freq
+            )
+            if self.tz is not None:
+                index = index.tz_localize("UTC").tz_convert(self.tz)
+        else:
+            index = Index(index_values, name=self.index_name, copy=False)
+
+        return DataFrame(
+            self._values.to_numpy(), index=index, columns=self.columns, copy=False
+        )
+
+    def unlink(self):
+        """
+        Frees the shared memory.  Only to be called by the process that
+        created this object, once no process needs the data.
+        """
+        self._values.unlink()
+        self._index.unlink()
@@ -580,26 +580,28 @@ class PriceDepth(PoolMetric):
         Used for all Curve pools.
         """
         self.set_pool_state(pool_state_row)
+        price_matrix = self._pool.price_matrix(use_fee=False)
 
         LD = []
         for pair in coin_pairs:
-            ld = self._compute_liquidity_density(*pair)
+            ld = self._compute_liquidity_density(*pair, price_matrix)
             LD.append(ld)
         return sum(LD) / len(LD)
 
-    def _compute_liquidity_density(self, coin_in, coin_out):
+    def _compute_liquidity_density(self, coin_in, coin_out, price_matrix):
         """
         Computes liquidity density for a single pair of coins.
         """
         factor = self._factor
         pool = self._pool
         post_trade_price = self._post_trade_price
+        i, j = pool.get_asset_indices(coin_in, coin_out)
 
-        price_pre = pool.price(coin_in, coin_out, use_fee=False)
+        price_pre = price_matrix[i, j]
         price_post = post_trade_price(pool, coin_in, coin_out, factor)
         LD1 = price_pre / ((price_pre - price_post) * factor)
 
-        price_pre = pool.price(coin_out, coin_in, use_fee=False)
+        price_pre = price_matrix[j, i]
         # pylint: disable-next=arguments-out-of-order
         price_post = post_trade_price(pool, coin_out, coin_in, factor)
         LD2 = price_pre / ((price_pre - price_post) * factor)
@@ -8,4 +8,23 @@ be used in the future.
 There is not a well-defined public API for this subpackage yet.  A lot of the code
 has been converted to use `asyncio` from a legacy implementation and further,
 substantive improvements are anticipated.
+
+HTTP requests share a connection pool and per-host rate limits, managed by
+:mod:`curvesim.network.session`.
 """
+
+__all__ = [
+    "RATE_LIMITS",
+    "HTTPSession",
+    "close_session",
+    "configure_session",
+    "get_session",
+]
+
+from .session import (
+    RATE_LIMITS,
+    HTTPSession,
+    close_session,
+    configure_session,
+    get_session,
+)
@@ -0,0 +1,247 @@
+"""
+On-disk cache of JSON responses to HTTP requests.
+
+Fetching a pool's metadata and price history makes the same requests each
+time a pool is simulated, costing tens of seconds and, when rate limits are
+hit, retry waits.  :class:`ResponseCache` keeps each response in a file
+keyed by the request's method, URL, query parameters, and body:
+
+- responses for windows of time entirely in the past (see
+  :func:`is_historical`) never change, so are kept forever
+- other responses expire after a time-to-live
+
+GraphQL responses reporting `errors` are never stored.  Entries hold only
+the response and its expiry; the request's parameters and body, which may
+include API keys, are only kept as part of the key's hash.
+
+Caching is off by default.  It is turned on by setting the
+`CURVESIM_HTTP_CACHE_DIR` environment variable to a directory, or with
+:func:`configure_response_cache`:
+
+.. code-block::
+
+    from curvesim.network.cache import configure_response_cache
+
+    configure_response_cache("~/.cache/curvesim/http", ttl=3600)
+
+Within the time-to-live, e.g. calling :func:`~curvesim.autosim` twice
+reuses the first call's pool and volume snapshots, even if the pool has
+changed on-chain since.
+
+A cache directory of recorded responses can also stand in for the network,
+e.g. in tests, with `offline=True`:
+
+.. code-block::
+
+    with use_response_cache(ResponseCache("test/data/http", offline=True)):
+        pool = curvesim.pool.get("0xbebc44782c7db0a1a60cb6fe97d0b483032ff1c7")
+"""
+import json
+from contextlib import contextmanager
+from hashlib import sha256
+from pathlib import Path
+from time import time
+
+from curvesim.logging import get_logger
+from curvesim.utils import atomic_write, get_env_var
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 3600
+"""Seconds before responses for recent data expire."""
+
+SETTLEMENT_TIME = 86400
+"""Seconds after which data for a time window is assumed to be final."""
+
+
+class ResponseCache:
+    """
+    Directory of JSON responses to HTTP requests.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_TTL, offline=False):
+        """
+        Parameters
+        ----------
+        directory : str or path-like
+            Directory to keep responses in; created when first written to.
+
+        ttl : float, default=3600
+            Seconds before responses that aren't immutable expire.
+
+        offline : bool, default=False
+            If True, the cache stands in for the network: responses never
+            expire, and HTTP requests without a stored response raise
+            :class:`~curvesim.exceptions.NetworkError` instead of being sent.
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.offline = offline
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0}
+
+    def key(self, method, url, params=None, body=None):
+        """
+        Returns the key for a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method, e.g. "GET".
+
+        url : str
+            Request URL.
+
+        params : dict, optional
+            Query parameters.
+
+        body : JSON-serializable, optional
+            JSON request body.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the request.
+        """
+        request = [method.upper(), str(url), params, body]
+        return sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the stored response for the key, or None if there is no
+        response or it has expired.
+        """
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        expires = entry["expires"]
+        if not self.offline and expires is not None and expires < time():
+            self.stats["expired"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return entry["response"]
+
+    def set(self, key, response, immutable=False):
+        """
+        Stores a response.
+
+        Parameters
+        ----------
+        key : str
+            Key for the request, from :meth:`key`.
+
+        response : JSON-serializable
+            Response to store.
+
+        immutable : bool, default=False
+            If True, the response never expires.
+        """
+        expires = None if immutable else time() + self.ttl
+        entry = {"expires": expires, "response": response}
+
+        try:
+            with atomic_write(self._path(key)) as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.warning("Could not cache response in %s: %s", self.directory, e)
+            return
+
+        self.stats["stores"] += 1
+
+    def clear(self):
+        """Deletes all stored responses."""
+        for path in self.directory.glob("*.json"):
+            path.unlink()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+
+def is_historical(end):
+    """
+    True if data up to `end` (datetime or seconds since epoch) is final,
+    so responses for it can be cached forever.
+    """
+    if end is None:
+        return False
+    if not isinstance(end, (int, float)):
+        end = end.timestamp()
+    return end < time() - SETTLEMENT_TIME
+
+
+_UNSET = object()
+_response_cache = _UNSET
+
+
+def get_response_cache():
+    """
+    Returns the cache used for HTTP requests, or None if caching is disabled.
+
+    Unless set with :func:`configure_response_cache` or
+    :func:`set_response_cache`, caching is enabled only if the
+    `CURVESIM_HTTP_CACHE_DIR` environment variable is set.
+
+    Returns
+    -------
+    :class:`ResponseCache` or None
+    """
+    global _response_cache  # pylint: disable=global-statement
+
+    if _response_cache is _UNSET:
+        cache_dir = get_env_var("CURVESIM_HTTP_CACHE_DIR", default=None)
+        configure_response_cache(cache_dir)
+
+    return _response_cache
+
+
+def configure_response_cache(cache_dir=None, ttl=DEFAULT_TTL):
+    """
+    Caches HTTP responses in a directory, or disables caching.
+
+    Parameters
+    ----------
+    cache_dir : str or path-like, optional
+        Directory to keep responses in, with `~` expanded.  If None,
+        caching is disabled.
+
+    ttl : float, default=3600
+        Seconds before responses for recent data expire.
+    """
+    if cache_dir is None:
+        set_response_cache(None)
+    else:
+        set_response_cache(ResponseCache(Path(cache_dir).expanduser(), ttl=ttl))
+
+
+def set_response_cache(cache):
+    """
+    Sets the cache used for HTTP requests.
+
+    Parameters
+    ----------
+    cache : :class:`ResponseCache` or None
+        The cache, or None to disable caching.
+    """
+    global _response_cache  # pylint: disable=global-statement
+    _response_cache = cache
+
+
+@contextmanager
+def use_response_cache(cache):
+    """
+    Context manager using the cache (or no cache, if None) for HTTP requests,
+    and restoring the previous cache on exit.
+    """
+    previous = _response_cache
+    set_response_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_response_cache(previous)
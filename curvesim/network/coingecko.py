@@ -10,6 +10,7 @@ import pandas as pd
 
 from curvesim.utils import get_pairs
 
+from .cache import is_historical
 from .http import HTTP
 from .utils import sync
 
@@ -31,7 +32,7 @@ async def _get_prices(coin_id, vs_currency, start, end):
     url = URL + f"coins/{coin_id}/market_chart/range"
     p = {"vs_currency": vs_currency, "from": start, "to": end}
 
-    r = await HTTP.get(url, params=p)
+    r = await HTTP.get(url, params=p, immutable=is_historical(end))
 
     return r
 
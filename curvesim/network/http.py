@@ -1,56 +1,91 @@
 """
 General utility for http requests.
 """
-import aiohttp
 from aiohttp import ClientResponseError
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from curvesim.exceptions import HttpClientError
+from curvesim.exceptions import HttpClientError, NetworkError
+from curvesim.logging import get_logger
+
+from .cache import get_response_cache
+from .session import get_session
+
+logger = get_logger(__name__)
 
 stop_rule = stop_after_attempt(8)
 wait_rule = wait_exponential(multiplier=1.5, min=2, max=60)
 
 
 class HTTP:
+    """
+    JSON requests, with responses optionally cached on disk
+    (see :mod:`.cache`).
+
+    Requests for data that is final, such as a window of time entirely in the
+    past, can be marked `immutable` so their responses are cached forever.
+    GraphQL responses with `errors` are never cached.
+    """
+
     @staticmethod
-    @retry(stop=stop_rule, wait=wait_rule)
-    async def get(url, params=None):
+    async def get(url, params=None, immutable=False):
+        return await _cached_request("GET", url, params=params, immutable=immutable)
 
-        kwargs = {"url": url, "headers": {"Accept-Encoding": "gzip"}}
+    @staticmethod
+    async def post(url, json=None, immutable=False):
+        return await _cached_request("POST", url, json=json, immutable=immutable)
 
-        if params is not None:
-            kwargs.update({"params": params})
 
-        try:
-            async with aiohttp.request("GET", **kwargs) as resp:
-                resp.raise_for_status()
-                json_data = await resp.json()
-        except ClientResponseError as e:
-            message = e.message
-            status = e.status
-            url = e.request_info.url
-            # pylint: disable-next=raise-missing-from
-            raise HttpClientError(status, message, url)
+async def _cached_request(method, url, params=None, json=None, immutable=False):
+    cache = get_response_cache()
+    if cache is None:
+        return await _request(method, url, params=params, json=json)
 
-        return json_data
+    key = cache.key(method, url, params, json)
+    response = cache.get(key)
+    if response is not None:
+        logger.debug("Cached response for %s %s", method, url)
+        return response
 
-    @staticmethod
-    @retry(stop=stop_rule, wait=wait_rule)
-    async def post(url, json=None):
-        kwargs = {"url": url, "headers": {"Accept-Encoding": "gzip"}}
-
-        if json is not None:
-            kwargs.update({"json": json})
-
-        try:
-            async with aiohttp.request("POST", **kwargs) as resp:
-                resp.raise_for_status()
-                json_data = await resp.json()
-        except ClientResponseError as e:
-            message = e.message
-            status = e.status
-            url = e.request_info.url
-            # pylint: disable-next=raise-missing-from
-            raise HttpClientError(status, message, url)
-
-        return json_data
+    if cache.offline:
+        raise NetworkError(f"No recorded response for {method} {url} ({key}).")
+
+    response = await _request(method, url, params=params, json=json)
+    if _has_errors(response):
+        logger.debug("Not caching error response for %s %s", method, url)
+        return response
+
+    cache.set(key, response, immutable=immutable)
+    return response
+
+
+def _has_errors(response):
+    """
+    True for GraphQL responses reporting errors, which are sent with a
+    success status but may succeed when retried.
+    """
+    return isinstance(response, dict) and bool(response.get("errors"))
+
+
+@retry(stop=stop_rule, wait=wait_rule)
+async def _request(method, url, params=None, json=None):
+    kwargs = {"url": url, "headers": {"Accept-Encoding": "gzip"}}
+
+    if params is not None:
+        kwargs.update({"params": params})
+
+    if json is not None:
+        kwargs.update({"json": json})
+
+    session = await get_session()
+    try:
+        async with await session.request(method, **kwargs) as resp:
+            resp.raise_for_status()
+            json_data = await resp.json()
+    except ClientResponseError as e:
+        message = e.message
+        status = e.status
+        url = e.request_info.url
+        # pylint: disable-next=raise-missing-from
+        raise HttpClientError(status, message, url)
+
+    return json_data
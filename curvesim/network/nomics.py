@@ -414,27 +414,17 @@ def local_pool_prices(  # noqa: C901
     pzero : pandas.Series
         Proportion of timestamps with zero volume.
     """
-    coins = coins or []
-    pairs = pairs or []
-
-    if pairs and coins:
-        raise ValueError("Use only 'coins' or 'pairs', not both.")
-
-    if coins:
-        if quote:
-            symbol_pairs = zip(coins, [quote] * len(coins))
-        else:
-            symbol_pairs = list(combinations(coins, 2))
-    elif pairs:
-        symbol_pairs = pairs
-    else:
-        raise ValueError("Must use one of 'coins' or 'pairs'.")
+    filepaths = local_price_files(
+        coins=coins,
+        quote=quote,
+        pairs=pairs,
+        data_dir=data_dir,
+        custom_suffix=custom_suffix,
+    )
 
     prices = []
     volumes = []
-    for (sym_1, sym_2) in symbol_pairs:
-        filename = f"{sym_1}-{sym_2}{custom_suffix}.csv"
-        filepath = os.path.join(data_dir, filename)
+    for filepath in filepaths:
         data_df = pd.read_csv(filepath, index_col=0)
         prices.append(data_df["price"])
         volumes.append(data_df["volume"])
@@ -492,6 +482,40 @@ def local_pool_prices(  # noqa: C901
     return prices, volumes, pzero
 
 
+def local_price_files(
+    coins=None, quote=None, pairs=None, data_dir="data", custom_suffix=""
+):
+    """
+    Returns the paths of the CSVs :func:`local_pool_prices` loads for the
+    given coins or pairs.
+
+    Returns
+    -------
+    list of str
+    """
+    coins = coins or []
+    pairs = pairs or []
+
+    if pairs and coins:
+        raise ValueError("Use only 'coins' or 'pairs', not both.")
+
+    if coins:
+        if quote:
+            symbol_pairs = zip(coins, [quote] * len(coins))
+        else:
+            symbol_pairs = list(combinations(coins, 2))
+    elif pairs:
+        symbol_pairs = pairs
+    else:
+        raise ValueError("Must use one of 'coins' or 'pairs'.")
+
+    filepaths = []
+    for (sym_1, sym_2) in symbol_pairs:
+        filename = f"{sym_1}-{sym_2}{custom_suffix}.csv"
+        filepaths.append(os.path.join(data_dir, filename))
+    return filepaths
+
+
 async def _coin_id_from_address(address):
     if address == ETH_addr:
         return "ETH"
@@ -0,0 +1,245 @@
+"""
+Shared HTTP session for the network connectors.
+
+Each `aiohttp.request` call opens its own session, so every request pays for
+a new TCP and TLS handshake.  Instead, :func:`get_session` returns one
+:class:`HTTPSession` per event loop, whose connection pool keeps connections
+alive between requests, bounds the number of open connections (in total and
+per host), and spaces out requests to each host with a token bucket, so
+large batches of requests stay within providers' rate limits rather than
+relying on retries.
+
+Sessions are closed when their event loop shuts down (e.g., at the end of
+`asyncio.run`) or when the interpreter exits.  Connection limits and rate
+limits for sessions opened afterwards can be changed with
+:func:`configure_session`:
+
+.. code-block::
+
+    from curvesim.network import configure_session
+
+    configure_session(limit_per_host=4, rate_limits={"api.coingecko.com": (0.2, 1)})
+"""
+import asyncio
+import atexit
+from multiprocessing import current_process
+
+import aiohttp
+from yarl import URL
+
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
+RATE_LIMITS = {
+    "api.coingecko.com": (0.5, 5),
+    "api.thegraph.com": (10, 20),
+    "api-py.llama.airforce": (5, 10),
+    "api.nomics.com": (1, 1),
+}
+"""
+Requests per second and burst size for each host.  Hosts not listed are not
+rate limited.
+"""
+
+_options = {
+    "limit": 64,
+    "limit_per_host": 8,
+    "keepalive_timeout": 30,
+    "rate_limits": RATE_LIMITS,
+}
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing bursts of requests up to a capacity, refilled at a
+    constant rate.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Parameters
+        ----------
+        rate : float
+            Tokens (requests) added per second.
+
+        capacity : int, optional
+            Maximum number of tokens, i.e. the largest burst of requests.
+            Defaults to the larger of 1 and `rate`.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self._tokens = self.capacity
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available, then takes it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            if self._updated is not None:
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                self._tokens = 1
+                self._updated = now + delay
+
+            self._tokens -= 1
+
+
+class HTTPSession:
+    """
+    `aiohttp.ClientSession` with a bounded pool of keep-alive connections and
+    per-host rate limits, for use within one event loop.
+    """
+
+    def __init__(
+        self, limit=64, limit_per_host=8, keepalive_timeout=30, rate_limits=None
+    ):
+        """
+        Parameters
+        ----------
+        limit : int, default=64
+            Maximum number of open connections.
+
+        limit_per_host : int, default=8
+            Maximum number of open connections to each host.
+
+        keepalive_timeout : float, default=30
+            Seconds to keep idle connections open.
+
+        rate_limits : dict, optional
+            Requests per second and burst size for each host, as in
+            :data:`RATE_LIMITS`.  Defaults to no rate limits.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+        self.rate_limits = rate_limits or {}
+        self.process = current_process().pid
+        self._buckets = {}
+
+    @property
+    def closed(self):
+        """True if the session has been closed."""
+        return self.session.closed
+
+    async def request(self, method, url, **kwargs):
+        """
+        Waits for the host's rate limit, then sends a request.
+
+        Parameters are as for `aiohttp.ClientSession.request`; the response
+        must be released, e.g. with `async with`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+        """
+        bucket = self._bucket(URL(str(url)).host)
+        if bucket is not None:
+            await bucket.acquire()
+        return await self.session.request(method, url, **kwargs)
+
+    async def close(self):
+        """Closes the session and its connections."""
+        await self.session.close()
+
+    def _bucket(self, host):
+        if host not in self._buckets:
+            limit = self.rate_limits.get(host)
+            self._buckets[host] = None if limit is None else TokenBucket(*limit)
+        return self._buckets[host]
+
+
+_sessions = {}
+
+
+async def get_session():
+    """
+    Returns the session for the running event loop, opening one if needed.
+
+    Returns
+    -------
+    :class:`HTTPSession`
+    """
+    for closed_loop in [loop for loop in _sessions if loop.is_closed()]:
+        del _sessions[closed_loop]
+
+    loop = asyncio.get_running_loop()
+    session, _ = _sessions.get(loop, (None, None))
+    if session is None or session.closed or session.process != current_process().pid:
+        session = HTTPSession(**_options)
+        closer = _close_on_shutdown(session)
+        await closer.__anext__()
+        _sessions[loop] = (session, closer)
+        logger.debug("Opened HTTP session for event loop %s", id(loop))
+    return session
+
+
+async def close_session():
+    """Closes the session for the running event loop, if there is one."""
+    _, closer = _sessions.pop(asyncio.get_running_loop(), (None, None))
+    if closer is not None:
+        await closer.aclose()
+
+
+def configure_session(
+    *, limit=None, limit_per_host=None, keepalive_timeout=None, rate_limits=None
+):
+    """
+    Sets the connection and rate limits of sessions opened afterwards.
+
+    Parameters
+    ----------
+    limit : int, optional
+        Maximum number of open connections.
+
+    limit_per_host : int, optional
+        Maximum number of open connections to each host.
+
+    keepalive_timeout : float, optional
+        Seconds to keep idle connections open.
+
+    rate_limits : dict, optional
+        Requests per second and burst size for each host, updating
+        :data:`RATE_LIMITS`; a value of None removes a host's limit.
+    """
+    options = {
+        "limit": limit,
+        "limit_per_host": limit_per_host,
+        "keepalive_timeout": keepalive_timeout,
+    }
+    _options.update({k: v for k, v in options.items() if v is not None})
+
+    for host, rate_limit in (rate_limits or {}).items():
+        if rate_limit is None:
+            RATE_LIMITS.pop(host, None)
+        else:
+            RATE_LIMITS[host] = rate_limit
+
+
+async def _close_on_shutdown(session):
+    """
+    Async generator left suspended, so the event loop closes the session when
+    it shuts down its async generators (as `asyncio.run` does).
+    """
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+@atexit.register
+def _close_sessions():
+    """Closes sessions of event loops left open, e.g. by the sync wrappers."""
+    for loop, (_, closer) in list(_sessions.items()):
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(closer.aclose())
@@ -13,6 +13,7 @@ from curvesim.logging import get_logger
 
 from ..exceptions import CurvesimValueError, SubgraphResultError
 from ..overrides import override_subgraph_data
+from .cache import is_historical
 from .http import HTTP
 from .utils import compute_D, sync
 
@@ -21,7 +22,7 @@ from .utils import compute_D, sync
 logger = get_logger(__name__)
 
 
-async def query(url, q):
+async def query(url, q, immutable=False):
     """
     Core async function to query subgraphs.
 
@@ -31,6 +32,9 @@ async def query(url, q):
         URL for the subgraph.
     q : str
         A GraphQL query.
+    immutable : bool, default=False
+        True if the query is for data that won't change, so its response
+        can be cached forever.
 
     Returns
     -------
@@ -38,7 +42,7 @@ async def query(url, q):
         The returned results.
 
     """
-    r = await HTTP.post(url, json={"query": q})
+    r = await HTTP.post(url, json={"query": q}, immutable=immutable)
     return r
 
 
@@ -65,7 +69,7 @@ def _get_subgraph_url(chain, env="prod"):
     return url
 
 
-async def convex(chain, q, env):
+async def convex(chain, q, env, immutable=False):
     """
     Async function to query convex community subgraphs
 
@@ -83,6 +87,10 @@ async def convex(chain, q, env):
     env: str
         Environment name.  Supported: "prod", "staging"
 
+    immutable : bool, default=False
+        True if the query is for data that won't change, so its response
+        can be cached forever.
+
     Returns
     -------
     str
@@ -90,7 +98,7 @@ async def convex(chain, q, env):
 
     """
     url = _get_subgraph_url(chain, env)
-    r = await query(url, q)
+    r = await query(url, q, immutable=immutable)
     if "data" not in r:
         raise SubgraphResultError(
             f"No data returned from Convex: chain: {chain}, query: {q}"
@@ -196,7 +204,7 @@ async def _volume(address, chain, env, days=60, end=None):
         int(t_end.timestamp()),
     )
 
-    data = await convex(chain, q, env)
+    data = await convex(chain, q, env, immutable=is_historical(t_end))
     snapshots = data["swapVolumeSnapshots"]
     num_snapshots = len(snapshots)
 
@@ -307,7 +315,7 @@ async def _pool_snapshot(address, chain, env, end_ts=None):
         end_ts,
     )
 
-    r = await convex(chain, q, env)
+    r = await convex(chain, q, env, immutable=is_historical(end_ts))
     try:
         r = r["dailyPoolSnapshots"][0]
     except IndexError as e:
@@ -498,7 +506,7 @@ async def _redemption_prices(address, chain, t_start, t_end, n):
     t_earliest = t_end
     data = []
     while t_earliest >= t_start:
-        r = await query(url, q % (n, t_earliest))
+        r = await query(url, q % (n, t_earliest), immutable=is_historical(t_end))
         data += r["data"]["redemptionPrices"]
         t_earliest = int(data[-1]["timestamp"])
     return data
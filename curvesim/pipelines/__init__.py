@@ -15,18 +15,37 @@ pool data such as :class:`~curvesim.pool_data.metadata.PoolMetaDataInterface`;
 instantiates a param_sampler, price_sampler, and strategy; and invokes `run_pipeline`,
 returning its result metrics.
 """
-from multiprocessing import Pool as cpu_pool
+import logging
+from copy import deepcopy
+from itertools import chain
+from multiprocessing import current_process
+from threading import current_thread, main_thread
+from time import time
 
-from curvesim.logging import (
-    configure_multiprocess_logging,
-    get_logger,
-    multiprocessing_logging_queue,
-)
+from curvesim.logging import configure_multiprocess_logging, get_logger
+
+from .cache import ResultCache
+from .checkpoint import Checkpoint, CheckpointSink
+from .executor import Executor
+from .scheduler import CostModel, WorkerUtilization
+from .sinks import MemorySink
 
 logger = get_logger(__name__)
 
 
-def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
+# pylint: disable-next=too-many-arguments,too-many-locals
+def run_pipeline(
+    param_sampler,
+    price_sampler,
+    strategy,
+    ncpu=4,
+    sink=None,
+    progress=None,
+    checkpoint_dir=None,
+    cache_dir=None,
+    cost_history=None,
+    executor=None,
+):
     """
     Core function for running pipelines.
 
@@ -48,46 +67,273 @@ def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
     ncpu : int, default=4
         Number of cores to use.
 
+        With more than one, the price sampler's data is shared between worker
+        processes (see :meth:`.PriceSampler.shared`) rather than copied for
+        each set of parameters.  Runs are handed out one at a time to
+        whichever worker is free, longest first if run times can be
+        estimated from `cost_history`, and each worker's utilization is
+        logged at the end.
+
+    sink : :class:`~curvesim.pipelines.sinks.ResultSink`, optional
+        If given, results are streamed: each run's metrics are passed to the
+        sink as soon as the run finishes, in order of completion, instead of
+        being kept until all runs are done (see :mod:`.sinks`).
+
+    progress : callable, optional
+        Called with the number of finished runs and the total number of runs
+        after each run finishes or is loaded from a checkpoint or the cache.
+        The total is None if the parameter sampler has no length.
+
+    checkpoint_dir : str, optional
+        Directory to save each run's results in as soon as it finishes.
+        Runs already saved there by a previous call with the same arguments
+        are loaded instead of being run again (see :mod:`.checkpoint`).
+        Works with or without a sink.
+
+    cache_dir : str, optional
+        Directory of a result cache shared across pipeline calls.  Runs with
+        the same inputs as a cached run load its results instead of being
+        run again, and new results are added to the cache, evicting the
+        least recently used when full (see :mod:`.cache`).
+
+    cost_history : str, optional
+        JSON file of run times from previous calls, used to estimate each
+        run's time and start the longest runs first.  The times of this
+        call's runs are added to it (see :mod:`.scheduler`).
+
+        Sorting runs makes all pools from the parameter sampler up front;
+        otherwise, each pool is made only when a worker is free to run it.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool to run on, reused across calls to avoid starting new
+        worker processes and sharing the same price data again each call.
+        With an :class:`~curvesim.pipelines.executor.Executor`, `ncpu` is
+        ignored; with a :mod:`concurrent.futures` executor, e.g. a thread pool
+        or a job runner's executor, `ncpu` runs are submitted at a time.
+
     Returns
     -------
     results : tuple
-        Contains the metrics produced by the strategy.
+        Contains the metrics produced by the strategy.  With a sink, this is
+        the output of the sink's `close` method instead.
 
     """
-    if ncpu > 1:
-        with multiprocessing_logging_queue() as logging_queue:
-            strategy_args_list = [
-                (pool, params, price_sampler) for pool, params in param_sampler
-            ]
-
-            wrapped_args_list = [
-                (strategy, logging_queue, *args) for args in strategy_args_list
-            ]
-
-            with cpu_pool(ncpu) as clust:
-                results = tuple(
-                    zip(*clust.starmap(wrapped_strategy, wrapped_args_list))
-                )
-                clust.close()
-                clust.join()  # coverage needs this
+    checkpoints = []
+    if checkpoint_dir is not None:
+        checkpoints.append(Checkpoint(checkpoint_dir, price_sampler, strategy))
+    if cache_dir is not None:
+        checkpoints.append(ResultCache(cache_dir, price_sampler, strategy))
+
+    if sink is None:
+        sink = MemorySink()
+
+    n_runs = len(param_sampler) if hasattr(param_sampler, "__len__") else None
+    progress = _Progress(n_runs, 0, progress)
+
+    # pools are made as workers become free, unless runs must be sorted
+    runs = enumerate(param_sampler)
+    cost_model = CostModel(cost_history, _n_steps(price_sampler))
+    if cost_history is not None:
+        runs = cost_model.order(list(runs))
+    if checkpoints:
+        runs, sink = _load_checkpoints(runs, checkpoints, sink, progress)
+
+    utilization = WorkerUtilization()
+    run_args = {}
+    for run_n, result, (worker, start, end) in _run(
+        _pending(runs, run_args), price_sampler, strategy, ncpu, executor
+    ):
+        sink.add(run_n, result)
+        progress.update(run_n)
+        cost_model.record(*run_args.pop(run_n), end - start)
+        utilization.record(worker, start, end)
+
+    cost_model.save()
+    utilization.log()
+    _log_cache_stats(checkpoints)
+    return sink.close()
+
+
+def _n_steps(price_sampler):
+    """Returns the number of timesteps in the price data, or 1 if unknown."""
+    prices = getattr(price_sampler, "prices", price_sampler)
+    return len(prices) if hasattr(prices, "__len__") else 1
+
+
+def _run(runs, price_sampler, strategy, ncpu, executor):
+    """
+    Runs the strategy for each run, yielding the run index, results, and
+    the worker, start, and end time of each run as it finishes.
+
+    With an executor or more than one cpu, runs are dispatched one at a time,
+    in the given order, to whichever worker is free.
+    """
+    # pylint: disable=too-many-arguments
+    runs = iter(runs)
+    first_run = next(runs, None)
+    if first_run is None:
+        return
+    runs = chain([first_run], runs)
+
+    if executor is None and ncpu <= 1:
+        for run_n, (pool, params) in runs:
+            start = time()
+            result = strategy(pool, params, price_sampler)
+            yield run_n, result, (_worker_name(), start, time())
+
+    elif not isinstance(executor, Executor):
+        # a temporary executor, with concurrent.futures executors as backend
+        backend = "multiprocessing" if executor is None else executor
+        with Executor(ncpu, backend=backend) as call_executor:
+            yield from _run(runs, price_sampler, strategy, ncpu, call_executor)
 
     else:
-        results = []
-        for pool, params in param_sampler:
-            metrics = strategy(pool, params, price_sampler)
-            results.append(metrics)
-        results = tuple(zip(*results))
+        executor.start()
+        sampler = executor.share(price_sampler)
+        wrapped_args_list = (
+            (
+                _strategy_for_run(strategy, executor),
+                executor.logging_queue,
+                run_n,
+                pool,
+                params,
+                sampler,
+            )
+            for run_n, (pool, params) in runs
+        )
+        yield from executor.imap_unordered(wrapped_run, wrapped_args_list)
+
+
+def _strategy_for_run(strategy, executor):
+    """
+    Returns the strategy to send to the executor for one run.
+
+    Worker processes each unpickle their own copy, but runs executed in this
+    process, e.g. by threads, would share the strategy and its metrics, which
+    are bound to each run's pool as it starts.  These runs get a deep copy.
+    """
+    if executor.uses_processes:
+        return strategy
+    return deepcopy(strategy)
+
+
+def _pending(runs, run_args):
+    """Yields the runs, keeping the arguments of each until it finishes."""
+    for run_n, args in runs:
+        run_args[run_n] = args
+        yield run_n, args
+
+
+def _load_checkpoints(runs, checkpoints, sink, progress):
+    """
+    Returns the runs not saved in the checkpoints and a sink that also saves
+    their results to the checkpoints.
+
+    Runs are read as the remaining runs are, and saved runs are passed to the
+    sink and counted as finished when read.
+    """
+    keys = {}
+
+    def remaining_runs():
+        n_read = n_loaded = 0
+        for run_n, (pool, params) in runs:
+            n_read += 1
+            # checkpoints and caches share keys
+            key = checkpoints[0].key(pool, params)
+            for checkpoint in checkpoints:
+                result = checkpoint.load(key)
+                if result is not None:
+                    sink.add(run_n, result)
+                    progress.loaded(run_n)
+                    n_loaded += 1
+                    break
+            else:
+                keys[run_n] = key
+                yield run_n, (pool, params)
+
+        logger.info(
+            "Loaded %s of %s runs from %s",
+            n_loaded,
+            n_read,
+            ", ".join(checkpoint.directory for checkpoint in checkpoints),
+        )
+
+    return remaining_runs(), CheckpointSink(sink, checkpoints, keys)
+
+
+def _log_cache_stats(checkpoints):
+    for checkpoint in checkpoints:
+        if isinstance(checkpoint, ResultCache):
+            stats = checkpoint.stats
+            logger.info(
+                "Result cache %s: %s hits, %s misses, %s evictions, %s MB",
+                checkpoint.directory,
+                stats["hits"],
+                stats["misses"],
+                stats["evictions"],
+                round(stats["size"] / 1024**2, 1),
+            )
+
 
-    return results
+class _Progress:
+    """Counts finished runs, logging and reporting progress."""
+
+    def __init__(self, n_runs, n_finished, callback):
+        self.n_runs = n_runs
+        self.n_finished = n_finished
+        self.callback = callback
+
+    def update(self, run_n):
+        """Records that a run finished."""
+        self._record(logging.INFO, "Finished run %s", run_n)
+
+    def loaded(self, run_n):
+        """Records that a run's results were loaded from a checkpoint or cache."""
+        self._record(logging.DEBUG, "Loaded run %s", run_n)
+
+    def _record(self, level, message, run_n):
+        self.n_finished += 1
+        if self.n_runs is None:
+            logger.log(level, message + " (%s)", run_n, self.n_finished)
+        else:
+            logger.log(level, message + " (%s/%s)", run_n, self.n_finished, self.n_runs)
+        if self.callback is not None:
+            self.callback(self.n_finished, self.n_runs)
+
+
+def wrapped_run(args):
+    """
+    Runs the strategy with `wrapped_strategy`, returning the run index
+    along with the results, so runs can finish in any order, and the
+    worker's process name with the run's start and end times.
+
+    Must be defined at the top-level of the module so it can
+    be pickled.
+    """
+    strategy, logging_queue, run_n, *strategy_args = args
+    start = time()
+    result = wrapped_strategy(strategy, logging_queue, *strategy_args)
+    return run_n, result, (_worker_name(), start, time())
 
 
 def wrapped_strategy(strategy, logging_queue, *args):
     """
     This wrapper ensures we configure logging to use the
     multiprocessing enqueueing logic within the new process.
+    Without a logging queue, e.g. in threads, logging is left as is.
 
     Must be defined at the top-level of the module so it can
     be pickled.
     """
-    configure_multiprocess_logging(logging_queue)
+    if logging_queue is not None:
+        configure_multiprocess_logging(logging_queue)
     return strategy(*args)
+
+
+def _worker_name():
+    """Returns the process name, with the thread name if not the main thread."""
+    thread = current_thread()
+    if thread is main_thread():
+        return current_process().name
+    return f"{current_process().name}/{thread.name}"
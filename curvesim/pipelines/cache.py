@@ -0,0 +1,140 @@
+"""
+On-disk cache of pipeline run results.
+
+Unlike a :class:`~curvesim.pipelines.checkpoint.Checkpoint`, which keeps
+the runs of one sweep until it completes, a result cache is meant to be
+shared by any number of pipeline calls, e.g. across notebooks and days.
+Runs are keyed the same way, by a hash of all their inputs, so a run is
+only simulated once for any given pool, parameters, price data, strategy,
+and curvesim version.
+
+The cache is bounded in size, evicting the least recently used results.
+"""
+import os
+from glob import glob
+
+from curvesim.logging import get_logger
+from curvesim.utils import override
+
+from .checkpoint import Checkpoint
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_SIZE = 2 * 1024**3
+"""Default size bound for result caches, in bytes."""
+
+
+class ResultCache(Checkpoint):
+    """
+    Size-bounded directory of run results with least-recently-used eviction
+    and hit/miss statistics.
+    """
+
+    def __init__(self, directory, price_sampler, strategy, max_size=DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory to cache results in; created if needed.
+
+        price_sampler : iterable
+            The pipeline's price sampler.
+
+        strategy : callable
+            The pipeline's strategy.
+
+        max_size : int, default=2GiB
+            Maximum total size of cached results, in bytes.
+        """
+        super().__init__(directory, price_sampler, strategy)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = sum(size for _, size, _ in self._entries())
+
+    @override
+    def load(self, key):
+        result = super().load(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        try:
+            # modification time marks when results were last used
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+        return result
+
+    @override
+    def save(self, key, result):
+        super().save(key, result)
+        try:
+            self._size += os.path.getsize(self._path(key))
+        except FileNotFoundError:
+            pass
+
+        if self._size > self.max_size:
+            self._evict()
+
+    @property
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            Number of cache hits, misses, and evictions by this object,
+            along with the number of entries and their total size in bytes.
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+        }
+
+    def clear(self):
+        """Removes all cached results."""
+        for _, _, path in self._entries():
+            _remove(path)
+        self._size = 0
+
+    def _evict(self):
+        """Removes the least recently used results until within `max_size`."""
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+
+        # always keep the most recent result, even if it exceeds the bound
+        for _, entry_size, path in entries[:-1]:
+            if size <= self.max_size:
+                break
+            if _remove(path):
+                self.evictions += 1
+            size -= entry_size
+
+        self._size = size
+        logger.debug("Result cache %s: %s bytes after eviction", self.directory, size)
+
+    def _entries(self):
+        """Returns the modification time, size, and path of each result."""
+        entries = []
+        for path in glob(os.path.join(self.directory, "*.pickle")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
@@ -0,0 +1,236 @@
+"""
+Checkpoints for resuming pipeline runs.
+
+A checkpoint directory holds the results of each completed run, saved as
+soon as the run finishes.  Runs are keyed by a hash of everything that
+determines their results: the pool's state with the run's parameters, the
+parameters themselves, the price data, the strategy, and the curvesim
+version.  The pool's state is described by its class, parameters, and
+balances (see :data:`POOL_STATE_ATTRS`), leaving out caches and the
+wall-clock block timestamp, so the same pool built in another session has
+the same key.  Rerunning a pipeline with the same checkpoint directory and
+arguments loads completed runs instead of running them again.
+"""
+import os
+import pickle
+from hashlib import sha256
+
+from pandas import DataFrame, Series
+from pandas.util import hash_pandas_object
+
+from curvesim.pool.base import Pool
+from curvesim.utils import atomic_write, override
+from curvesim.version import __version__
+
+from .sinks import ResultSink
+
+POOL_STATE_ATTRS = (
+    "math",
+    "n",
+    "A",
+    "gamma",
+    "rates",
+    "precisions",
+    "rate_multiplier",
+    "fee",
+    "fee_mul",
+    "mid_fee",
+    "out_fee",
+    "fee_gamma",
+    "allowed_extra_profit",
+    "adjustment_step",
+    "admin_fee",
+    "ma_half_time",
+    "balances",
+    "admin_balances",
+    "tokens",
+    "D",
+    "virtual_price",
+    "xcp_profit",
+    "xcp_profit_a",
+    "not_adjusted",
+    "price_scale",
+    "_price_oracle",
+    "last_prices",
+    "last_prices_timestamp",
+    "redemption_prices",
+)
+"""
+Pool attributes fingerprinted for checkpoint keys, where present.  Methods,
+such as the stableswap `D`, are skipped.  A metapool's basepool is
+fingerprinted the same way.
+"""
+
+
+class Checkpoint:
+    """
+    Directory of results from completed runs.
+    """
+
+    def __init__(self, directory, price_sampler, strategy):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory to save results in; created if needed.
+
+        price_sampler : iterable
+            The pipeline's price sampler, fingerprinted by its `prices` and
+            `volumes` DataFrames if it has them, or else by its pickle.
+
+        strategy : callable
+            The pipeline's strategy, fingerprinted by its class and attributes,
+            with metrics identified by class and settings.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+        base_hash = sha256(__version__.encode())
+        base_hash.update(_price_data_fingerprint(price_sampler))
+        base_hash.update(_strategy_fingerprint(strategy))
+        self._base_hash = base_hash
+
+    def key(self, pool, params):
+        """
+        Returns the key for the run with the given pool and parameters.
+
+        Parameters
+        ----------
+        pool : SimPool
+            The pool for the run, with the run's parameters set.
+
+        params : dict
+            The run's parameters.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the run.
+        """
+        run_hash = self._base_hash.copy()
+        run_hash.update(_pool_fingerprint(pool))
+        run_hash.update(repr(sorted(params.items())).encode())
+        return run_hash.hexdigest()
+
+    def load(self, key):
+        """
+        Returns the saved results for the run, or None if it isn't saved.
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, result):
+        """
+        Saves the results for the run.
+
+        The file is written under a temporary name and then renamed, so an
+        interrupted save never leaves a partial result.
+        """
+        with atomic_write(self._path(key), "wb") as f:
+            pickle.dump(result, f)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+
+class CheckpointSink(ResultSink):
+    """
+    Saves each run's results to checkpoints, such as result caches, before
+    passing them on to another sink.
+    """
+
+    def __init__(self, sink, checkpoints, keys):
+        """
+        Parameters
+        ----------
+        sink : ResultSink
+            Sink to pass results on to.
+
+        checkpoints : list of Checkpoint
+            Checkpoints to save results to.
+
+        keys : dict
+            Checkpoint key for each run index.
+        """
+        self.sink = sink
+        self.checkpoints = checkpoints
+        self.keys = keys
+
+    @override
+    def add(self, run_n, result):
+        for checkpoint in self.checkpoints:
+            checkpoint.save(self.keys[run_n], result)
+        self.sink.add(run_n, result)
+
+    @override
+    def close(self):
+        return self.sink.close()
+
+
+def _pool_fingerprint(pool):
+    """
+    Describes the pool by its class and the state attributes in
+    :data:`POOL_STATE_ATTRS`.  Objects other than pools are pickled.
+    """
+    if not isinstance(pool, Pool):
+        return pickle.dumps(pool)
+
+    pool_type = type(pool)
+    state = [pool_type.__module__, pool_type.__qualname__]
+    for name in POOL_STATE_ATTRS:
+        value = getattr(pool, name, None)
+        if value is None or callable(value):
+            continue
+        if isinstance(value, (DataFrame, Series)):
+            value = hash_pandas_object(value).to_numpy().tobytes()
+        state.append((name, value))
+
+    basepool = getattr(pool, "basepool", None)
+    if basepool is not None:
+        state.append(("basepool", _pool_fingerprint(basepool)))
+
+    return repr(state).encode()
+
+
+def _price_data_fingerprint(price_sampler):
+    frames = [getattr(price_sampler, name, None) for name in ("prices", "volumes")]
+    frames = [frame for frame in frames if isinstance(frame, DataFrame)]
+    if not frames:
+        return sha256(pickle.dumps(price_sampler)).digest()
+
+    data_hash = sha256()
+    for frame in frames:
+        data_hash.update(hash_pandas_object(frame).to_numpy().tobytes())
+        data_hash.update(repr(list(frame.columns)).encode())
+    return data_hash.digest()
+
+
+def _strategy_fingerprint(strategy):
+    attributes = {}
+    for name, value in sorted(vars(strategy).items()):
+        if name == "metrics":
+            value = [_metric_fingerprint(metric) for metric in value]
+        attributes[name] = value
+
+    strategy_type = type(strategy)
+    module = getattr(strategy, "__module__", strategy_type.__module__)
+    name = getattr(strategy, "__qualname__", strategy_type.__qualname__)
+    return repr((module, name, attributes)).encode()
+
+
+def _metric_fingerprint(metric):
+    """
+    Describes the metric by its class and its settings, e.g. the `factor` of
+    :class:`.PriceDepth`.  The pool a metric is bound to is left out.
+    """
+    attributes = dict(getattr(metric, "__dict__", {}))
+    for cls in type(metric).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if hasattr(metric, name):
+                attributes[name] = getattr(metric, name)
+    attributes.pop("_pool", None)
+    return type(metric).__qualname__, sorted(attributes.items())
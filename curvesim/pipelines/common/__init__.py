@@ -1,9 +1,17 @@
+from numpy import array
 from scipy.optimize import root_scalar
 
+from curvesim.exceptions import CurvesimException
 from curvesim.logging import get_logger
 from curvesim.metrics import metrics as Metrics
 
 logger = get_logger(__name__)
+
+NEWTON_MAX_ITERATIONS = 50
+NEWTON_XTOL = 1
+NEWTON_RTOL = 1e-10
+NEWTON_PTOL = 1e-10
+
 DEFAULT_METRICS = [
     Metrics.Timestamp,
     Metrics.PoolValue,
@@ -27,13 +35,16 @@ TEST_CRYPTO_PARAMS = {
 }
 
 
-def get_arb_trades(pool, prices):
+def get_arb_trades(pool, prices, price_matrix=None):
     """
     Returns triples of "trades", one for each coin pair in `combo`.
 
     Each trade is a triple consisting of size, ordered coin-pair,
     and price target to move the pool price to.
 
+    Sizes are found by Newton's method, using the pool's post-trade price
+    and its derivative, with Brent's method as a fallback.
+
     Parameters
     ----------
     pool: SimPool
@@ -42,6 +53,9 @@ def get_arb_trades(pool, prices):
     prices : iterable
         External market prices for each coin-pair
 
+    price_matrix : numpy.ndarray, optional
+        The pool's price matrix after fees, if already computed
+
 
     Returns
     -------
@@ -62,43 +76,250 @@ def get_arb_trades(pool, prices):
         return price - price_target
 
     trades = []
+    if price_matrix is None:
+        price_matrix = pool.price_matrix(use_fee=True)
 
     for pair in prices:
-        i, j = pair
-
-        if pool.price(i, j) - prices[pair] > 0:
-            price = prices[pair]
-            coin_in, coin_out = i, j
-        elif pool.price(j, i) - 1 / prices[pair] > 0:
-            price = 1 / prices[pair]
-            coin_in, coin_out = j, i
-        else:
+        coins, price = get_arb_target(pool, pair, prices[pair], price_matrix)
+        if coins is None:
             trades.append((0, pair, prices[pair]))
             continue
 
+        coin_in, coin_out = coins
         high = pool.get_max_trade_size(coin_in, coin_out)
-        bounds = (0, high)
-        try:
-            res = root_scalar(
-                post_trade_price_error,
-                args=(coin_in, coin_out, price),
-                bracket=bounds,
-                method="brentq",
-            )
-            size = int(res.root)
-        except ValueError:
-            pool_price = pool.price(coin_in, coin_out)
-            logger.error(
-                "Opt_arb error: Pair: (%s, %s), Pool price: %s,"
-                "Target Price: %s, Diff: %s",
-                coin_in,
-                coin_out,
-                pool_price,
-                price,
-                pool_price - price,
-            )
-            size = 0
+        size = _newton_arb_size(pool, coin_in, coin_out, price, high)
+
+        if size is None:
+            bounds = (0, high)
+            try:
+                res = root_scalar(
+                    post_trade_price_error,
+                    args=(coin_in, coin_out, price),
+                    bracket=bounds,
+                    method="brentq",
+                )
+                size = int(res.root)
+            except ValueError:
+                pool_price = pool.price(coin_in, coin_out)
+                logger.error(
+                    "Opt_arb error: Pair: (%s, %s), Pool price: %s,"
+                    "Target Price: %s, Diff: %s",
+                    coin_in,
+                    coin_out,
+                    pool_price,
+                    price,
+                    pool_price - price,
+                )
+                size = 0
 
         trades.append((size, (coin_in, coin_out), price))
 
     return trades
+
+
+def get_arb_pairs(pool, prices, price_matrix=None):
+    """
+    Returns which coin pairs have market prices outside the pool's fee band,
+    so they can be arbitraged profitably, along with the pool price errors.
+
+    This only needs the pool's price matrix after fees, so it is a cheap check
+    for timesteps with nothing to arbitrage.
+
+    Parameters
+    ----------
+    pool: SimPool
+        Pool to arbitrage on
+
+    prices : dict
+        External market prices for each coin-pair
+
+    price_matrix : numpy.ndarray, optional
+        The pool's price matrix after fees, if already computed
+
+
+    Returns
+    -------
+    arb_pairs : numpy.ndarray of bool
+        True for each coin pair that can be arbitraged
+
+    price_errors : numpy.ndarray
+        Pool price after fees minus market price for each coin pair
+    """
+    pairs = list(prices)
+    market_prices = array([prices[pair] for pair in pairs])
+
+    if price_matrix is None:
+        price_matrix = pool.price_matrix(use_fee=True)
+
+    i, j = get_pair_indices(pool, pairs)
+    pool_prices = price_matrix[i, j]
+    reverse_pool_prices = price_matrix[j, i]
+
+    arb_pairs = (pool_prices > market_prices) | (
+        reverse_pool_prices > 1 / market_prices
+    )
+    return arb_pairs, pool_prices - market_prices
+
+
+def get_arb_target(pool, pair, price, price_matrix=None):
+    """
+    Returns the direction to trade a coin pair in to move the pool price
+    toward the market price, along with the price target in that direction.
+
+    Parameters
+    ----------
+    pool: SimPool
+        Pool to arbitrage on
+
+    pair : tuple
+        Coin pair the market price is quoted for
+
+    price : float
+        External market price for the coin pair
+
+    price_matrix : numpy.ndarray, optional
+        The pool's price matrix after fees, to avoid recomputing it for
+        each pair
+
+
+    Returns
+    -------
+    coins : tuple or None
+        In token and out token, or None if there is no arbitrage after fees
+
+    price_target : float
+        Price target for the in token quoted in the out token
+    """
+    if price_matrix is None:
+        price_matrix = pool.price_matrix(use_fee=True)
+
+    i, j = pair
+    k, m = pool.get_asset_indices(i, j)
+
+    if price_matrix[k, m] - price > 0:
+        return (i, j), price
+
+    if price_matrix[m, k] - 1 / price > 0:
+        return (j, i), 1 / price
+
+    return None, price
+
+
+def get_pair_indices(pool, pairs):
+    """
+    Returns arrays of the pool's indices for the in and out coins
+    of each coin pair, for indexing its price matrix.
+
+    Parameters
+    ----------
+    pool: SimPool
+        Pool to get indices for
+
+    pairs : list of tuple
+        Coin pairs of in token and out token
+
+
+    Returns
+    -------
+    in_indices : numpy.ndarray
+        Index of the in token for each pair
+
+    out_indices : numpy.ndarray
+        Index of the out token for each pair
+    """
+    indices = array([pool.get_asset_indices(*pair) for pair in pairs], dtype=int)
+    indices = indices.reshape(-1, 2)
+    return indices[:, 0], indices[:, 1]
+
+
+def _newton_arb_size(pool, coin_in, coin_out, price_target, high):
+    """
+    Find the trade size that moves the post-trade price to `price_target`
+    using Newton's method, safeguarded by bisection.
+
+    Uses the pool's `post_trade_price`, which gives the post-trade price
+    and its derivative without altering the pool.  Iterates are kept within
+    a bracket of the root, with the lower bound leaving the price above
+    target and the upper bound taking it below.  As in `rtsafe`, steps that
+    leave the bracket or don't shrink fast enough are replaced by bisection.
+
+    The search stops when the step is within `NEWTON_XTOL` plus
+    `NEWTON_RTOL` of the size, or the price is within `NEWTON_PTOL` of
+    the target, since pool prices are only accurate to about that level.
+
+    Returns
+    -------
+    int or None
+        The trade size or None if the solver fails, e.g. when there is no
+        root below `high` or the pool doesn't implement `post_trade_price`.
+    """
+    try:
+        return _newton_search(pool, coin_in, coin_out, price_target, high)
+    except (NotImplementedError, ArithmeticError, CurvesimException) as e:
+        logger.debug("Newton arb sizing failed, falling back to brentq: %s", e)
+        return None
+
+
+def _newton_search(pool, coin_in, coin_out, price_target, high):
+    """Newton iteration for `_newton_arb_size`."""
+    # pylint: disable=too-many-locals
+    lo = 0
+    hi = high
+    hi_checked = False
+    size = 0
+    prev_step = high
+
+    for _ in range(NEWTON_MAX_ITERATIONS):
+        price, slope = pool.post_trade_price(coin_in, coin_out, int(size))
+        # price**-0.5 is linear in size for constant-product pools,
+        # so it is better suited to Newton's method than the price
+        error = price**-0.5 - price_target**-0.5
+        slope = -0.5 * price**-1.5 * slope
+
+        if error < 0:
+            lo = size
+        else:
+            hi = size
+            hi_checked = True
+
+        if lo >= hi:
+            # price is above target even at the maximum size
+            return None
+
+        if abs(price - price_target) <= NEWTON_PTOL * price_target:
+            if slope > 0:
+                size = min(max(size - error / slope, lo), hi)
+            return int(size)
+
+        # a non-negative price slope, e.g. when a pool is drained, gives no step
+        step = -error / slope if slope > 0 else None
+        tol = NEWTON_XTOL + NEWTON_RTOL * size
+        if step is not None and abs(step) <= tol:
+            return int(size + step)
+
+        new_size = _safeguard_step(size, step, (lo, hi), hi_checked, prev_step)
+        if hi_checked and hi - lo <= tol:
+            return int(new_size)
+
+        prev_step = new_size - size
+        size = new_size
+
+    return None
+
+
+def _safeguard_step(size, step, bracket, hi_checked, prev_step):
+    """
+    Returns the next iterate from a Newton step, bisecting the bracket
+    when the step leaves it or is more than half the previous step.
+    The upper bound is tried first if it hasn't been evaluated.
+    """
+    lo, hi = bracket
+    if step is None:
+        return (lo + hi) / 2
+
+    new_size = size + step
+    if new_size >= hi and not hi_checked:
+        return hi
+    if not lo < new_size < hi or abs(step) > abs(prev_step) / 2:
+        return (lo + hi) / 2
+    return new_size
@@ -0,0 +1,289 @@
+"""
+Long-lived worker pools for running pipelines.
+
+Each pipeline call otherwise starts its own worker processes, which import
+curvesim and its dependencies before doing any work, and copies its price
+data into shared memory.  For short runs called repeatedly, e.g. from a
+notebook or service, this startup can take longer than the runs themselves.
+An :class:`Executor` keeps its workers, logging queue, and shared price data
+between calls:
+
+.. code-block::
+
+    with Executor(ncpu=8) as executor:
+        for pool in pools:
+            results = curvesim.autosim(pool, executor=executor)
+
+Runs can be executed by a :mod:`multiprocessing` pool (the default), or by
+any :class:`concurrent.futures.Executor`: process pools with a chosen start
+method, thread pools for free-threaded Python builds, a
+:class:`SerialExecutor` for debugging, or an executor from a job runner,
+so curvesim can run inside it without starting a process pool of its own.
+"""
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Executor as FuturesExecutor
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from itertools import islice
+from multiprocessing import get_context, resource_tracker
+from queue import SimpleQueue
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.logging import (
+    configure_multiprocess_logging,
+    get_logger,
+    multiprocessing_logging_queue,
+)
+from curvesim.templates.price_samplers import PriceSampler
+
+from .checkpoint import _price_data_fingerprint
+
+logger = get_logger(__name__)
+
+BACKENDS = ("multiprocessing", "process", "thread", "serial")
+
+
+class SerialExecutor(FuturesExecutor):
+    """
+    Runs each submitted call immediately in the calling thread, e.g. to debug
+    strategies with breakpoints or profilers.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        return future
+
+
+class Executor:  # pylint: disable=too-many-instance-attributes
+    """
+    Pool of workers reusable across pipeline calls.
+
+    Workers are started on first use and stopped by :meth:`close`, or on
+    leaving the executor's context.
+    """
+
+    def __init__(
+        self, ncpu=4, max_shared=4, backend="multiprocessing", start_method=None
+    ):
+        """
+        Parameters
+        ----------
+        ncpu : int, default=4
+            Number of workers.  For a :class:`concurrent.futures.Executor`
+            backend, the number of runs submitted to it at a time.
+
+        max_shared : int, default=4
+            Maximum number of price datasets to keep in shared memory.  The
+            least recently used are freed when more are shared.
+
+        backend : str or concurrent.futures.Executor, default="multiprocessing"
+            What runs are executed by:
+
+            - "multiprocessing": a :class:`multiprocessing.pool.Pool`
+            - "process": a :class:`concurrent.futures.ProcessPoolExecutor`
+            - "thread": a :class:`concurrent.futures.ThreadPoolExecutor`
+            - "serial": a :class:`SerialExecutor`, running in this thread
+            - an executor instance, which is used as is and not shut down
+
+            Only process pools use a logging queue and shared price data;
+            other backends are passed the price sampler as is, and a deep
+            copy of the strategy for each run, since strategies' metrics are
+            bound to the pool of the run using them.
+
+        start_method : str, optional
+            Start method for worker processes, e.g. "fork", "forkserver", or
+            "spawn".  Defaults to the platform's default.
+        """
+        # pylint: disable=too-many-arguments
+        if isinstance(backend, str) and backend not in BACKENDS:
+            raise CurvesimValueError(f"Executor backend must be one of {BACKENDS}.")
+
+        self.ncpu = ncpu
+        self.max_shared = max_shared
+        self.backend = backend
+        self.start_method = start_method
+        self.logging_queue = None
+        self._stack = ExitStack()
+        self._pool = None
+        self._shared = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def uses_processes(self):
+        """
+        True if runs are executed in worker processes started by the
+        executor, so they need a logging queue and shared price data.
+        """
+        return self.backend in ("multiprocessing", "process") or isinstance(
+            self.backend, ProcessPoolExecutor
+        )
+
+    def start(self):
+        """
+        Starts the workers, and logging queue for worker processes,
+        if not already started.
+        """
+        if self._pool is not None:
+            return
+
+        logger.debug("Starting %s workers (%s)", self.ncpu, self.backend)
+        if self.uses_processes:
+            # workers must inherit the resource tracker, or each starts its own,
+            # which unlinks shared price data it attached to when it exits
+            resource_tracker.ensure_running()
+            self.logging_queue = self._stack.enter_context(
+                multiprocessing_logging_queue()
+            )
+
+        if isinstance(self.backend, FuturesExecutor):
+            self._pool = self.backend
+        elif self.backend == "multiprocessing":
+            self._pool = self._stack.enter_context(
+                get_context(self.start_method).Pool(
+                    self.ncpu,
+                    initializer=configure_multiprocess_logging,
+                    initargs=(self.logging_queue,),
+                )
+            )
+        elif self.backend == "process":
+            self._pool = self._stack.enter_context(
+                ProcessPoolExecutor(
+                    self.ncpu,
+                    mp_context=get_context(self.start_method),
+                    initializer=configure_multiprocess_logging,
+                    initargs=(self.logging_queue,),
+                )
+            )
+        elif self.backend == "thread":
+            self._pool = self._stack.enter_context(ThreadPoolExecutor(self.ncpu))
+        else:
+            self._pool = SerialExecutor()
+
+    def imap_unordered(self, function, iterable):
+        """
+        Calls the function with each item in the iterable in the workers,
+        yielding results as they finish.
+
+        Items are dispatched one at a time, in order, to whichever worker is
+        free, and read from the iterable only as workers become free, so at
+        most `ncpu` are pending at a time.  If a call raises an exception, it
+        is raised here and calls not yet started are cancelled.
+        """
+        self.start()
+        if isinstance(self._pool, FuturesExecutor):
+            return _imap_futures(self._pool, function, iterable, self.ncpu)
+        return _imap_pool(self._pool, function, iterable, self.ncpu)
+
+    def share(self, price_sampler):
+        """
+        Returns a version of the price sampler for workers, with its data in
+        shared memory if it is a :class:`.PriceSampler` and workers are
+        processes.
+
+        Price samplers with the same data share the same memory, which is kept
+        until the executor is closed or the data is among the least recently
+        used beyond `max_shared`.
+        """
+        if not self.uses_processes or not isinstance(price_sampler, PriceSampler):
+            return price_sampler
+
+        key = (type(price_sampler), _price_data_fingerprint(price_sampler))
+        if key in self._shared:
+            self._shared.move_to_end(key)
+            return self._shared[key][1]
+
+        stack = ExitStack()
+        sampler = stack.enter_context(price_sampler.shared())
+        self._shared[key] = (stack, sampler)
+
+        while len(self._shared) > self.max_shared:
+            _, (old_stack, _) = self._shared.popitem(last=False)
+            old_stack.close()
+
+        return sampler
+
+    def close(self):
+        """Stops the workers and frees shared price data."""
+        if self._pool is not None and hasattr(self._pool, "join"):
+            self._pool.close()
+            self._pool.join()  # coverage needs this
+        self._pool = None
+
+        # shut down workers before freeing data they may be attached to
+        self._stack.close()
+        self.logging_queue = None
+
+        while self._shared:
+            _, (stack, _) = self._shared.popitem()
+            stack.close()
+
+
+def _imap_futures(executor, function, iterable, n_pending):
+    """
+    Submits calls to a :class:`concurrent.futures.Executor`, keeping at most
+    `n_pending` unfinished at a time, and yields results as they finish.
+    """
+    items = iter(iterable)
+    pending = {executor.submit(function, item) for item in islice(items, n_pending)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.update(
+                    executor.submit(function, item) for item in islice(items, 1)
+                )
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        # calls already running may still use shared data
+        wait(pending)
+
+
+def _imap_pool(pool, function, iterable, n_pending):
+    """
+    Like :func:`_imap_futures`, for a :class:`multiprocessing.pool.Pool`,
+    whose own `imap_unordered` reads the whole iterable ahead of the workers.
+    """
+    finished = SimpleQueue()
+
+    def submit(item):
+        pool.apply_async(
+            function,
+            (item,),
+            callback=lambda result: finished.put((result, None)),
+            error_callback=lambda exc: finished.put((None, exc)),
+        )
+
+    items = iter(iterable)
+    n_running = 0
+    try:
+        for item in islice(items, n_pending):
+            submit(item)
+            n_running += 1
+
+        while n_running:
+            result, exc = finished.get()
+            n_running -= 1
+            if exc is not None:
+                raise exc
+            for item in islice(items, 1):
+                submit(item)
+                n_running += 1
+            yield result
+    finally:
+        # calls already running may still use shared data
+        for _ in range(n_running):
+            finished.get()
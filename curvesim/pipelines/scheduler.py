@@ -0,0 +1,203 @@
+"""
+Scheduling for parallel pipeline runs.
+
+Run times vary a lot across pool parameters, e.g. high-A pools need more
+Newton iterations and low-fee pools make more arbitrage trades.  If the
+slowest runs start last, one worker is left finishing them long after the
+others are idle.  To avoid this, runs are dispatched one at a time to
+whichever worker is free, longest first, using run times recorded from
+previous sweeps to estimate the cost of each run.
+"""
+import json
+from collections import defaultdict
+from math import log
+from numbers import Integral, Real
+from pathlib import Path
+
+from curvesim.logging import get_logger
+from curvesim.utils import atomic_write
+
+logger = get_logger(__name__)
+
+
+class CostModel:
+    """
+    Estimates the run time of pipeline runs from a history of run times.
+
+    Runs are identified by the pool type and parameters.  Runs without
+    recorded times are estimated from the nearest recorded run with the same
+    pool type and parameter names, comparing parameters on a log scale.
+
+    Times are recorded per timestep, so a history recorded on price data of
+    one length also estimates runs on longer or shorter price data.
+    """
+
+    def __init__(self, path=None, n_steps=1):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            JSON file to load the history from and save it to.  Without a
+            path, only runs recorded by this object are used.
+
+        n_steps : int, default=1
+            Number of timesteps in each run.
+        """
+        self.path = path
+        self.n_steps = n_steps
+        self.history = {}
+        if path is not None and Path(path).exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.history = json.load(f)
+
+    def estimate(self, pool, params):
+        """
+        Returns the estimated run time in seconds, or None if there is no
+        recorded run to estimate from.
+        """
+        pool_type, key = _history_key(pool, params)
+        runs = self.history.get(pool_type, {})
+        if key in runs:
+            return runs[key]["step_time"] * self.n_steps
+
+        best_time = None
+        best_distance = float("inf")
+        for run in runs.values():
+            distance = _log_distance(params, run["params"])
+            if distance < best_distance:
+                best_distance = distance
+                best_time = run["step_time"] * self.n_steps
+
+        return best_time
+
+    def record(self, pool, params, run_time):
+        """Records the run time in seconds of a run."""
+        pool_type, key = _history_key(pool, params)
+        self.history.setdefault(pool_type, {})[key] = {
+            "params": _json_params(params),
+            "step_time": run_time / self.n_steps,
+        }
+
+    def order(self, runs):
+        """
+        Returns runs sorted by estimated run time, longest first.
+
+        Runs without an estimate keep their order, after the estimated runs.
+
+        Parameters
+        ----------
+        runs : list of tuple
+            Each run as `(run_n, (pool, params))`.
+        """
+        estimates = [self.estimate(pool, params) for _, (pool, params) in runs]
+        if any(estimate is None for estimate in estimates):
+            logger.debug("No run time estimates for some runs; keeping grid order.")
+
+        order = sorted(
+            range(len(runs)),
+            key=lambda n: (estimates[n] is None, -(estimates[n] or 0), n),
+        )
+        return [runs[n] for n in order]
+
+    def save(self):
+        """Saves the history to `path`, replacing the file atomically."""
+        if self.path is None:
+            return
+
+        with atomic_write(self.path) as f:
+            json.dump(self.history, f)
+
+
+class WorkerUtilization:
+    """
+    Tracks how long each worker process spends on runs, to report the
+    fraction of the pipeline's wall-clock time each worker was busy.
+    """
+
+    def __init__(self):
+        self.busy_time = defaultdict(float)
+        self.n_runs = defaultdict(int)
+        self.start = None
+        self.end = None
+
+    def record(self, worker, start, end):
+        """
+        Records a run's start and end times, from :func:`time.time`, for
+        the worker it ran on.
+        """
+        self.busy_time[worker] += end - start
+        self.n_runs[worker] += 1
+        self.start = start if self.start is None else min(self.start, start)
+        self.end = end if self.end is None else max(self.end, end)
+
+    def report(self):
+        """
+        Returns
+        -------
+        dict
+            For each worker, the number of runs, the busy time in seconds, and
+            the fraction of the wall-clock time spent busy.
+        """
+        wall_time = (self.end - self.start) if self.start is not None else 0
+        return {
+            worker: {
+                "runs": self.n_runs[worker],
+                "busy_time": busy_time,
+                "utilization": busy_time / wall_time if wall_time else 1.0,
+            }
+            for worker, busy_time in self.busy_time.items()
+        }
+
+    def log(self):
+        """Logs the utilization of each worker."""
+        for worker, stats in self.report().items():
+            logger.info(
+                "Worker %s: %s runs, busy %.1fs (%.0f%% utilization)",
+                worker,
+                stats["runs"],
+                stats["busy_time"],
+                100 * stats["utilization"],
+            )
+
+
+def _history_key(pool, params):
+    return type(pool).__name__, repr(sorted(_json_params(params).items()))
+
+
+def _json_params(params):
+    return {name: _json_value(value) for name, value in params.items()}
+
+
+def _json_value(value):
+    """Converts numbers, e.g. numpy integers, to JSON types; others to reprs."""
+    if isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, Real):
+        return float(value)
+    return repr(value)
+
+
+def _log_distance(params, other_params):
+    """
+    Distance between parameter sets on a log scale, or infinity if they
+    aren't comparable.
+    """
+    if params.keys() != other_params.keys():
+        return float("inf")
+
+    distance = 0
+    for name, value in params.items():
+        other_value = other_params[name]
+        if value == other_value:
+            continue
+        if not _is_positive_number(value) or not _is_positive_number(other_value):
+            return float("inf")
+        distance += (log(value) - log(other_value)) ** 2
+
+    return distance
+
+
+def _is_positive_number(value):
+    return isinstance(value, Real) and not isinstance(value, bool) and value > 0
@@ -0,0 +1,349 @@
+"""
+Searches over pool parameters that avoid running a full grid.
+
+Many parameter sets in a sweep are clearly worse than others long before the
+end of the price data.  :func:`successive_halving` runs every candidate on
+a prefix of the price data, ranks them by a summary metric, and continues only
+the best.  This repeats with longer prefixes until the finalists reach the end
+of the data.  Runs continue from where they stopped, so no timestep is
+simulated twice.  Each run's state log stays in the calling process: workers
+are sent only the run's pool and trader with the timesteps to run next, and
+return them with the log entries for those timesteps.
+
+With 64 candidates and `keep=0.5`, the candidates run on 1/64 of the data,
+the best 32 continue to 1/32, and so on, simulating about 4 full runs' worth
+of timesteps instead of 64.
+
+:func:`adaptive_search` instead runs batches of parameters proposed by an
+:class:`~curvesim.iterators.param_samplers.AdaptivePoolSampler`, which
+adapts its proposals to the results of previous batches.
+"""
+from contextlib import nullcontext
+from copy import copy, deepcopy
+from math import ceil
+
+from pandas import DataFrame
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.logging import configure_multiprocess_logging, get_logger
+from curvesim.metrics import make_results
+from curvesim.metrics.state_log.log import prepare_metrics
+from curvesim.templates import StrategyRun
+
+from . import run_pipeline
+from .executor import Executor
+
+logger = get_logger(__name__)
+
+DEFAULT_METRIC = ("pool_value", "annualized_returns")
+"""Summary statistic used to rank runs by default."""
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def successive_halving(
+    param_sampler,
+    price_sampler,
+    strategy,
+    *,
+    metric=DEFAULT_METRIC,
+    maximize=True,
+    keep=0.5,
+    n_final=1,
+    ncpu=1,
+    executor=None,
+):
+    """
+    Finds the best parameters by successively halving the candidate runs.
+
+    Parameters
+    ----------
+    param_sampler : iterator
+        An iterator that returns pool parameters (see :mod:`.param_samplers`).
+
+    price_sampler : iterator
+        An iterator that returns a time-series of prices, with a `prices`
+        DataFrame (and optionally a `volumes` DataFrame) giving the data for
+        each timestep (see :mod:`.price_samplers`).  Runs are advanced on
+        copies of the sampler with these DataFrames windowed to the next
+        timesteps.
+
+    strategy : :class:`~curvesim.templates.Strategy`
+        Strategy to run, with metrics that compute the ranking metric.
+
+    metric : tuple, default=("pool_value", "annualized_returns")
+        Column of the strategy's summary data to rank runs by.
+
+    maximize : bool, default=True
+        Whether higher values of the metric are better.
+
+    keep : float, default=0.5
+        Fraction of runs continued after each ranking.
+
+    n_final : int, default=1
+        Number of runs to continue to the end of the price data.
+
+    ncpu : int, default=1
+        Number of cores to use.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \\
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool to run on, as for :func:`.run_pipeline`.
+
+    Returns
+    -------
+    results : tuple
+        The strategy's metrics for the finalists over all the price data, in
+        the order of the parameter sampler, as from :func:`.run_pipeline`.
+
+    history : pandas.DataFrame
+        For each run and ranking: the run index, the ranking ("rung") number,
+        the number of timesteps run, the metric value, whether the run was
+        kept, and the run's parameters.
+    """
+    if not 0 < keep < 1:
+        raise CurvesimValueError("`keep` must be between 0 and 1.")
+    if n_final < 1:
+        raise CurvesimValueError("`n_final` must be at least 1.")
+
+    runs = {
+        run_n: (params, strategy.start(pool, params, price_sampler))
+        for run_n, (pool, params) in enumerate(param_sampler)
+    }
+    budgets = _budgets(len(runs), len(price_sampler.prices), keep, n_final)
+
+    history = []
+    with _executor(ncpu, executor) as call_executor:
+        for rung, budget in enumerate(budgets):
+            scores, results = _advance_runs(
+                runs, budget, price_sampler, strategy, call_executor, metric
+            )
+
+            if rung == len(budgets) - 1:
+                n_kept = len(runs)
+            else:
+                n_kept = max(n_final, ceil(len(runs) * keep))
+
+            ranked = _rank(scores, maximize)
+            kept = set(ranked[:n_kept])
+            for run_n in ranked:
+                params = runs[run_n][0]
+                history.append(
+                    {
+                        "run": run_n,
+                        "rung": rung,
+                        "steps": budget,
+                        "score": scores[run_n],
+                        "kept": run_n in kept,
+                        **params,
+                    }
+                )
+
+            logger.info(
+                "Rung %s: kept %s of %s runs after %s timesteps",
+                rung,
+                n_kept,
+                len(runs),
+                budget,
+            )
+            runs = {run_n: runs[run_n] for run_n in sorted(kept)}
+
+    results = tuple(zip(*[results[run_n] for run_n in runs]))
+    return results, DataFrame(history)
+
+
+def adaptive_search(
+    param_sampler,
+    price_sampler,
+    strategy,
+    n_batches,
+    *,
+    objective=DEFAULT_METRIC,
+    ncpu=None,
+    executor=None,
+):
+    """
+    Runs batches of parameters proposed by an adaptive sampler, passing
+    each batch's objective values back to the sampler.
+
+    Parameters
+    ----------
+    param_sampler : :class:`~curvesim.iterators.param_samplers.AdaptivePoolSampler`
+        Sampler proposing the parameters, which decides whether the objective
+        is maximized or minimized.
+
+    price_sampler : iterator
+        An iterator that returns (minimally) a time-series of prices
+        (see :mod:`.price_samplers`).
+
+    strategy : :class:`~curvesim.templates.Strategy`
+        Strategy to run, with metrics that compute the objective.
+
+    n_batches : int
+        Number of batches to run.
+
+    objective : tuple or callable, default=("pool_value", "annualized_returns")
+        Column of :meth:`.SimResults.summary` to optimize, or a function
+        returning the objective value of each run from the summary.
+
+    ncpu : int, optional
+        Number of cores to use.  Defaults to the sampler's batch size.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \\
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool to run on, as for :func:`.run_pipeline`.
+
+    Returns
+    -------
+    best : tuple
+        The best parameters found and their objective value.
+
+    history : pandas.DataFrame
+        The parameters and objective value of each run.
+    """
+    # pylint: disable=too-many-arguments
+    ncpu = ncpu or param_sampler.batch_size
+
+    for batch in range(n_batches):
+        output = run_pipeline(
+            param_sampler, price_sampler, strategy, ncpu=ncpu, executor=executor
+        )
+        summary = make_results(*output, strategy.metrics).summary()
+        if callable(objective):
+            scores = objective(summary)
+        else:
+            scores = summary[objective]
+
+        param_sampler.tell(scores)
+        logger.info("Finished batch %s of %s", batch + 1, n_batches)
+
+    return param_sampler.best, param_sampler.history
+
+
+def _budgets(n_runs, horizon, keep, n_final):
+    """
+    Returns the number of timesteps to run at each ranking, ending with all
+    timesteps once `n_final` runs remain.
+    """
+    n_rungs = 0
+    while n_runs > n_final:
+        n_runs = max(n_final, ceil(n_runs * keep))
+        n_rungs += 1
+
+    return [
+        max(1, round(horizon * keep ** (n_rungs - rung))) for rung in range(n_rungs)
+    ] + [horizon]
+
+
+def _executor(ncpu, executor):
+    """Returns a context giving the executor to advance runs with."""
+    if isinstance(executor, Executor):
+        return nullcontext(executor)
+    if executor is None and ncpu <= 1:
+        return Executor(1, backend="serial")
+    return Executor(ncpu, backend="multiprocessing" if executor is None else executor)
+
+
+def _advance_runs(runs, budget, price_sampler, strategy, executor, metric):
+    """
+    Advances the runs to `budget` timesteps, updating them in place, and
+    returns each run's metric value and results.
+    """
+    # pylint: disable=too-many-arguments
+    executor.start()
+    sampler = executor.share(price_sampler)
+    args_list = [
+        (
+            strategy,
+            executor.logging_queue,
+            run_n,
+            run.pool,
+            run.trader,
+            sampler,
+            run.n_steps,
+            budget,
+        )
+        for run_n, (_, run) in runs.items()
+    ]
+
+    scores = {}
+    results = {}
+    for run_n, pool, trader, log_entries in executor.imap_unordered(
+        advance_run, args_list
+    ):
+        run = runs[run_n][1]
+        _update_run(run, pool, trader, log_entries, budget)
+
+        # metrics are computed here, one run at a time, so runs can share them
+        result = strategy.finish(run)
+        scores[run_n] = _get_score(result, metric)
+        results[run_n] = result
+
+    return scores, results
+
+
+def advance_run(args):
+    """
+    Advances a run's pool and trader through timesteps `start` to `stop`,
+    returning the run index, the pool and trader, and the state log entries
+    for those timesteps.
+
+    Must be defined at the top-level of the module so it can
+    be pickled.
+    """
+    # pylint: disable=too-many-locals
+    strategy, logging_queue, run_n, pool, trader, price_sampler, start, stop = args
+    if logging_queue is not None:
+        configure_multiprocess_logging(logging_queue)
+
+    state_log = strategy.state_log_class(pool, [])
+    run = StrategyRun(pool, trader, state_log, start)
+    strategy.advance(run, _window(price_sampler, start, stop))
+    return run_n, pool, trader, state_log.state_per_trade
+
+
+def _update_run(run, pool, trader, log_entries, n_steps):
+    """Continues a run with the pool, trader, and log entries from a worker."""
+    run.pool = pool
+    run.trader = trader
+    run.n_steps = n_steps
+
+    state_log = run.state_log
+    state_log.state_per_trade.extend(log_entries)
+
+    # metrics set the pool to each logged state, so give them a copy to change
+    state_log.pool = deepcopy(pool)
+    prepare_metrics(state_log.metrics, state_log.pool)
+
+
+def _window(price_sampler, start, stop):
+    """
+    Copy of the price sampler that iterates over timesteps `start` to `stop`
+    only, without iterating over the earlier timesteps.
+    """
+    window = copy(price_sampler)
+    window.prices = price_sampler.prices.iloc[start:stop]
+    if hasattr(price_sampler, "volumes"):
+        window.volumes = price_sampler.volumes.iloc[start:stop]
+    return window
+
+
+def _get_score(result, metric):
+    summary_data = result[-1]
+    try:
+        return float(summary_data[metric].iloc[0])
+    except KeyError as e:
+        raise CurvesimValueError(
+            f"Metric {metric} not in summary data: {list(summary_data.columns)}"
+        ) from e
+
+
+def _rank(scores, maximize):
+    """Returns run indices from best to worst score, with missing scores last."""
+
+    def sort_key(run_n):
+        score = scores[run_n]
+        if score != score:  # pylint: disable=comparison-with-itself
+            return (1, 0)
+        return (0, -score if maximize else score)
+
+    return sorted(scores, key=sort_key)
@@ -6,6 +6,7 @@ from curvesim.metrics import init_metrics
 from curvesim.metrics.results import make_results
 from curvesim.pipelines import run_pipeline
 from curvesim.pipelines.simple.strategy import SimpleStrategy
+from curvesim.pipelines.sinks import MemorySink
 from curvesim.pool import get_sim_pool
 from curvesim.pool.cryptoswap.pool import CurveCryptoPool
 
@@ -25,6 +26,13 @@ def pipeline(  # pylint: disable=too-many-locals
     data_dir="data",
     ncpu=None,
     env="prod",
+    math="exact",
+    sink=None,
+    progress=None,
+    checkpoint_dir=None,
+    cache_dir=None,
+    cost_history=None,
+    executor=None,
 ):
     """
     Implements the simple arbitrage pipeline.  This is a very simplified version
@@ -73,7 +81,7 @@ def pipeline(  # pylint: disable=too-many-locals
         Number of days to pull price/volume data for.
 
     src : str, default="coingecko"
-        Source for price/volume data: "coingecko" or "local".
+        Source for price/volume data: "coingecko", "local", or "store".
 
     data_dir : str, default="data"
         relative path to saved price data folder
@@ -81,9 +89,47 @@ def pipeline(  # pylint: disable=too-many-locals
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    math : str, default="exact"
+        Calculation engine for the pool: "exact" for integer arithmetic
+        matching the smart contract or "float" for faster float64 arithmetic.
+
+    sink : :class:`~curvesim.pipelines.sinks.ResultSink`, optional
+        Receives each run's metrics as soon as the run finishes, instead of
+        keeping all runs in memory (see :mod:`curvesim.pipelines.sinks`).
+        Unless it is a :class:`~curvesim.pipelines.sinks.MemorySink`, the
+        output of the sink's `close` method is returned instead of results.
+
+    progress : callable, optional
+        Called with the number of finished runs and the total number of runs
+        after each run finishes.
+
+    checkpoint_dir : str, optional
+        Directory to save each run's results in as it finishes.  Rerunning
+        with the same arguments and directory loads the saved runs instead of
+        simulating them again, e.g. to resume an interrupted sweep.
+
+    cache_dir : str, optional
+        Directory of a result cache shared across calls.  Runs with the same
+        pool, parameters, price data, and settings as a cached run return
+        its results without simulating.  The cache is limited in size,
+        evicting the least recently used results.
+
+    cost_history : str, optional
+        JSON file of run times from previous calls.  With `ncpu` above one,
+        the runs expected to take longest are started first, so no worker
+        is left finishing a slow run after the others are idle.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool reused across calls, avoiding the startup cost of new
+        worker processes for each call, or the executor of a job runner to
+        run on instead of starting a process pool.
+
     Returns
     -------
     :class:`~curvesim.metrics.SimResults`
+        Or the output of the sink's `close` method, for sinks other than
+        :class:`~curvesim.pipelines.sinks.MemorySink`.
 
     """
     ncpu = ncpu or os.cpu_count()
@@ -96,7 +142,7 @@ def pipeline(  # pylint: disable=too-many-locals
 
     variable_params = variable_params or DEFAULT_PARAMS
 
-    pool = get_sim_pool(pool_address, chain, env=env, end_ts=end_ts)
+    pool = get_sim_pool(pool_address, chain, env=env, end_ts=end_ts, math=math)
 
     if test:
         fixed_params = {}
@@ -116,6 +162,20 @@ def pipeline(  # pylint: disable=too-many-locals
     _metrics = init_metrics(DEFAULT_METRICS, pool=pool)
     strategy = SimpleStrategy(_metrics)
 
-    output = run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+    output = run_pipeline(
+        param_sampler,
+        price_sampler,
+        strategy,
+        ncpu=ncpu,
+        sink=sink,
+        progress=progress,
+        checkpoint_dir=checkpoint_dir,
+        cache_dir=cache_dir,
+        cost_history=cost_history,
+        executor=executor,
+    )
+    if sink is not None and not isinstance(sink, MemorySink):
+        return output
+
     results = make_results(*output, _metrics)
     return results
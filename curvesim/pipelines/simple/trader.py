@@ -1,7 +1,7 @@
 from curvesim.logging import get_logger
 from curvesim.templates.trader import Trade, Trader
 
-from ..common import get_arb_trades
+from ..common import get_arb_pairs, get_arb_trades
 
 logger = get_logger(__name__)
 
@@ -33,9 +33,17 @@ class SimpleArbitrageur(Trader):
 
         additional_data: dict
             Dict of additional data to be passed to the state log as part of trade_data.
+            Includes the price errors and `skipped_steps`, 1 if the timestep was
+            skipped because no pair could be arbitraged and 0 otherwise.
         """
         pool = self.pool
-        trades = get_arb_trades(pool, prices)
+        price_matrix = pool.price_matrix(use_fee=True)
+        arb_pairs, _ = get_arb_pairs(pool, prices, price_matrix)
+        if not arb_pairs.any():
+            self.skipped_steps += 1
+            return [], {"price_errors": [], "skipped_steps": 1}
+
+        trades = get_arb_trades(pool, prices, price_matrix)
 
         max_profit = 0
         best_trade = None
@@ -57,6 +65,6 @@ class SimpleArbitrageur(Trader):
                     price_error = pool.price(i, j) - price_target
 
         if not best_trade:
-            return [], {"price_errors": []}
+            return [], {"price_errors": [], "skipped_steps": 0}
 
-        return [best_trade], {"price_errors": [price_error]}
+        return [best_trade], {"price_errors": [price_error], "skipped_steps": 0}
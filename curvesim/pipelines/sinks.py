@@ -0,0 +1,180 @@
+"""
+Sinks that collect the results of pipeline runs as they finish.
+
+When given a sink, :func:`curvesim.pipelines.run_pipeline` streams results:
+each run's output is passed to the sink as soon as the run completes, in
+whatever order runs complete, so the pipeline itself never holds more than
+one run's results.  The sink decides what is kept, e.g. in memory or on disk.
+"""
+import os
+from abc import ABC, abstractmethod
+from glob import glob
+from importlib.util import find_spec
+
+from pandas import concat, read_parquet
+
+from curvesim.exceptions import ResultsError
+from curvesim.utils import override
+
+RESULT_NAMES = ("data_per_run", "data_per_trade", "summary_data")
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+
+class ResultSink(ABC):
+    """
+    Receives the output of each pipeline run.
+    """
+
+    @abstractmethod
+    def add(self, run_n, result):
+        """
+        Receives the output of a finished run.
+
+        Parameters
+        ----------
+        run_n : int
+            Index of the run in the order of the parameter sampler.
+
+        result : tuple
+            Output of the strategy for the run, e.g. the `data_per_run`,
+            `data_per_trade`, and `summary_data` DataFrames for the
+            standard strategies.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Called once all runs have finished.
+
+        Returns
+        -------
+        Whatever :func:`.run_pipeline` should return; by default, None.
+        """
+        return None
+
+
+class MemorySink(ResultSink):
+    """
+    Keeps all results in memory, giving the same output as a pipeline run
+    without a sink.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    @override
+    def add(self, run_n, result):
+        self.results[run_n] = result
+
+    @override
+    def close(self):
+        """
+        Returns
+        -------
+        tuple
+            Contains each output of the strategy, e.g. `data_per_run`,
+            for all runs in run order.
+        """
+        results = [self.results[run_n] for run_n in sorted(self.results)]
+        return tuple(zip(*results))
+
+
+class CallbackSink(ResultSink):
+    """
+    Passes each result to a function, e.g. to aggregate or save it.
+    """
+
+    def __init__(self, callback):
+        """
+        Parameters
+        ----------
+        callback : callable
+            Called with the run index and result of each run.
+        """
+        self.callback = callback
+
+    @override
+    def add(self, run_n, result):
+        self.callback(run_n, result)
+
+
+class ParquetSink(ResultSink):
+    """
+    Writes each run's metrics to Parquet files in a directory,
+    with a subdirectory for each of `data_per_run`, `data_per_trade`,
+    and `summary_data`.
+
+    Parquet support is optional: this sink requires `pyarrow` or
+    `fastparquet`, which are not installed with curvesim.
+    """
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory to write the results to; created if needed.
+
+        Raises
+        ------
+        :class:`~curvesim.exceptions.ResultsError`
+            If neither `pyarrow` nor `fastparquet` is installed.
+        """
+        if not any(find_spec(engine) for engine in PARQUET_ENGINES):
+            raise ResultsError("ParquetSink requires pyarrow or fastparquet.")
+
+        self.directory = directory
+        for name in RESULT_NAMES:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+    @override
+    def add(self, run_n, result):
+        if len(result) != len(RESULT_NAMES):
+            raise ResultsError(
+                f"ParquetSink expects results with {len(RESULT_NAMES)} DataFrames."
+            )
+
+        for name, data in zip(RESULT_NAMES, result):
+            data.to_parquet(self._path(name, run_n))
+
+    @override
+    def close(self):
+        """
+        Returns
+        -------
+        str
+            The results directory.
+        """
+        return self.directory
+
+    def read(self, name):
+        """
+        Reads one kind of result for all runs.
+
+        Parameters
+        ----------
+        name : str
+            One of "data_per_run", "data_per_trade", or "summary_data".
+
+        Returns
+        -------
+        pandas.DataFrame
+            The results for all runs in run order, with a "run" column
+            giving the run index.
+        """
+        if name not in RESULT_NAMES:
+            raise ResultsError(f"Result name must be one of {RESULT_NAMES}.")
+
+        paths = glob(os.path.join(self.directory, name, "run_*.parquet"))
+        run_numbers = sorted(int(os.path.basename(p)[4:-8]) for p in paths)
+
+        data = []
+        for run_n in run_numbers:
+            run_data = read_parquet(self._path(name, run_n))
+            run_data.insert(0, "run", run_n)
+            data.append(run_data)
+
+        return concat(data, ignore_index=True)
+
+    def _path(self, name, run_n):
+        return os.path.join(self.directory, name, f"run_{run_n}.parquet")
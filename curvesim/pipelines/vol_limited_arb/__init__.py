@@ -14,6 +14,7 @@ from curvesim.pool_data.cache import PoolDataCache
 
 from .. import run_pipeline
 from ..common import DEFAULT_METRICS, DEFAULT_PARAMS, TEST_CRYPTO_PARAMS, TEST_PARAMS
+from ..sinks import MemorySink
 from ..utils import compute_volume_multipliers
 from .strategy import VolumeLimitedStrategy
 
@@ -36,6 +37,13 @@ def pipeline(
     vol_mode=1,
     ncpu=None,
     end=None,
+    math="exact",
+    sink=None,
+    progress=None,
+    checkpoint_dir=None,
+    cache_dir=None,
+    cost_history=None,
+    executor=None,
 ):
     """
     Implements the volume-limited arbitrage pipeline.
@@ -77,7 +85,7 @@ def pipeline(
         Number of days to pull pool and price data for.
 
     src : str, default="coingecko"
-        Source for price/volume data: "coingecko" or "local".
+        Source for price/volume data: "coingecko", "local", or "store".
 
     data_dir : str, default="data"
         relative path to saved price data folder
@@ -105,9 +113,47 @@ def pipeline(
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    math : str, default="exact"
+        Calculation engine for the pool: "exact" for integer arithmetic
+        matching the smart contract or "float" for faster float64 arithmetic.
+
+    sink : :class:`~curvesim.pipelines.sinks.ResultSink`, optional
+        Receives each run's metrics as soon as the run finishes, instead of
+        keeping all runs in memory (see :mod:`curvesim.pipelines.sinks`).
+        Unless it is a :class:`~curvesim.pipelines.sinks.MemorySink`, the
+        output of the sink's `close` method is returned instead of results.
+
+    progress : callable, optional
+        Called with the number of finished runs and the total number of runs
+        after each run finishes.
+
+    checkpoint_dir : str, optional
+        Directory to save each run's results in as it finishes.  Rerunning
+        with the same arguments and directory loads the saved runs instead of
+        simulating them again, e.g. to resume an interrupted sweep.
+
+    cache_dir : str, optional
+        Directory of a result cache shared across calls.  Runs with the same
+        pool, parameters, price data, and settings as a cached run return
+        its results without simulating.  The cache is limited in size,
+        evicting the least recently used results.
+
+    cost_history : str, optional
+        JSON file of run times from previous calls.  With `ncpu` above one,
+        the runs expected to take longest are started first, so no worker
+        is left finishing a slow run after the others are idle.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool reused across calls, avoiding the startup cost of new
+        worker processes for each call, or the executor of a job runner to
+        run on instead of starting a process pool.
+
     Returns
     -------
     SimResults object
+        Or the output of the sink's `close` method, for sinks other than
+        :class:`~curvesim.pipelines.sinks.MemorySink`.
     """
     if ncpu is None:
         cpu_count = os.cpu_count()
@@ -126,7 +172,7 @@ def pipeline(
     if pool_data_cache is None:
         pool_data_cache = PoolDataCache(pool_metadata, days=days, end=end)
 
-    pool = get_sim_pool(pool_metadata, pool_data_cache=pool_data_cache)
+    pool = get_sim_pool(pool_metadata, pool_data_cache=pool_data_cache, math=math)
 
     if test:
         fixed_params = {}
@@ -155,7 +201,21 @@ def pipeline(
     metrics = init_metrics(metrics, pool=pool)
     strategy = VolumeLimitedStrategy(metrics, vol_mult)
 
-    output = run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+    output = run_pipeline(
+        param_sampler,
+        price_sampler,
+        strategy,
+        ncpu=ncpu,
+        sink=sink,
+        progress=progress,
+        checkpoint_dir=checkpoint_dir,
+        cache_dir=cache_dir,
+        cost_history=cost_history,
+        executor=executor,
+    )
+    if sink is not None and not isinstance(sink, MemorySink):
+        return output
+
     results = make_results(*output, metrics)
 
     return results
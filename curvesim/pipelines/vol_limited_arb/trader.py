@@ -1,19 +1,64 @@
-from numpy import isnan
-from scipy.optimize import least_squares
+from numpy import array, array_equal, isnan
+from scipy.optimize import OptimizeResult, least_squares
 
+from curvesim.exceptions import CurvesimException
 from curvesim.logging import get_logger
+from curvesim.templates.sim_pool import SimPool
 from curvesim.templates.trader import Trade, Trader
+from curvesim.utils import dataclass
 
-from ..common import get_arb_trades
+from ..common import get_arb_pairs, get_arb_target, get_arb_trades, get_pair_indices
 
 logger = get_logger(__name__)
 
+# Solutions are kept strictly within the size bounds,
+# so trades within this relative tolerance are at their limit.
+LIMIT_RTOL = 1e-6
+
+
+@dataclass(slots=True)
+class OptimizerState:
+    """
+    State of the arbitrage optimizer carried over from the previous timestep.
+
+    Trades that were at their volume limit usually still are, since volume
+    limits bind when the market price has moved far from the pool price.
+    """
+
+    limited_pairs: set
+
+    def update(self, sizes, coins, limits):
+        """Records the trades that are at their volume limits."""
+        self.limited_pairs = {
+            pair
+            for size, pair, limit in zip(sizes, coins, limits)
+            if size >= limit * (1 - LIMIT_RTOL)
+        }
+
+    def clear(self):
+        """Discards the state, so the next optimization starts cold."""
+        self.limited_pairs = set()
+
 
 class VolumeLimitedArbitrageur(Trader):
     """
     Computes, executes, and reports out arbitrage trades.
+
+    Trades that were at their volume limit in the previous timestep are
+    checked against the new limit first, skipping the search for their size.
     """
 
+    def __init__(self, pool):
+        """
+        Parameters
+        ----------
+        pool :
+            Simulation interface to a subclass of :class:`.Pool`.
+
+        """
+        super().__init__(pool)
+        self.optimizer_state = OptimizerState(set())
+
     def compute_trades(self, prices, volume_limits):  # pylint: disable=arguments-differ
         """
         Computes trades to optimally arbitrage the pool, constrained by volume limits.
@@ -34,20 +79,47 @@ class VolumeLimitedArbitrageur(Trader):
 
         additional_data: dict
             Dict of additional data to be passed to the state log as part of trade_data.
+            Includes the price errors, the optimizer's iteration and function
+            evaluation counts, and `skipped_steps`, 1 if the timestep was skipped
+            because no pair could be arbitraged and 0 otherwise, so summing it
+            over the run gives `self.skipped_steps`.
         """
-
-        trades, errors, _ = multipair_optimal_arbitrage(
-            self.pool, prices, volume_limits
+        arb_pairs, errors = get_arb_pairs(self.pool, prices)
+        if not arb_pairs.any():
+            # errors are the same as from the optimizer, which doesn't trade
+            self.skipped_steps += 1
+            self.optimizer_state.clear()
+            return [], {
+                "price_errors": errors,
+                "optimizer_iterations": 0,
+                "optimizer_nfev": 0,
+                "skipped_steps": 1,
+            }
+
+        trades, errors, res = multipair_optimal_arbitrage(
+            self.pool, prices, volume_limits, self.optimizer_state
         )
-        return trades, {"price_errors": errors}
+        # least_squares evaluates the Jacobian once per iteration
+        return trades, {
+            "price_errors": errors,
+            "optimizer_iterations": res.get("njev", 0),
+            "optimizer_nfev": res.get("nfev", 0),
+            "skipped_steps": 0,
+        }
 
 
 def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
-    pool, prices, limits
+    pool, prices, limits, state=None
 ):
     """
     Computes trades to optimally arbitrage the pool, constrained by volume limits.
 
+    The optimizer starts from trades sized individually with
+    :func:`get_arb_trades` and limited to the volume limits.  If `state`
+    has trades that were at their volume limit, they are first checked
+    against the new limits, skipping the search for their sizes when the
+    limit still binds.  The state is updated with the new solution.
+
     Parameters
     ----------
     pool :
@@ -59,6 +131,9 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     volume_limits : dict
         Current volume limits for each trading pair.
 
+    state : :class:`OptimizerState`, optional
+        Optimizer state from the previous timestep, updated in place.
+
     Returns
     -------
     trades : List[Tuple]
@@ -71,20 +146,20 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
     res : scipy.optimize.OptimizeResult
         Results object from the numerical optimizer.
     """
-    init_trades = get_arb_trades(pool, prices)
-
-    # Limit trade size, add size bounds
-    limited_init_trades = []
-    for t in init_trades:
-        size, pair, price_target = t
-        limit = int(limits[pair] * 10**18)
-        t = min(size, limit), pair, price_target, 0, limit + 1
-        limited_init_trades.append(t)
+    limited_pairs = state.limited_pairs if state is not None else set()
+    limited_init_trades = _limited_init_trades(pool, prices, limits, limited_pairs)
 
     # Order trades in terms of expected size
     limited_init_trades = sorted(limited_init_trades, reverse=True, key=lambda t: t[0])
     sizes, coins, price_targets, lo, hi = zip(*limited_init_trades)
 
+    # Pools with analytic price derivatives give the Jacobian of the errors
+    # from the same post-trade state as the errors, instead of estimating it
+    # from an extra set of trades for each pair.
+    use_jacobian = type(pool).price_jacobian is not SimPool.price_jacobian
+    jacobian = {}
+    in_indices, out_indices = get_pair_indices(pool, coins)
+
     def post_trade_price_error_multi(dxs, price_targets, coins):
         with pool.use_snapshot_context():
             for k, pair in enumerate(coins):
@@ -98,13 +173,21 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
                 if dx > min_size:
                     pool.trade(coin_in, coin_out, dx)
 
-            errors = []
-            for k, pair in enumerate(coins):
-                price = pool.price(*pair, use_fee=True)
-                errors.append(price - price_targets[k])
+            price_matrix = pool.price_matrix(use_fee=True)
+            errors = price_matrix[in_indices, out_indices] - price_targets
+
+            if use_jacobian:
+                jacobian["x"] = array(dxs)
+                jacobian["J"] = pool.price_jacobian(coins)
 
         return errors
 
+    def post_trade_price_error_jacobian(dxs, price_targets, coins):
+        # least_squares evaluates the Jacobian at the last point evaluated
+        if "x" not in jacobian or not array_equal(dxs, jacobian["x"]):
+            post_trade_price_error_multi(dxs, price_targets, coins)
+        return jacobian["J"]
+
     # Find trades that minimize difference between
     # pool price and external market price
     trades = []
@@ -112,6 +195,7 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
         res = least_squares(
             post_trade_price_error_multi,
             x0=sizes,
+            jac=post_trade_price_error_jacobian if use_jacobian else "2-point",
             args=(price_targets, coins),
             bounds=(lo, hi),
             gtol=10**-15,
@@ -132,6 +216,8 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
                 trades.append(Trade(coin_in, coin_out, amount_in))
 
         errors = res.fun
+        if state is not None:
+            state.update(dxs, coins, [h - 1 for h in hi])
 
     except Exception:
         logger.error(
@@ -143,6 +229,56 @@ def multipair_optimal_arbitrage(  # noqa: C901  pylint: disable=too-many-locals
             exc_info=True,
         )
         errors = post_trade_price_error_multi([0] * len(sizes), price_targets, coins)
-        res = []
+        res = OptimizeResult()
+        if state is not None:
+            state.clear()
 
     return trades, errors, res
+
+
+def _limited_init_trades(pool, prices, limits, limited_pairs):
+    """
+    Returns initial trades, limited to the volume limits, with size bounds.
+
+    Pairs in `limited_pairs` start at their volume limit if that doesn't
+    reach the price target, which is the limited size that
+    :func:`get_arb_trades` would give.  Other pairs are sized with it.
+    """
+    init_trades = []
+    price_matrix = pool.price_matrix(use_fee=True)
+    for pair, price in prices.items():
+        if pair in limited_pairs or pair[::-1] in limited_pairs:
+            coins, price_target = get_arb_target(pool, pair, price, price_matrix)
+            if coins in limited_pairs:
+                limit = int(limits[coins] * 10**18)
+                if _limit_short_of_target(pool, coins, price_target, limit):
+                    init_trades.append((limit, coins, price_target))
+                    continue
+
+        init_trades.extend(get_arb_trades(pool, {pair: price}, price_matrix))
+
+    # Limit trade size, add size bounds
+    limited_init_trades = []
+    for t in init_trades:
+        size, pair, price_target = t
+        limit = int(limits[pair] * 10**18)
+        t = min(size, limit), pair, price_target, 0, limit + 1
+        limited_init_trades.append(t)
+
+    return limited_init_trades
+
+
+def _limit_short_of_target(pool, coins, price_target, limit):
+    """
+    Returns True if trading the volume limit leaves the pool price above
+    the price target, or False if it doesn't or the price can't be found.
+    """
+    if limit > pool.get_max_trade_size(*coins):
+        return False
+
+    try:
+        price, _ = pool.post_trade_price(*coins, limit)
+    except (NotImplementedError, ArithmeticError, CurvesimException):
+        return False
+
+    return price > price_target
@@ -147,6 +147,7 @@ def get_pool(
     normalize=False,
     end_ts=None,
     env="prod",
+    math="exact",
 ):
     """
     Constructs a pool object based on the stored data.
@@ -171,6 +172,10 @@ def get_pool(
     sim: bool, default=False
         If True, returns a `SimPool` version of the pool.
 
+    math: str, default="exact"
+        Calculation engine for the pool: "exact" for integer arithmetic
+        matching the smart contract or "float" for faster float64 arithmetic.
+
     Returns
     -------
     :class:`Pool`
@@ -194,6 +199,7 @@ def get_pool(
         )
 
     init_kwargs = pool_metadata.init_kwargs(balanced, balanced_base, normalize)
+    init_kwargs["math"] = math
     logger.debug(init_kwargs)
 
     pool_type = pool_metadata.pool_type
@@ -217,10 +223,14 @@ def get_sim_pool(
     pool_data_cache=None,
     end_ts=None,
     env="prod",
+    math="exact",
 ):
     """
     Effectively the same as the `get_pool` function but returns
     an object in the `SimPool` hierarchy.
+
+    Setting `math="float"` gives a pool using float64 arithmetic, which is
+    faster but only approximates the smart contract's integer results.
     """
     custom_kwargs = custom_kwargs or {}
 
@@ -243,6 +253,7 @@ def get_sim_pool(
         )
 
     init_kwargs = pool_metadata.init_kwargs(balanced, balanced_base, normalize=True)
+    init_kwargs["math"] = math
     logger.debug(init_kwargs)
 
     pool_type = pool_metadata.sim_pool_type
@@ -4,8 +4,11 @@ in the Curvesim Framework.
 """
 
 
+from curvesim.exceptions import CurvesimValueError
 from curvesim.pool.snapshot import SnapshotMixin
 
+MATH_ENGINES = ("exact", "float")
+
 
 class Pool(SnapshotMixin):
     """
@@ -23,6 +26,26 @@ class Pool(SnapshotMixin):
     # snapshotting will not work
     snapshot_class = None
 
+    @property
+    def math(self):
+        """
+        Calculation engine for the invariant, balance, and price calculations.
+
+        "exact" uses integer arithmetic matching the smart contract, while
+        "float" uses float64 arithmetic, which is much faster but only
+        accurate to ~1e-13 relative error.  Balances and fees are integers
+        for either engine.
+        """
+        return self._math
+
+    @math.setter
+    def math(self, math):
+        if math not in MATH_ENGINES:
+            raise CurvesimValueError(
+                f"`math` must be 'exact' or 'float', not {math!r}."
+            )
+        self._math = math  # pylint: disable=attribute-defined-outside-init
+
     @property
     def name(self):
         """Descriptive name for this pool"""
@@ -7,10 +7,11 @@ __all__ = [
     "newton_D",
     "get_y",
     "get_alpha",
+    "get_K0",
     "get_p",
     "halfpow",
 ]
-from math import ceil
+from math import ceil, prod
 from typing import List
 
 from gmpy2 import mpz
@@ -72,6 +73,15 @@ def get_y(A: int, gamma: int, xp: List[int], D: int, j: int) -> List[int]:
     return y_out
 
 
+def get_K0(xp: List[int], D: int) -> float:
+    """
+    N**N * prod(xp) / D**N, with 10**18 precision, as used in the
+    spot price calculations.
+    """
+    n_coins = len(xp)
+    return 10**18 * n_coins**n_coins * prod(xp) / D**n_coins
+
+
 def get_alpha(ma_half_time, block_timestamp, last_prices_timestamp, n_coins):
     if n_coins == 2:
         alpha: int = halfpow(
@@ -0,0 +1,262 @@
+"""
+Cryptoswap calculations in float64 arithmetic.
+
+These solve the same equations as the integer calculations, with the
+same Newton updates written in real rather than fixed-point terms, for
+any number of coins.  Results typically agree with the integer versions
+to within ~1e-13 relative error; inputs and outputs are integers with
+the usual precisions so they fit the pool's integer bookkeeping.
+
+Used by cryptoswap pools with ``math="float"``, and for the price
+derivatives used to size arbitrage trades.
+"""
+from math import prod
+from typing import List
+
+from curvesim.exceptions import CalculationError
+
+from .factory_2_coin import A_MULTIPLIER
+
+MAX_ITERATIONS = 255
+TOLERANCE = 1e-14
+
+
+def newton_D(ANN: int, gamma: int, x_unsorted: List[int], K0_prev: int = 0) -> int:
+    """
+    Finding the `D` invariant using Newton's method.
+
+    ANN is A * N**N from the whitepaper multiplied by the
+    factor A_MULTIPLIER.
+
+    `K0_prev` is accepted for compatibility with the integer version,
+    which uses it as a starting value, but isn't needed here.
+    """
+    # pylint: disable=unused-argument,too-many-locals
+    n_coins = len(x_unsorted)
+    x = [float(_x) for _x in x_unsorted]
+    AN = ANN / A_MULTIPLIER
+    g = gamma / 10**18
+
+    S = sum(x)
+    D = n_coins * prod(x) ** (1 / n_coins)
+
+    for _ in range(MAX_ITERATIONS):
+        D_prev = D
+
+        K0 = prod(n_coins * _x / D for _x in x)
+        _g1k0 = abs(g + 1 - K0)
+
+        # D / (A * N**N) * _g1k0**2 / gamma**2
+        mul1 = D / g * _g1k0 / g * _g1k0 / AN
+
+        # 2*N*K0 / _g1k0
+        mul2 = 2 * n_coins * K0 / _g1k0
+
+        neg_fprime = (S + S * mul2) + mul1 * n_coins / K0 - mul2 * D
+
+        # D -= f / fprime
+        D_plus = D * (neg_fprime + S) / neg_fprime
+        D_minus = D * D / neg_fprime + D * (mul1 / neg_fprime) * (1 - K0) / K0
+
+        if D_plus > D_minus:
+            D = D_plus - D_minus
+        else:
+            D = (D_minus - D_plus) / 2
+
+        if abs(D - D_prev) <= D * TOLERANCE:
+            for _x in x:
+                frac = _x / D
+                if frac < 0.01 or frac > 100:
+                    raise CalculationError("Unsafe value for x[i]")
+            return int(D)
+
+    raise CalculationError("Did not converge")
+
+
+def newton_y(ANN: int, gamma: int, x: List[int], D: int, i: int) -> int:
+    """
+    Calculating x[i] given other balances x[0..n_coins-1] and invariant D
+    ANN = A * N**N
+    """
+    # pylint: disable=too-many-locals
+    n_coins = len(x)
+    D = float(D)
+    AN = ANN / A_MULTIPLIER
+    g = gamma / 10**18
+
+    x_other = [float(x[k]) for k in range(n_coins) if k != i]
+    S_i = sum(x_other)
+    K0_i = prod(n_coins * _x / D for _x in x_other)
+    y = D / n_coins / K0_i
+
+    for _ in range(MAX_ITERATIONS):
+        y_prev = y
+
+        K0 = K0_i * y * n_coins / D
+        S = S_i + y
+
+        _g1k0 = abs(g + 1 - K0)
+
+        # D / (A * N**N) * _g1k0**2 / gamma**2
+        mul1 = D / g * _g1k0 / g * _g1k0 / AN
+
+        # 2*K0 / _g1k0
+        mul2 = 1 + 2 * K0 / _g1k0
+
+        yfprime = y + S * mul2 + mul1
+        _dyfprime = D * mul2
+        if yfprime < _dyfprime:
+            y = y_prev / 2
+            continue
+
+        yfprime -= _dyfprime
+        fprime = yfprime / y
+
+        # y -= f / f_prime;  y = (y * fprime - f) / fprime
+        y_minus = mul1 / fprime
+        y_plus = (yfprime + D) / fprime + y_minus / K0
+        y_minus += S / fprime
+
+        if y_plus < y_minus:
+            y = y_prev / 2
+        else:
+            y = y_plus - y_minus
+
+        if abs(y - y_prev) <= y * TOLERANCE:
+            frac = y / D
+            assert 0.01 <= frac <= 100  # dev: unsafe value for y
+            return int(y)
+
+    raise CalculationError("Did not converge")
+
+
+def get_y(ANN: int, gamma: int, x: List[int], D: int, i: int) -> List[int]:
+    """
+    Calculate x[i] given other balances x[0..N_COINS-1] and invariant D.
+
+    Returns the same pair as the integer `get_y`, where the second value
+    is a `K0` starting value for `newton_D`; as this isn't used here, it's
+    always zero.
+    """
+    return [newton_y(ANN, gamma, x, D, i), 0]
+
+
+def get_p(xp: List[int], D: int, A: int, gamma: int) -> List[int]:
+    """
+    Calculates dx/dy for each coin after the first.
+
+    Like the integer `get_p`, this is the 3-coin formula.
+
+    Output needs to be multiplied with price_scale to get the actual value.
+    """
+    n_coins = len(xp)
+    D = float(D)
+    x = [_x / D for _x in xp]
+    g = gamma / 10**18
+
+    K0 = n_coins**n_coins * prod(x)
+
+    # GK0 = 2 * K0**3 + (gamma + 1)**2 - K0**2 * (2 * gamma + 3)
+    # expanded around K0 = 1 to avoid cancellation, since K0 is near 1
+    # and GK0 is of order gamma**2
+    e = K0 - 1
+    GK0 = g**2 - 4 * g * e + (3 - 2 * g) * e**2 + 2 * e**3
+    NNAG2 = A / A_MULTIPLIER * g**2
+
+    denominator = GK0 + NNAG2 * x[0] * K0
+    return [
+        int(x[0] * (GK0 + NNAG2 * _x * K0) / _x / denominator * 10**18)
+        for _x in x[1:]
+    ]
+
+
+def get_K0(xp: List[int], D: int) -> float:
+    """
+    N**N * prod(xp) / D**N, with 10**18 precision, as used in the
+    spot price calculations.
+    """
+    n_coins = len(xp)
+    return 10**18 * prod(n_coins * x / D for x in xp)
+
+
+def dydx(i: int, j: int, xp: List[int], D: int, A: int, gamma: int) -> float:
+    """
+    Spot price of x[i] in x[j], without fees or price scaling.
+    """
+    # pylint: disable=too-many-arguments
+    F_x, _ = _invariant_derivatives(xp, D, A, gamma)
+    return F_x[i] / F_x[j]
+
+
+def dydx_log_derivative(
+    i: int, j: int, xp: List[int], D: int, A: int, gamma: int
+) -> float:
+    """
+    Derivative of the log of the spot price of x[i] in x[j] with respect
+    to x[i], moving along the invariant curve.
+
+    This gives the price impact of trading the i-th coin for the j-th coin.
+    """
+    # pylint: disable=too-many-arguments
+    F_x, F_xx = _invariant_derivatives(xp, D, A, gamma)
+    p = F_x[i] / F_x[j]
+    dpdx = (F_xx[i][i] - 2 * F_xx[i][j] * p + F_xx[j][j] * p**2) / F_x[j]
+    return dpdx / p / float(D)
+
+
+def dydx_log_gradient(
+    i: int, j: int, xp: List[int], D: int, A: int, gamma: int
+) -> List[float]:
+    """
+    Gradient of the log of the spot price of x[i] in x[j] with respect
+    to all balances, holding D fixed.
+
+    The price change from any trade, which keeps D fixed apart from fees,
+    is the dot product of this with the change in balances.
+    """
+    # pylint: disable=too-many-arguments
+    F_x, F_xx = _invariant_derivatives(xp, D, A, gamma)
+    D = float(D)
+    return [(F_xx[i][m] / F_x[i] - F_xx[j][m] / F_x[j]) / D for m in range(len(xp))]
+
+
+def _invariant_derivatives(xp, D, A, gamma):
+    """
+    Gradient and Hessian of the invariant function in the balances,
+    with balances normalized by D.
+    """
+    # pylint: disable=too-many-locals
+    n_coins = len(xp)
+    D = float(D)
+    x = [_x / D for _x in xp]
+    g = gamma / 10**18
+
+    # With D = 1, the invariant is F(x) = K * (sum(x) - 1) + prod(x) - N**-N,
+    # where K = c * h(K0), and the price is F_i / F_j.
+    c = A / A_MULTIPLIER * g**2 / n_coins**n_coins
+    P = prod(x)
+    K0 = n_coins**n_coins * P
+    S = sum(x)
+    t = g + 1 - K0
+    h = K0 / t**2
+    h1 = (g + 1 + K0) / t**3
+    h2 = (4 * (g + 1) + 2 * K0) / t**4
+
+    K = c * h
+    K_x = [c * h1 * K0 / _x for _x in x]
+    F_x = [K_k * (S - 1) + K + P / x_k for K_k, x_k in zip(K_x, x)]
+
+    F_xx = []
+    for k, x_k in enumerate(x):
+        row = []
+        for m, x_m in enumerate(x):
+            if k == m:
+                K_km = c * h2 * K0**2 / x_k**2
+                P_km = 0
+            else:
+                K_km = c * (h2 * K0**2 + h1 * K0) / (x_k * x_m)
+                P_km = P / (x_k * x_m)
+            row.append(K_km * (S - 1) + K_x[k] + K_x[m] + P_km)
+        F_xx.append(row)
+
+    return F_x, F_xx
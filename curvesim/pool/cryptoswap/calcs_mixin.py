@@ -0,0 +1,183 @@
+"""
+Price calculations for cryptoswap pools: spot prices, prices for all pairs
+of coins, and the price derivatives used to size arbitrage trades.
+
+Unlike stableswap pools, there is no `get_dy_batch`: the cryptoswap Newton
+iterations branch on each element's convergence and bounds, so quoting many
+sizes costs the same as calling `exchange` on a snapshot for each.
+"""
+from math import prod
+
+from numpy import array, fill_diagonal, outer
+
+from . import calcs
+from .calcs import factory_2_coin, float_math
+
+
+class CryptoswapCalcsMixin:
+    """
+    Pool mixin for spot prices and calculations over many coin pairs at
+    once, using the calculations for the pool's `math` engine.
+
+    The main class must implement the cryptoswap pool interface, i.e. `A`,
+    `gamma`, `D`, `price_scale`, fees, `_xp`, `_xp_mem`, and `_fee`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def _calcs(self):
+        """Calculations for the `math` engine, dispatching on the number of coins."""
+        if self.math == "float":
+            return float_math
+        return calcs
+
+    @property
+    def _calcs_2_coin(self):
+        """Calculations for the `math` engine, where "exact" uses 2-coin math."""
+        if self.math == "float":
+            return float_math
+        return factory_2_coin
+
+    def dydxfee(self, i, j):
+        """
+        Returns the spot price of i-th coin quoted in terms of j-th coin,
+        i.e. the ratio of output coin amount to input coin amount for
+        an "infinitesimally" small trade.
+
+        Trading fees are deducted.
+
+        Parameters
+        ----------
+        i: int
+            Index of coin to be priced; in a swapping context, this is
+            the "in"-token.
+        j: int
+            Index of quote currency; in a swapping context, this is the
+            "out"-token.
+
+        Returns
+        -------
+        float
+            Price of i-th coin quoted in j-th coin with fees deducted.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return self.dydx(i, j, use_fee=True)
+
+    def dydx(self, i, j, use_fee=False):
+        """
+        Returns the spot price of i-th coin quoted in terms of j-th coin,
+        i.e. the ratio of output coin amount to input coin amount for
+        an "infinitesimally" small trade.
+
+        Defaults to no fees deducted.
+
+        Parameters
+        ----------
+        i: int
+            Index of coin to be priced; in a swapping context, this is
+            the "in"-token.
+        j: int
+            Index of quote currency; in a swapping context, this is the
+            "out"-token.
+
+        Returns
+        -------
+        float
+            Price of i-th coin quoted in j-th coin
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        xp = self._xp()
+        return self._dydx(i, j, xp, self.D, use_fee)
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def _dydx(self, i, j, xp, D, use_fee):
+        x_i = xp[i]
+        x_j = xp[j]
+
+        A = self.A
+        A_multiplier = 10**4
+        gamma = self.gamma
+
+        K0 = self._calcs.get_K0(xp, D)
+
+        coeff = A * gamma**2 / (10**18 + gamma - K0) ** 2
+        frac = (10**18 + gamma + K0) * (sum(xp) - D) / (10**18 + gamma - K0)
+        dydx_top = x_j * (A_multiplier * D + coeff * (x_i + frac))
+        dydx_bottom = x_i * (A_multiplier * D + coeff * (x_j + frac))
+        dydx = dydx_top / dydx_bottom
+
+        if j > 0:
+            price_scale = self.price_scale[j - 1]
+            dydx = dydx * 10**18 / price_scale
+        if i > 0:
+            price_scale = self.price_scale[i - 1]
+            dydx = dydx * price_scale / 10**18
+
+        if use_fee:
+            fee = self._fee(xp)
+            dydx = dydx - dydx * fee / 10**10
+
+        return dydx
+
+    def _dydx_matrix(self, xp, D, use_fee=False):
+        """
+        Matrix of `_dydx` for all pairs of coins, where the (i, j) entry is
+        the price of the i-th coin quoted in the j-th coin.
+
+        The invariant terms and fee are computed once for all pairs.
+        The diagonal is one.
+        """
+        A = self.A
+        A_multiplier = 10**4
+        gamma = self.gamma
+
+        K0 = self._calcs.get_K0(xp, D)
+
+        coeff = A * gamma**2 / (10**18 + gamma - K0) ** 2
+        frac = (10**18 + gamma + K0) * (sum(xp) - D) / (10**18 + gamma - K0)
+
+        # _dydx(i, j) = w_i / w_j, with prices scaled to coin units
+        weights = [
+            (A_multiplier * D + coeff * (x + frac)) / x * scale
+            for x, scale in zip(xp, [10**18, *self.price_scale])
+        ]
+        weights = array(weights) / weights[0]
+        dydx = outer(weights, 1 / weights)
+
+        if use_fee:
+            fee = self._fee(xp)
+            dydx -= dydx * fee / 10**10
+
+        fill_diagonal(dydx, 1)
+        return dydx
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def _dydx_log_derivative(self, i, j, xp, D, use_fee=False):
+        """
+        Derivative of the log of the price of coin `i` in coin `j` with
+        respect to `xp[i]` along the invariant curve through `xp`.
+        """
+        A = self.A
+        gamma = self.gamma
+        log_slope = float_math.dydx_log_derivative(i, j, xp, D, A, gamma)
+
+        if use_fee:
+            # The fee also changes with the balances, through K in `_fee`.
+            n = self.n
+            S = sum(xp)
+            p = float_math.dydx(i, j, xp, D, A, gamma)
+            K = prod(n * x / S for x in xp)
+            dK = K * (1 / xp[i] - n / S - p * (1 / xp[j] - n / S))
+            fee_gamma = self.fee_gamma / 10**18
+            f = fee_gamma / (fee_gamma + 1 - K)
+            dfee = (self.mid_fee - self.out_fee) * f**2 / fee_gamma * dK
+            log_slope -= dfee / (10**10 - self._fee(xp))
+
+        return log_slope
@@ -2,7 +2,7 @@
 Mainly a module to house the `CurveCryptoPool`, a cryptoswap implementation in Python.
 """
 import time
-from math import isqrt, prod
+from math import isqrt
 from typing import List
 
 from curvesim.exceptions import CalculationError, CryptoPoolError
@@ -10,15 +10,8 @@ from curvesim.logging import get_logger
 from curvesim.pool.base import Pool
 from curvesim.pool.snapshot import CurveCryptoPoolBalanceSnapshot
 
-from .calcs import (
-    factory_2_coin,
-    geometric_mean,
-    get_alpha,
-    get_p,
-    get_y,
-    halfpow,
-    newton_D,
-)
+from .calcs import factory_2_coin, geometric_mean, get_alpha, halfpow
+from .calcs_mixin import CryptoswapCalcsMixin
 
 logger = get_logger(__name__)
 
@@ -27,10 +20,22 @@ EXP_PRECISION = 10**10
 PRECISION = 10**18
 
 
-class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
+# pylint: disable-next=too-many-instance-attributes
+class CurveCryptoPool(CryptoswapCalcsMixin, Pool):
     """Cryptoswap implementation in Python."""
 
     snapshot_class = CurveCryptoPoolBalanceSnapshot
+    journaled = (
+        "exchange",
+        "exchange_underlying",
+        "_exchange",
+        "_tweak_price",
+        "_claim_admin_fees",
+        "_increment_timestamp",
+        "add_liquidity",
+        "remove_liquidity",
+        "remove_liquidity_one_coin",
+    )
 
     __slots__ = (
         "A",
@@ -56,6 +61,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         "xcp_profit",
         "xcp_profit_a",
         "not_adjusted",
+        "_math",
     )
 
     def __init__(  # pylint: disable=too-many-locals,too-many-arguments
@@ -80,6 +86,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         admin_fee: int = 5 * 10**9,
         xcp_profit=10**18,
         xcp_profit_a=10**18,
+        math="exact",
     ):
         """
         Parameters
@@ -137,7 +144,11 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
             Counter for accumulated profits, no losses (default = 10**18)
         xcp_profit_a: int, optional
             Value of `xcp_profit` when admin fees last claimed (default = 10**18)
+        math: str, optional
+            Calculation engine, "exact" (default) or "float"; see `math`
         """
+        self.math = math
+
         self.A = A
         self.gamma = gamma
 
@@ -192,7 +203,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
                 )
         else:
             xp = self._xp()
-            D = factory_2_coin.newton_D(A, gamma, xp)
+            D = self._calcs_2_coin.newton_D(A, gamma, xp)
             self.D = D
 
         xcp = self._get_xcp(D)
@@ -269,6 +280,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
     def _increment_timestamp(self, blocks=1, timestamp=None):
         """Update the internal clock used to mimic the block timestamp."""
+        self._journal_attrs("_block_timestamp")
         if timestamp:
             self._block_timestamp = timestamp
             return
@@ -295,6 +307,15 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         Also claims admin fees if appropriate (enough profit and price scale
         and oracle is close enough).
         """
+        self._journal_attrs(
+            "_price_oracle",
+            "last_prices_timestamp",
+            "last_prices",
+            "xcp_profit",
+            "price_scale",
+            "D",
+            "virtual_price",
+        )
 
         price_oracle: List[int] = self._price_oracle
         last_prices: List[int] = self.last_prices
@@ -331,7 +352,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
         D_unadjusted: int = new_D  # Withdrawal methods know new D already
         if new_D == 0:
-            D_unadjusted = newton_D(A, gamma, _xp, K0_prev)
+            D_unadjusted = self._calcs.newton_D(A, gamma, _xp, K0_prev)
 
         if p_i > 0:
             # Save the last price
@@ -352,12 +373,12 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
                     * dx_price
                     // (
                         __xp[k]
-                        - factory_2_coin.newton_y(A, gamma, __xp, D_unadjusted, k)
+                        - self._calcs_2_coin.newton_y(A, gamma, __xp, D_unadjusted, k)
                     )
                     for k in range(1, n_coins)
                 ]
             else:
-                last_prices = get_p(_xp, D_unadjusted, A, gamma)
+                last_prices = self._calcs.get_p(_xp, D_unadjusted, A, gamma)
                 last_prices = [
                     last_p * p // 10**18
                     for last_p, p in zip(last_prices, price_scale)
@@ -410,7 +431,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
                 ]
 
                 # Calculate "extended constant product" invariant xCP and virtual price
-                D: int = newton_D(A, gamma, xp)
+                D: int = self._calcs.newton_D(A, gamma, xp)
                 xp = [D // n_coins] + [
                     D * PRECISION // (n_coins * p_new) for p_new in new_prices
                 ]
@@ -434,6 +455,9 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
     def _claim_admin_fees(self):
         # no gulping logic needed for the python code
+        self._journal_attrs(
+            "tokens", "xcp_profit", "D", "virtual_price", "xcp_profit_a"
+        )
         xcp_profit: int = self.xcp_profit
         xcp_profit_a: int = self.xcp_profit_a
 
@@ -452,7 +476,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         gamma = self.gamma
         totalSupply = self.tokens
 
-        D: int = factory_2_coin.newton_D(A, gamma, self._xp())
+        D: int = self._calcs_2_coin.newton_D(A, gamma, self._xp())
         self.D = D
         self.virtual_price = 10**18 * self._get_xcp(D) // totalSupply
 
@@ -493,7 +517,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         gamma = self.gamma
         D: int = self.D
 
-        y: int = factory_2_coin.newton_y(A, gamma, xp, D, j)
+        y: int = self._calcs_2_coin.newton_y(A, gamma, xp, D, j)
         dy: int = xp[j] - y - 1
         xp[j] = y
         precisions: List[int] = self.precisions
@@ -533,12 +557,12 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         A: int = self.A
         gamma: int = self.gamma
-        D: int = newton_D(A, gamma, xp)
+        D: int = self._calcs.newton_D(A, gamma, xp)
 
         xp = xp.copy()
         xp[i] = x
 
-        y, _ = get_y(A, gamma, xp, D, j)
+        y, _ = self._calcs.get_y(A, gamma, xp, D, j)
         return y
 
     def _fee(self, xp: List[int]) -> int:
@@ -589,11 +613,12 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
         y: int = xp[j]
         xp[i] += dx
+        self._journal_attrs("balances")
         self.balances[i] = xp[i]
 
         xp = self._xp_mem(xp)
 
-        y_out = get_y(A, gamma, xp, self.D, j)
+        y_out = self._calcs.get_y(A, gamma, xp, self.D, j)
         dy: int = xp[j] - y_out[0]
         assert dy >= 0, f"Invalid dy: dx: {dx}, dy: {dy}, i: {i}, j: {j} "
         xp[j] -= dy
@@ -713,6 +738,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
 
         xp_old: List[int] = self._xp_mem(self.balances)
 
+        self._journal_attrs("balances", "tokens", "D", "virtual_price", "xcp_profit")
         for i in range(n_coins):
             self.balances[i] += amounts[i]
 
@@ -720,7 +746,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         amountsp: List[int] = [xp[i] - xp_old[i] for i in range(n_coins)]
 
         old_D: int = self.D
-        D: int = factory_2_coin.newton_D(A, gamma, xp)
+        D: int = self._calcs_2_coin.newton_D(A, gamma, xp)
 
         d_token: int = 0
         token_supply: int = self.tokens
@@ -815,6 +841,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         min_amounts = min_amounts or [0, 0]
 
+        self._journal_attrs("balances", "tokens", "D")
         total_supply: int = self.tokens
         self.tokens -= _amount
         balances: List[int] = self.balances
@@ -861,6 +888,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         )
         assert dy >= min_amount, "Slippage"
 
+        self._journal_attrs("balances", "tokens")
         self.balances[i] -= dy
         self.tokens -= token_amount
 
@@ -889,7 +917,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         xp: List[int] = self._xp_mem(xx)
 
         if update_D:
-            D0 = factory_2_coin.newton_D(A, gamma, xp)
+            D0 = self._calcs_2_coin.newton_D(A, gamma, xp)
         else:
             D0 = self.D
 
@@ -899,7 +927,7 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         fee: int = self._fee(xp)
         dD: int = token_amount * D // token_supply
         D -= dD - (fee * dD // (2 * 10**10) + 1)
-        y: int = factory_2_coin.newton_y(A, gamma, xp, D, i)
+        y: int = self._calcs_2_coin.newton_y(A, gamma, xp, D, i)
         if i == 0:
             dy: int = (xp[i] - y) // precisions[i]
         else:
@@ -1025,96 +1053,11 @@ class CurveCryptoPool(Pool):  # pylint: disable=too-many-instance-attributes
         D0: int = self.D
         for i, a in enumerate(amountsp):
             xp[i] += a
-        D: int = factory_2_coin.newton_D(A, gamma, xp)
+        D: int = self._calcs_2_coin.newton_D(A, gamma, xp)
         d_token: int = token_supply * D // D0 - token_supply
         d_token -= self._calc_token_fee(amountsp, xp) * d_token // 10**10 + 1
         return d_token
 
-    def dydxfee(self, i, j):
-        """
-        Returns the spot price of i-th coin quoted in terms of j-th coin,
-        i.e. the ratio of output coin amount to input coin amount for
-        an "infinitesimally" small trade.
-
-        Trading fees are deducted.
-
-        Parameters
-        ----------
-        i: int
-            Index of coin to be priced; in a swapping context, this is
-            the "in"-token.
-        j: int
-            Index of quote currency; in a swapping context, this is the
-            "out"-token.
-
-        Returns
-        -------
-        float
-            Price of i-th coin quoted in j-th coin with fees deducted.
-
-        Note
-        ----
-        This is a "view" function; it doesn't change the state of the pool.
-        """
-        return self.dydx(i, j, use_fee=True)
-
-    def dydx(self, i, j, use_fee=False):  # pylint: disable=too-many-locals
-        """
-        Returns the spot price of i-th coin quoted in terms of j-th coin,
-        i.e. the ratio of output coin amount to input coin amount for
-        an "infinitesimally" small trade.
-
-        Defaults to no fees deducted.
-
-        Parameters
-        ----------
-        i: int
-            Index of coin to be priced; in a swapping context, this is
-            the "in"-token.
-        j: int
-            Index of quote currency; in a swapping context, this is the
-            "out"-token.
-
-        Returns
-        -------
-        float
-            Price of i-th coin quoted in j-th coin
-
-        Note
-        ----
-        This is a "view" function; it doesn't change the state of the pool.
-        """
-        xp = self._xp()
-        x_i = xp[i]
-        x_j = xp[j]
-        n = len(xp)
-
-        D = self.D
-        A = self.A
-        A_multiplier = 10**4
-        gamma = self.gamma
-
-        K0 = 10**18 * n**n * prod(xp) / D**n
-
-        coeff = A * gamma**2 / (10**18 + gamma - K0) ** 2
-        frac = (10**18 + gamma + K0) * (sum(xp) - D) / (10**18 + gamma - K0)
-        dydx_top = x_j * (A_multiplier * D + coeff * (x_i + frac))
-        dydx_bottom = x_i * (A_multiplier * D + coeff * (x_j + frac))
-        dydx = dydx_top / dydx_bottom
-
-        if j > 0:
-            price_scale = self.price_scale[j - 1]
-            dydx = dydx * 10**18 / price_scale
-        if i > 0:
-            price_scale = self.price_scale[i - 1]
-            dydx = dydx * price_scale / 10**18
-
-        if use_fee:
-            fee = self._fee(xp)
-            dydx = dydx - dydx * fee / 10**10
-
-        return dydx
-
 
 def _get_unix_timestamp():
     """Get the timestamp in Unix time."""
@@ -10,6 +10,9 @@ class AssetIndicesMixin:
     This mixin translates from asset names to Curve pool indices.
     Used in both stableswap and cryptoswap implementations used
     in arbitrage pipelines.
+
+    Sim pools list it before :class:`.SimPool` in their bases, so its
+    `get_asset_indices` replaces the template's.
     """
 
     @property
@@ -1,19 +1,22 @@
 """Module to house the `SimPool` extension of the `CurveCryptoPool`."""
 from math import prod
 
+from numpy import array, zeros
+
 from curvesim.exceptions import SimPoolError
 from curvesim.templates import SimAssets
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
 
 from ..cryptoswap import CurveCryptoPool
-from ..cryptoswap.calcs import newton_D
+from ..cryptoswap.calcs import float_math, newton_D
 from ..cryptoswap.calcs.factory_2_coin import _sqrt_int
 from ..cryptoswap.calcs.tricrypto_ng import _cbrt
+from ..stableswap.calcs import int_array
 from .asset_indices import AssetIndicesMixin
 
 
-class SimCurveCryptoPool(SimPool, AssetIndicesMixin, CurveCryptoPool):
+class SimCurveCryptoPool(AssetIndicesMixin, SimPool, CurveCryptoPool):
     """
     Class to enable use of CurveCryptoPool in simulations by exposing
     a generic interface (`SimPool`).
@@ -72,6 +75,31 @@ class SimCurveCryptoPool(SimPool, AssetIndicesMixin, CurveCryptoPool):
         p = self.dydx(i, j, use_fee=use_fee)
         return p
 
+    @override
+    def price_matrix(self, use_fee=True):
+        """
+        Returns the spot prices of each coin quoted in each other coin,
+        as in `price`, computed together.
+
+        The (i, j) entry is the price of the i-th coin quoted in the j-th coin.
+        Invariant and fee calculations are shared across all pairs.
+
+        Parameters
+        ----------
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of prices, with ones on the diagonal.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return self._dydx_matrix(self._xp(), self.D, use_fee)
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
@@ -103,6 +131,163 @@ class SimCurveCryptoPool(SimPool, AssetIndicesMixin, CurveCryptoPool):
         amount_out, fee = self.exchange(i, j, size)
         return amount_out, fee
 
+    @override
+    def quote_batch(self, coin_in, coin_out, sizes, use_fee=True):
+        """
+        Calculate the results of trading each of the given sizes,
+        with each trade done separately on the current pool state.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Amounts are normalized as in `trade`.  Each size is exchanged on a
+        snapshot of the pool, so amounts, fees, and post-trade prices,
+        including any change in the price scale, exactly match `trade`
+        followed by `price`.  Unlike stableswap pools, quotes aren't
+        vectorized, since the cryptoswap math converges differently for
+        each size.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        sizes : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received, trading fees, and post-trade prices
+            of `coin_in` quoted in `coin_out`, one entry for each size.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+
+        dys = []
+        fees = []
+        prices = []
+        for size in sizes:
+            with self.use_snapshot_context():
+                dy, fee = self.exchange(i, j, int(size))
+                prices.append(self.dydx(i, j, use_fee=use_fee))
+            dys.append(dy)
+            fees.append(fee)
+
+        return int_array(dys), int_array(fees), array(prices, dtype=float)
+
+    @override
+    def post_trade_price(self, coin_in, coin_out, size, use_fee=True):
+        """
+        Returns the spot price of `coin_in` quoted in terms of `coin_out`
+        after trading `size` of `coin_in` for `coin_out`, along with the
+        derivative of that price with respect to `size`.
+
+        The price exactly matches calling `price` after `trade`, while the
+        derivative is calculated analytically from the invariant.
+
+        To include any change in the price scale, the price is computed
+        by making the trade inside a snapshot context.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        size : int
+            Amount of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade price.
+
+        Returns
+        -------
+        (float, float)
+            Post-trade price of `coin_in` quoted in `coin_out` and its
+            derivative with respect to `size`.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+
+        with self.use_snapshot_context():
+            if size > 0:
+                self.exchange(i, j, size)
+            price = self.dydx(i, j, use_fee=use_fee)
+            xp = self._xp()
+            log_slope = self._dydx_log_derivative(i, j, xp, self.D, use_fee)
+
+            # xp[i] changes by `size` scaled by the precision and price scale
+            scale = self.precisions[i]
+            if i > 0:
+                scale *= self.price_scale[i - 1] / 10**18
+
+        return price, price * log_slope * scale
+
+    @override
+    def price_jacobian(self, pairs):
+        """
+        Returns the derivatives of the spot prices of each coin pair with
+        respect to the size of a trade in each pair.
+
+        The (k, m) entry is the derivative of `price(*pairs[k])` with respect
+        to the amount of `pairs[m][0]` traded for `pairs[m][1]`, at the
+        current pool state.  Derivatives are calculated analytically from
+        the invariant, ignoring fees and changes in the price scale.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        pairs : list of (str, str) or (int, int)
+            IDs of the "in" and "out" coins for each pair.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of price derivatives.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        xp = self._xp()
+        D = self.D
+        A = self.A
+        gamma = self.gamma
+        # xp per unit of each coin
+        scales = [
+            p * (self.price_scale[k - 1] / 10**18 if k > 0 else 1)
+            for k, p in enumerate(self.precisions)
+        ]
+
+        prices = []
+        gradients = []
+        moves = zeros((len(pairs), self.n))
+        for k, pair in enumerate(pairs):
+            i, j = self.get_asset_indices(*pair)
+            price = float_math.dydx(i, j, xp, D, A, gamma)
+            prices.append(price * scales[i] / scales[j])
+            gradients.append(float_math.dydx_log_gradient(i, j, xp, D, A, gamma))
+
+            # change in xp per unit of coin i traded
+            moves[k, i] = scales[i]
+            moves[k, j] = -price * scales[i]
+
+        return array(prices)[:, None] * array(gradients) @ moves.T
+
     @override
     def get_max_trade_size(self, coin_in, coin_out, out_balance_perc=0.15):
         """
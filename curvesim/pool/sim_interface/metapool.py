@@ -1,13 +1,16 @@
+from numpy import array, empty, full, nan, zeros
+
 from curvesim.exceptions import CurvesimValueError, SimPoolError
 from curvesim.templates import SimAssets
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
 
-from ..stableswap import CurveMetaPool
+from ..stableswap import CurveMetaPool, float_math
+from ..stableswap.calcs import int_array
 from .asset_indices import AssetIndicesMixin
 
 
-class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
+class SimCurveMetaPool(AssetIndicesMixin, SimPool, CurveMetaPool):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -81,12 +84,53 @@ class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
         bp_token_index = self.n_total
 
         if bp_token_index not in (i, j):
-            return self.dydx(i, j, use_fee=use_fee)
+            return self._dydx_underlying(i, j, use_fee)
 
         i, j = self.get_meta_asset_indices(i, j, bp_token_index)
         xp = self._xp()
         return self._dydx(i, j, xp=xp, use_fee=use_fee)
 
+    @override
+    def price_matrix(self, use_fee=True):
+        """
+        Returns the spot prices of each coin quoted in each other coin,
+        as in `price`, computed together.
+
+        The (i, j) entry is the price of the i-th coin quoted in the j-th coin,
+        equal to `price` for that pair.  Invariant and fee calculations are
+        shared across all pairs.
+
+        Indices include the basepool underlyers, with the basepool LP token last.
+        Prices between the LP token and the underlyers, which can't be traded
+        for each other, are NaN.
+
+        Parameters
+        ----------
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of prices, with ones on the diagonal.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        n_total = self.n_total
+        max_coin = self.max_coin
+        prices = full((n_total + 1, n_total + 1), nan)
+        prices[:n_total, :n_total] = self._dydx_underlying_matrix(use_fee)
+
+        # the basepool LP token is only traded against the primary coins
+        meta_prices = self.dydx_matrix(use_fee)
+        prices[n_total, :max_coin] = meta_prices[max_coin, :max_coin]
+        prices[:max_coin, n_total] = meta_prices[:max_coin, max_coin]
+        prices[n_total, n_total] = 1
+
+        return prices
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
@@ -145,6 +189,243 @@ class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
 
         return i, j
 
+    @override
+    def quote_batch(self, coin_in, coin_out, sizes, use_fee=True):
+        """
+        Calculate the results of trading each of the given sizes,
+        with each trade done separately on the current pool state.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Amounts are normalized as in `trade`.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        sizes : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received, trading fees, and post-trade prices
+            of `coin_in` quoted in `coin_out`, one entry for each size.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        bp_token_index = self.n_total
+        max_coin = self.max_coin
+
+        if bp_token_index in (i, j):
+            i, j = self.get_meta_asset_indices(i, j, bp_token_index)
+            return self.get_dy_batch(i, j, sizes, use_fee=use_fee)
+
+        if i >= max_coin and j >= max_coin:
+            return self.get_dy_underlying_batch(i, j, sizes, use_fee=use_fee)
+
+        # Trades between primary and basepool coins are quoted one size at a
+        # time, as in `get_dy_underlying_batch`, but priced as in `price`.
+        dys = []
+        fees = []
+        prices = []
+        for size in sizes:
+            with self.use_snapshot_context():
+                dy, fee = self.exchange_underlying(i, j, int(size))
+                prices.append(self._dydx_underlying(i, j, use_fee))
+            dys.append(dy)
+            fees.append(fee)
+
+        return int_array(dys), int_array(fees), array(prices, dtype=float)
+
+    @override
+    def post_trade_price(self, coin_in, coin_out, size, use_fee=True):
+        """
+        Returns the spot price of `coin_in` quoted in terms of `coin_out`
+        after trading `size` of `coin_in` for `coin_out`, along with the
+        derivative of that price with respect to `size`.
+
+        The price exactly matches calling `price` after `trade`, while the
+        derivative is calculated analytically from the invariants of the
+        metapool and basepool, ignoring the fees retained by the pools.
+        Post-trade balances are computed as in `exchange`, without changing
+        the pool, except for trades between primary and basepool coins,
+        which are made in a snapshot context.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        size : int
+            Amount of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade price.
+
+        Returns
+        -------
+        (float, float)
+            Post-trade price of `coin_in` quoted in `coin_out` and its
+            derivative with respect to `size`.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        bp_token_index = self.n_total
+        max_coin = self.max_coin
+
+        if bp_token_index in (i, j):
+            i, j = self.get_meta_asset_indices(i, j, bp_token_index)
+            xp = self._post_trade_xp(i, j, size)
+            price = self._dydx(i, j, xp, use_fee)
+            rate = self.rates[i]
+            log_slope = self._dydx_log_derivative(i, j, xp, use_fee)
+
+        elif i >= max_coin and j >= max_coin:
+            bp = self.basepool
+            i, j = i - max_coin, j - max_coin
+            # pylint: disable-next=protected-access
+            xp = bp._post_trade_xp(i, j, size)
+            # pylint: disable-next=protected-access
+            price = bp._dydx(i, j, xp, use_fee)
+            rate = bp.rates[i]
+            # pylint: disable-next=protected-access
+            log_slope = bp._dydx_log_derivative(i, j, xp, use_fee)
+
+        else:
+            # Trades between primary and basepool coins also deposit into or
+            # withdraw from the basepool, so they are made in a snapshot.
+            with self.use_snapshot_context():
+                if size > 0:
+                    self.trade(coin_in, coin_out, size)
+                price = self.price(coin_in, coin_out, use_fee=use_fee)
+                if i < max_coin:
+                    rate = self.rates[i]
+                else:
+                    rate = self.basepool.rates[i - max_coin]
+                log_slope = self._dydx_underlying_log_derivative(i, j, use_fee)
+
+        return price, price * log_slope * rate / 10**18
+
+    @override
+    def price_jacobian(self, pairs):
+        """
+        Returns the derivatives of the spot prices of each coin pair with
+        respect to the size of a trade in each pair.
+
+        The (k, m) entry is the derivative of `price(*pairs[k])` with respect
+        to the amount of `pairs[m][0]` traded for `pairs[m][1]`, at the
+        current pool state.  Derivatives are calculated analytically from
+        the invariants of the metapool and basepool, ignoring fees.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        pairs : list of (str, str) or (int, int)
+            IDs of the "in" and "out" coins for each pair.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of price derivatives.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        prices = []
+        gradients = []
+        moves = []
+        for pair in pairs:
+            i, j = self.get_asset_indices(*pair)
+            price, gradient, move = self._price_gradient(i, j)
+            prices.append(price)
+            gradients.append(gradient)
+            moves.append(move)
+
+        return array(prices)[:, None] * array(gradients) @ array(moves).T
+
+    def _price_gradient(self, i, j):
+        """
+        Returns the price of coin `i` in coin `j`, without fees, with the
+        gradient of its log and the change from trading a unit of coin `i`.
+
+        Gradients and changes are with respect to the virtual balances of
+        the metapool followed by those of the basepool.  Trades between the
+        primary coin and basepool coins also change the basepool invariant,
+        and their prices depend on its derivative `dD/dx_k` for basepool coin
+        `k` (see :meth:`CurveMetaPool.dydx`).
+        """
+        # pylint: disable=too-many-locals
+        n = self.n
+        max_coin = self.max_coin
+        xp = self._xp()
+        D = float_math.get_D(xp, self.A)
+        rates = [r / 10**18 for r in self.rates]
+
+        bp = self.basepool
+        base_xp = bp._xp()  # pylint: disable=protected-access
+        base_D = float_math.get_D(base_xp, bp.A)
+        base_rates = [r / 10**18 for r in bp.rates]
+
+        gradient = zeros(n + bp.n)
+        move = zeros(n + bp.n)
+
+        if self.n_total in (i, j):
+            i, j = self.get_meta_asset_indices(i, j, self.n_total)
+            price = float_math.dydx(i, j, xp, self.A, D)
+            gradient[:n] = float_math.dydx_log_gradient(i, j, xp, self.A, D)
+            move[i] = rates[i]
+            move[j] = -price * rates[i]
+            return price * rates[i] / rates[j], gradient, move
+
+        if i >= max_coin and j >= max_coin:
+            i, j = i - max_coin, j - max_coin
+            price = float_math.dydx(i, j, base_xp, bp.A, base_D)
+            gradient[n:] = float_math.dydx_log_gradient(i, j, base_xp, bp.A, base_D)
+            move[n + i] = base_rates[i]
+            move[n + j] = -price * base_rates[i]
+            return price * base_rates[i] / base_rates[j], gradient, move
+
+        if i < max_coin:
+            # basepool tokens received are withdrawn as coin k
+            k = j - max_coin
+            D_k, D_kx = float_math.get_D_derivatives(k, base_xp, bp.A, base_D)
+            price = float_math.dydx(i, max_coin, xp, self.A, D)
+            gradient[:n] = float_math.dydx_log_gradient(i, max_coin, xp, self.A, D)
+            gradient[n:] = [-D_km / D_k for D_km in D_kx]
+            move[i] = rates[i]
+            move[max_coin] = -price * rates[i]
+            move[n + k] = -price * rates[i] / D_k
+            return price / D_k * rates[i] / base_rates[k], gradient, move
+
+        # coin k is deposited for basepool tokens, which are then sold
+        k = i - max_coin
+        D_k, D_kx = float_math.get_D_derivatives(k, base_xp, bp.A, base_D)
+        price = float_math.dydx(max_coin, j, xp, self.A, D)
+        gradient[:n] = float_math.dydx_log_gradient(max_coin, j, xp, self.A, D)
+        gradient[n:] = [D_km / D_k for D_km in D_kx]
+        move[n + k] = base_rates[k]
+        move[max_coin] = D_k * base_rates[k]
+        move[j] = -price * D_k * base_rates[k]
+        return price * D_k * base_rates[k] / rates[j], gradient, move
+
     @override
     def get_max_trade_size(self, coin_in, coin_out, out_balance_perc=0.01):
         """
@@ -226,3 +507,122 @@ class SimCurveMetaPool(SimPool, AssetIndicesMixin, CurveMetaPool):
         addresses = self.coin_addresses[:-1] + self.basepool.coin_addresses
 
         return SimAssets(symbols, addresses, self.chain)
+
+    def _dydx_underlying_matrix(self, use_fee=False):
+        """
+        Matrix of prices for all pairs of coins, including basepool underlyers,
+        where the (i, j) entry is the price of the i-th coin quoted in the j-th.
+        The diagonal is one.
+
+        Prices between primary and basepool coins are the metapool prices of
+        the basepool token scaled by `dD/dx_k` for basepool coin `k`, with the
+        basepool fees charged by `dydx`, so each invariant is computed once.
+        Entries match `_dydx_underlying` exactly.
+        """
+        max_coin = self.max_coin
+        dydx = empty((self.n_total, self.n_total))
+
+        meta_dydx = self.dydx_matrix(use_fee)
+        dydx[:max_coin, :max_coin] = meta_dydx[:max_coin, :max_coin]
+        dydx[max_coin:, max_coin:] = self.basepool.dydx_matrix(use_fee)
+
+        base_xp, base_D, D_x = self._basepool_D_gradient()
+        for k in range(self.basepool.n):
+            j = max_coin + k
+            withdraw_price = self._withdraw_price(k, base_xp, D_x, use_fee)
+            deposit_price = self._deposit_price(k, base_xp, base_D, D_x)
+            dydx[:max_coin, j] = meta_dydx[:max_coin, max_coin] * withdraw_price
+            dydx[j, :max_coin] = meta_dydx[max_coin, :max_coin] * deposit_price
+
+        return dydx
+
+    def _dydx_underlying(self, i, j, use_fee=False):
+        """
+        The (i, j) entry of `_dydx_underlying_matrix`, computed with the same
+        float operations, without the other pairs.
+        """
+        max_coin = self.max_coin
+        if i >= max_coin and j >= max_coin:
+            return self.basepool.dydx(i - max_coin, j - max_coin, use_fee=use_fee)
+
+        xp = self._xp()
+        if i < max_coin and j < max_coin:
+            return self._dydx(i, j, xp, use_fee)
+
+        base_xp, base_D, D_x = self._basepool_D_gradient()
+        if i < max_coin:
+            k = j - max_coin
+            dwdz = self._dydx(i, max_coin, xp, use_fee)
+            return dwdz * self._withdraw_price(k, base_xp, D_x, use_fee)
+
+        k = i - max_coin
+        dzdw = self._dydx(max_coin, j, xp, use_fee)
+        return dzdw * self._deposit_price(k, base_xp, base_D, D_x)
+
+    def _basepool_D_gradient(self):
+        """
+        Returns the basepool's virtual balances, invariant, and `dD/dx_k`
+        for each basepool coin `k`.
+        """
+        bp = self.basepool
+        base_xp = [x * r // 10**18 for x, r in zip(bp.balances, bp.rates)]
+        base_D = bp.D()
+        return base_xp, base_D, float_math.get_D_gradient(base_xp, bp.A, base_D)
+
+    def _withdraw_price(self, k, base_xp, D_x, use_fee=False):
+        """
+        Price of a virtual unit of the basepool token in basepool coin `k`,
+        for basepool tokens withdrawn as coin `k`, with the withdrawal fee
+        charged by `dydx`.
+        """
+        bp = self.basepool
+        if use_fee and bp.fee:
+            fee = bp.fee - bp.fee * base_xp[k] // sum(base_xp) + 5 * 10**5
+        else:
+            fee = 0
+        return (1 - fee / 10**10) / D_x[k]
+
+    def _deposit_price(self, k, base_xp, base_D, D_x):
+        """
+        Price of basepool coin `k` in virtual units of the basepool token,
+        for coin `k` deposited for basepool tokens.
+
+        As in `dydx`, deposits always pay the basepool's imbalance fee; the
+        fees on the imbalance from depositing dx_k lower the minted amount by
+        `fee * D_m * |x_m * D_k / D - 1{m=k}|` for each basepool coin m.
+        """
+        bp = self.basepool
+        deposit_fee = bp.fee * bp.n / (4 * (bp.n - 1)) / 10**10
+        D_k = D_x[k]
+        imbalance = [
+            abs(x_m * D_k / base_D - (m == k)) for m, x_m in enumerate(base_xp)
+        ]
+        return D_k - deposit_fee * sum(D_m * d_m for D_m, d_m in zip(D_x, imbalance))
+
+    def _dydx_underlying_log_derivative(self, i, j, use_fee=False):
+        """
+        Derivative of the log of the price of coin `i` in coin `j` with
+        respect to the virtual amount of coin `i` traded, where one coin
+        is primary and the other is from the basepool.
+
+        As in `dydx`, the price is the metapool price of the basepool token
+        scaled by `dD/dx_k` for basepool coin `k`, so by the chain rule, its
+        log-derivative adds the change in `dD/dx_k` to the metapool's.
+        """
+        max_coin = self.max_coin
+        xp = self._xp()
+        bp = self.basepool
+        base_xp = bp._xp()  # pylint: disable=protected-access
+        k = j - max_coin if i < max_coin else i - max_coin
+        D_k, D_kx = float_math.get_D_derivatives(k, base_xp, bp.A, bp.D())
+        D_kk = D_kx[k]
+
+        if i < max_coin:
+            # basepool tokens received are withdrawn as coin k
+            dwdz = self._dydx(i, max_coin, xp, use_fee)
+            log_slope = self._dydx_log_derivative(i, max_coin, xp, use_fee)
+            return log_slope + D_kk / D_k**2 * dwdz
+
+        # coin k is deposited for basepool tokens, which are then sold
+        log_slope = self._dydx_log_derivative(max_coin, j, xp, use_fee)
+        return D_kk / D_k + log_slope * D_k
@@ -1,13 +1,16 @@
+from numpy import array, zeros
+
 from curvesim.exceptions import SimPoolError
 from curvesim.templates import SimAssets
 from curvesim.templates.sim_pool import SimPool
 from curvesim.utils import cache, override
 
-from ..stableswap import CurvePool
+from ..stableswap import CurvePool, float_math
+from ..stableswap.state import CurvePoolState
 from .asset_indices import AssetIndicesMixin
 
 
-class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
+class SimCurvePool(AssetIndicesMixin, SimPool, CurvePool):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -60,6 +63,31 @@ class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
         i, j = self.get_asset_indices(coin_in, coin_out)
         return self.dydx(i, j, use_fee=use_fee)
 
+    @override
+    def price_matrix(self, use_fee=True):
+        """
+        Returns the spot prices of each coin quoted in each other coin,
+        as in `price`, computed together.
+
+        The (i, j) entry is the price of the i-th coin quoted in the j-th coin.
+        Invariant and fee calculations are shared across all pairs.
+
+        Parameters
+        ----------
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of prices, with ones on the diagonal.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return self._dydx_matrix(self._xp(), use_fee)
+
     @override
     def trade(self, coin_in, coin_out, size):
         """
@@ -91,6 +119,147 @@ class SimCurvePool(SimPool, AssetIndicesMixin, CurvePool):
         amount_out, fee = self.exchange(i, j, size)
         return amount_out, fee
 
+    @override
+    def quote_batch(self, coin_in, coin_out, sizes, use_fee=True):
+        """
+        Calculate the results of trading each of the given sizes,
+        with each trade done separately on the current pool state.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Amounts are normalized as in `trade`.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        sizes : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received, trading fees, and post-trade prices
+            of `coin_in` quoted in `coin_out`, one entry for each size.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+        return self.get_dy_batch(i, j, sizes, use_fee=use_fee)
+
+    @override
+    def post_trade_price(self, coin_in, coin_out, size, use_fee=True):
+        """
+        Returns the spot price of `coin_in` quoted in terms of `coin_out`
+        after trading `size` of `coin_in` for `coin_out`, along with the
+        derivative of that price with respect to `size`.
+
+        The price exactly matches calling `price` after `trade`, while the
+        derivative is calculated analytically from the invariant, ignoring the
+        fees retained by the pool.  Post-trade balances are computed as in
+        `exchange`, without changing the pool.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        size : int
+            Amount of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade price.
+
+        Returns
+        -------
+        (float, float)
+            Post-trade price of `coin_in` quoted in `coin_out` and its
+            derivative with respect to `size`.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        i, j = self.get_asset_indices(coin_in, coin_out)
+
+        xp = self._post_trade_xp(i, j, size)
+        price = self._dydx(i, j, xp, use_fee)
+        log_slope = self._dydx_log_derivative(i, j, xp, use_fee)
+
+        return price, price * log_slope * self.rates[i] / 10**18
+
+    @override
+    def price_jacobian(self, pairs):
+        """
+        Returns the derivatives of the spot prices of each coin pair with
+        respect to the size of a trade in each pair.
+
+        The (k, m) entry is the derivative of `price(*pairs[k])` with respect
+        to the amount of `pairs[m][0]` traded for `pairs[m][1]`, at the
+        current pool state.  Derivatives are calculated analytically from
+        the invariant, ignoring fees.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        pairs : list of (str, str) or (int, int)
+            IDs of the "in" and "out" coins for each pair.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of price derivatives.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        xp = self._xp()
+        A = self.A
+        D = float_math.get_D(xp, A)
+        rates = [r / 10**18 for r in self.rates]
+
+        prices = []
+        gradients = []
+        moves = zeros((len(pairs), self.n))
+        for k, pair in enumerate(pairs):
+            i, j = self.get_asset_indices(*pair)
+            price = float_math.dydx(i, j, xp, A, D)
+            prices.append(price * rates[i] / rates[j])
+            gradients.append(float_math.dydx_log_gradient(i, j, xp, A, D))
+
+            # change in xp per unit of coin i traded
+            moves[k, i] = rates[i]
+            moves[k, j] = -price * rates[i]
+
+        return array(prices)[:, None] * array(gradients) @ moves.T
+
+    @override
+    def get_state(self):
+        """
+        Returns the pool's current state.
+
+        Returns
+        -------
+        :class:`~curvesim.pool.stableswap.state.CurvePoolState`
+            Immutable pool state.  :func:`.quote_trade` and :func:`.spot_price`
+            quote on it exactly as `exchange` and `dydx` do with the default
+            "exact" `math`.
+        """
+        return CurvePoolState.from_pool(self)
+
     @override
     def get_max_trade_size(self, coin_in, coin_out, out_balance_perc=0.01):
         """
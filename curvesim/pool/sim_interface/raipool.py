@@ -32,3 +32,12 @@ class SimCurveRaiPool(CurveRaiPool, SimCurveMetaPool):
         """
         r = self.redemption_prices.price.asof(timestamp)
         self.rate_multiplier = int(r)
+
+    def _withdraw_price(self, k, base_xp, D_x, use_fee=False):
+        # metapool prices are quoted per basepool token, not per virtual unit
+        price = super()._withdraw_price(k, base_xp, D_x, use_fee=use_fee)
+        return price * (self.rates[self.max_coin] / 10**18)
+
+    def _deposit_price(self, k, base_xp, base_D, D_x):
+        price = super()._deposit_price(k, base_xp, base_D, D_x)
+        return price / (self.rates[self.max_coin] / 10**18)
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from contextlib import contextmanager
 
 from curvesim.exceptions import SnapshotError
 
@@ -11,9 +10,32 @@ class SnapshotMixin:
 
     Main class must have `snapshot_class` attribute, which
     implements the `Snapshot` interface.
+
+    Classes set `journaled` to the names of their state-changing methods,
+    each of which records the attributes it is about to change with
+    `_journal_attrs`, so `use_snapshot_context` only saves and reverts what
+    changes.  Subclasses overriding any of these methods without setting
+    `journaled` themselves fall back to `snapshot_class`, since the overrides
+    may change attributes that aren't journaled.
     """
 
     snapshot_class = None
+    journaled = ()
+
+    # active journal from `use_snapshot_context`
+    _journal = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # the class that set `journaled`, and the classes it inherits from,
+        # must implement each of the journaled methods
+        owner = next(c for c in cls.__mro__ if "journaled" in c.__dict__)
+        for name in cls.journaled:
+            implementer = next(c for c in cls.__mro__ if name in c.__dict__)
+            if implementer not in owner.__mro__:
+                cls.journaled = ()
+                break
 
     def get_snapshot(self):
         """Saves the pool's partial state."""
@@ -34,7 +56,6 @@ class SnapshotMixin:
         """
         snapshot.restore(self)
 
-    @contextmanager
     def use_snapshot_context(self):
         """
         This context manager allows creating and reverting
@@ -50,12 +71,68 @@ class SnapshotMixin:
 
         `as snapshot` can be omitted but is handy if you need to
         log or introspect on the state.
+
+        For journaled pools, the snapshot is a :class:`JournalSnapshot`
+        recording the attributes changed within the block, and contexts
+        can be nested.  Only changes made by the methods named in
+        `journaled` are reverted, so within the block, the pool should
+        only be changed through those methods (e.g., by trading), not by
+        setting attributes.  Pools that don't journal all their methods,
+        including a metapool's basepool, use `snapshot_class` instead.
+        """
+        if all(pool.journaled for pool in self._journaled_pools()):
+            return SnapshotContext(self, JournalSnapshot)
+        return SnapshotContext(self, self.snapshot_class)
+
+    def _journal_attrs(self, *attrs):
+        """
+        Saves the current values of attributes that are about to change
+        to the active snapshot journal, if there is one.
+
+        Lists are copied, since they may be changed in place.
         """
-        snapshot = self.get_snapshot()
-        try:
-            yield snapshot
-        finally:
-            self.revert_to_snapshot(snapshot)
+        journal = self._journal
+        if journal is None:
+            return
+
+        for attr in attrs:
+            if attr not in journal:
+                value = getattr(self, attr)
+                if isinstance(value, list):
+                    value = value.copy()
+                journal[attr] = value
+
+    def _journaled_pools(self):
+        """
+        Returns the pools whose changes are journaled by this pool's snapshots,
+        e.g. including a metapool's basepool.
+        """
+        return (self,)
+
+
+class SnapshotContext:
+    """
+    Context manager that takes a snapshot on entry and reverts to it on exit.
+
+    Used by :meth:`SnapshotMixin.use_snapshot_context`.
+    """
+
+    __slots__ = ("pool", "snapshot_class", "snapshot")
+
+    def __init__(self, pool, snapshot_class):
+        self.pool = pool
+        self.snapshot_class = snapshot_class
+        self.snapshot = None
+
+    def __enter__(self):
+        if not self.snapshot_class:
+            raise SnapshotError("Snapshot class is not set.")
+
+        self.snapshot = self.snapshot_class.create(self.pool)
+        return self.snapshot
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.pool.revert_to_snapshot(self.snapshot)
 
 
 class Snapshot(ABC):
@@ -207,3 +284,42 @@ class CurveCryptoPoolBalanceSnapshot(Snapshot):
         pool.xcp_profit = self.xcp_profit
         pool.last_prices = self.last_prices.copy()
         pool.last_prices_timestamp = self.last_prices_timestamp
+
+
+class JournalSnapshot(Snapshot):
+    """
+    Snapshot that journals the pool attributes changed after it is created,
+    instead of copying the pool state up front.
+
+    Only for pools whose state-changing methods are all journaled, as listed
+    in `journaled`.  Journal snapshots must be restored exactly once, in
+    reverse order of creation, as with nested contexts from
+    :meth:`SnapshotMixin.use_snapshot_context`.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries):
+        # (pool, journal, outer journal) for each journaled pool
+        self.entries = entries
+
+    @classmethod
+    def create(cls, pool):
+        # pylint: disable=protected-access
+        entries = []
+        for _pool in pool._journaled_pools():
+            journal = {}
+            entries.append((_pool, journal, _pool._journal))
+            _pool._journal = journal
+        return cls(entries)
+
+    def restore(self, pool):
+        # pylint: disable=protected-access
+        for _pool, journal, outer_journal in self.entries:
+            if _pool._journal is not journal:
+                raise SnapshotError("Journal snapshots must be restored in order.")
+
+            if journal:
+                for attr, value in reversed(journal.items()):
+                    setattr(_pool, attr, value)
+            _pool._journal = outer_journal
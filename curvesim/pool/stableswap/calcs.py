@@ -0,0 +1,221 @@
+"""
+Pure stableswap calculations vectorized over NumPy arrays.
+
+Arguments can mix integers and object arrays of integers, which are broadcast
+together.  Each array element goes through exactly the same integer operations
+as the scalar pool methods, so results match them element by element.
+"""
+from math import prod
+
+from gmpy2 import mpz
+from numpy import atleast_1d, broadcast_arrays, empty, frompyfunc, ndim, ones
+
+_to_int = frompyfunc(int, 1, 1)
+_to_float = frompyfunc(float, 1, 1)
+
+
+def int_array(values):
+    """
+    Convert numbers to an object array of python integers.
+
+    Parameters
+    ----------
+    values: iterable of numbers
+        Values to convert; floats are truncated.
+
+    Returns
+    -------
+    numpy.ndarray
+        One-dimensional object array of `int`.
+    """
+    values = [int(v) for v in values]
+    arr = empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def float_array(values):
+    """Convert an object array of numbers to a float array."""
+    return _to_float(values).astype(float)
+
+
+def get_D(xp, A):
+    """
+    Calculate the invariant `D` for each set of balances.
+
+    See :meth:`curvesim.pool.CurvePool.get_D`.
+
+    Parameters
+    ----------
+    xp: list of int or numpy.ndarray
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+
+    Returns
+    -------
+    numpy.ndarray
+        The stableswap invariant, `D`, for each set of balances.
+    """
+    n = len(xp)
+    xp = _broadcast(*xp)
+    Ann = mpz(A * n)
+
+    S = sum(xp)
+    D = S.copy()
+    active = ones(D.shape, dtype=bool)
+    while active.any():
+        _D = D[active]
+        D_P = _D
+        for x in xp:
+            D_P = D_P * _D // (n * x[active])
+        D_new = (Ann * S[active] + D_P * n) * _D // ((Ann - 1) * _D + (n + 1) * D_P)
+        D[active] = D_new
+        active[active] = abs(D_new - _D) > 1
+
+    return _to_int(D)
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def get_y(i, j, x, xp, A, D):
+    """
+    Calculate x[j] if one makes x[i] = x, for each value of x.
+
+    See :meth:`curvesim.pool.CurvePool.get_y`.
+
+    Parameters
+    ----------
+    i: int
+        index of coin; usually the "in"-token
+    j: int
+        index of coin; usually the "out"-token
+    x: numpy.ndarray
+        balances of i-th coin in units of D
+    xp: list of int
+        coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    numpy.ndarray
+        The balance of the j-th coin, in units of D, for each value of `x`.
+    """
+    n = len(xp)
+    D = mpz(D)
+    xx = list(xp)
+    xx[i] = x
+    xx = [xx[k] for k in range(n) if k != j]
+    Ann = A * n
+    c = D
+    for _x in xx:
+        c = c * D // (_x * n)
+    c = c * D // (n * Ann)
+    b = sum(xx) + D // Ann - D
+
+    c, b = _broadcast(c, b)  # pylint: disable=unbalanced-tuple-unpacking
+    y = empty(c.shape, dtype=object)
+    y[...] = D
+    active = ones(y.shape, dtype=bool)
+    while active.any():
+        _y = y[active]
+        y_new = (_y**2 + c[active]) // (2 * _y + b[active])
+        y[active] = y_new
+        active[active] = abs(y_new - _y) > 1
+
+    return _to_int(y)
+
+
+def dydx(i, j, xp, A, D):
+    """
+    Spot price of the i-th coin quoted in the j-th coin, without fees,
+    for each set of balances.
+
+    See :meth:`curvesim.pool.CurvePool.dydx`.
+
+    Parameters
+    ----------
+    i: int
+        Index of coin to be priced
+    j: int
+        Index of quote currency
+    xp: list of int or numpy.ndarray
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int or numpy.ndarray
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of prices, in gmpy2 precision; apply any fee factor
+        before converting with :func:`float_array` to match the pool methods.
+    """
+    n = len(xp)
+    xi = xp[i]
+    xj = xp[j]
+    D_pow = _mpz(D) ** (n + 1)
+    x_prod = prod(xp)
+    A_pow = A * n ** (n + 1)
+    return (xj * (xi * A_pow * x_prod + D_pow)) / (xi * (xj * A_pow * x_prod + D_pow))
+
+
+def dydx_matrix(xp, A, D):
+    """
+    Spot prices of each coin quoted in each other coin, without fees.
+
+    The (i, j) entry is :func:`dydx` for `i` and `j`, through the same
+    operations, but the invariant and the product of balances are only
+    computed once for all pairs.
+
+    Parameters
+    ----------
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    numpy.ndarray
+        Square object array of prices, in gmpy2 precision, with ones on the
+        diagonal; apply any fee factor before converting with
+        :func:`float_array` to match the pool methods.
+    """
+    n = len(xp)
+    D_pow = mpz(D) ** (n + 1)
+    A_pow = A * n ** (n + 1)
+    x_prod = prod(xp)
+
+    # dydx(i, j) = (xj * terms[i]) / (xi * terms[j])
+    terms = [x * A_pow * x_prod + D_pow for x in xp]
+    dydx = ones((n, n), dtype=object)
+    for i, (xi, term_i) in enumerate(zip(xp, terms)):
+        for j, (xj, term_j) in enumerate(zip(xp, terms)):
+            if i != j:
+                dydx[i, j] = (xj * term_i) / (xi * term_j)
+    return dydx
+
+
+_mpz_ufunc = frompyfunc(mpz, 1, 1)
+
+
+def _mpz(x):
+    if ndim(x) == 0:
+        return mpz(x)
+    return _mpz_ufunc(x)
+
+
+def _broadcast(*args):
+    """Broadcast scalars and arrays into a list of writable 1-d object arrays."""
+    arrays = []
+    for arr in broadcast_arrays(*atleast_1d(*args)):
+        _arr = empty(arr.shape, dtype=object)
+        _arr[...] = arr
+        arrays.append(_arr)
+    return arrays
@@ -0,0 +1,236 @@
+"""
+Calculations shared by stableswap pools and metapools: quotes for batches of
+trades, prices for all pairs of coins, and the price derivatives used to size
+arbitrage trades.
+"""
+from numpy import fill_diagonal
+
+from . import calcs, float_math
+
+
+class StableswapCalcsMixin:
+    """
+    Pool mixin for calculations over many trades or coin pairs at once.
+
+    The main class must implement the stableswap pool interface, i.e. `A`,
+    `rates`, `balances`, fees, `D`, `get_y`, `_xp`, `_xp_mem`, and `math`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def _calcs(self):
+        """Price calculations for the `math` engine."""
+        if self.math == "float":
+            return float_math
+        return calcs
+
+    def _exchange_amounts(self, i, j, dx):
+        """
+        Amount of coin `j` received, trading fee, and admin fee, in real
+        units, for exchanging `dx` of coin `i`, as in `exchange`.
+        """
+        rates = self.rates
+        xp = self._xp_mem(rates, self.balances)
+        x = xp[i] + dx * rates[i] // 10**18
+        y = self.get_y(i, j, x, xp)
+        dy = xp[j] - y - 1
+
+        if self.fee_mul is None:
+            fee = dy * self.fee // 10**10
+        else:
+            fee = dy * self.dynamic_fee((xp[i] + x) // 2, (xp[j] + y) // 2) // 10**10
+
+        admin_fee = fee * self.admin_fee // 10**10
+
+        # Convert all to real units
+        rate = rates[j]
+        dy = (dy - fee) * 10**18 // rate
+        fee = fee * 10**18 // rate
+        admin_fee = admin_fee * 10**18 // rate
+        assert dy >= 0
+
+        return dy, fee, admin_fee
+
+    def _post_trade_xp(self, i, j, dx):
+        """
+        Virtual balances after exchanging `dx` of coin `i` for coin `j`,
+        exactly as left by `exchange`, without changing the pool.
+        """
+        balances = self.balances.copy()
+        if dx > 0:
+            dy, _, admin_fee = self._exchange_amounts(i, j, dx)
+            balances[i] += dx
+            balances[j] -= dy + admin_fee
+        return self._xp_mem(self.rates, balances)
+
+    @float_math.float_method(float_math.pool_get_y_batch)
+    def get_y_batch(self, i, j, xs, xp):
+        """
+        Calculate x[j] if one makes x[i] = x, for each value of x, as in
+        `get_y`, for the pool's `math`.
+
+        Parameters
+        ----------
+        i: int
+            index of coin; usually the "in"-token
+        j: int
+            index of coin; usually the "out"-token
+        xs: array-like of int
+            balances of i-th coin in units of D
+        xp: list of int
+            coin balances in units of D
+
+        Returns
+        -------
+        numpy.ndarray
+            Object array of the balance of the j-th coin, in units of D,
+            for each value of `xs`.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return calcs.get_y(i, j, calcs.int_array(xs), xp, self.A, self.D(xp))
+
+    # pylint: disable-next=too-many-locals
+    def get_dy_batch(self, i, j, dxs, use_fee=True):
+        """
+        Calculate the results of exchanging each of the given amounts,
+        with each exchange done separately on the current pool state.
+
+        Index values are for the top-level coins, as in `exchange`.
+        Calculations are vectorized and exactly match `exchange` and
+        `dydx` for each amount.
+
+        Parameters
+        ----------
+        i : int
+            Index of "in" coin.
+        j : int
+            Index of "out" coin.
+        dxs : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received and trading fees, as arrays of int,
+            and post-trade prices of coin `i` in coin `j`, as an array of float.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        rates = self.rates
+        xp = self._xp_mem(rates, self.balances)
+        D = self.D(xp)
+        dxs = calcs.int_array(dxs)
+
+        x = xp[i] + dxs * rates[i] // 10**18
+        y = calcs.get_y(i, j, x, xp, self.A, D)
+        dy = xp[j] - y - 1
+
+        if self.fee_mul is None:
+            fee = dy * self.fee // 10**10
+        else:
+            fee = dy * self.dynamic_fee((xp[i] + x) // 2, (xp[j] + y) // 2) // 10**10
+
+        admin_fee = fee * self.admin_fee // 10**10
+
+        # Convert all to real units
+        rate = rates[j]
+        dy = (dy - fee) * 10**18 // rate
+        fee = fee * 10**18 // rate
+        admin_fee = admin_fee * 10**18 // rate
+        assert (dy >= 0).all()
+
+        balances = self.balances.copy()
+        balances[i] = balances[i] + dxs
+        balances[j] = balances[j] - (dy + admin_fee)
+        prices = self._dydx_batch(i, j, self._xp_mem(rates, balances), use_fee)
+
+        return dy, fee, prices
+
+    def _dydx_batch(self, i, j, xp, use_fee=False):
+        """
+        Vectorized version of `_dydx` where `xp` may contain arrays.
+        Treats indices as applying to the "top-level" pool.
+        """
+        D = calcs.get_D(xp, self.A)
+        dydx = calcs.dydx(i, j, xp, self.A, D)
+
+        if use_fee:
+            if self.fee_mul is None:
+                fee_factor = self.fee / 10**10
+            else:
+                fee_factor = self.dynamic_fee(xp[i], xp[j]) / 10**10
+            dydx *= 1 - fee_factor
+
+        return calcs.float_array(dydx)
+
+    def dydx_matrix(self, use_fee=False):
+        """
+        Returns the spot prices of each coin quoted in each other coin,
+        as in `dydx`, computed together.  Indices are for the "top-level"
+        coins.
+
+        Parameters
+        ----------
+        use_fee: bool, default=False
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array where the (i, j) entry is the price of the i-th
+            coin quoted in the j-th coin, with ones on the diagonal.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        return self._dydx_matrix(self._xp(), use_fee)
+
+    def _dydx_matrix(self, xp, use_fee=False):
+        """
+        Matrix of `_dydx` for all pairs of coins, where the (i, j) entry is
+        the price of the i-th coin quoted in the j-th coin.
+
+        Entries go through the same operations as `_dydx`, so they match it
+        exactly, but the invariant is computed once for all pairs.  The
+        diagonal is one.
+        """
+        dydx = self._calcs.dydx_matrix(xp, self.A, self.D(xp))
+
+        if use_fee:
+            if self.fee_mul is None:
+                dydx *= 1 - self.fee / 10**10
+            else:
+                for i, xi in enumerate(xp):
+                    for j, xj in enumerate(xp):
+                        dydx[i, j] *= 1 - self.dynamic_fee(xi, xj) / 10**10
+
+        dydx = calcs.float_array(dydx)
+        fill_diagonal(dydx, 1)
+        return dydx
+
+    def _dydx_log_derivative(self, i, j, xp, use_fee=False):
+        """
+        Derivative of the log of the price of coin `i` in coin `j` with
+        respect to `xp[i]` along the invariant curve through `xp`.
+        """
+        A = self.A
+        D = float_math.get_D(xp, A)
+        log_slope = float_math.dydx_log_derivative(i, j, xp, A, D)
+
+        if use_fee and self.fee_mul is not None:
+            # The dynamic fee also changes with the balances.
+            fee = self.dynamic_fee(xp[i], xp[j])
+            log_slope += float_math.dynamic_fee_log_derivative(
+                i, j, xp, A, D, fee, self.fee_mul
+            )
+
+        return log_slope
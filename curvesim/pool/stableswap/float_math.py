@@ -0,0 +1,467 @@
+"""
+Stableswap calculations in float64 arithmetic.
+
+These solve the same equations as the integer pool methods but in
+floating point, trading exactness for speed; results typically agree
+to within ~1e-13 relative error.  Balances are scaled to order one
+to avoid overflow with many coins.
+
+Used by stableswap pools with ``math="float"``, through :func:`float_method`,
+and for the price derivatives used to size arbitrage trades.
+"""
+from functools import wraps
+from math import prod, sqrt
+
+import numpy as np
+from numpy import array
+
+from curvesim.exceptions import CalculationError
+
+MAX_ITERATIONS = 255
+TOLERANCE = 1e-14
+
+
+def float_method(float_func):
+    """
+    Decorator for pool methods that calls `float_func` instead, with the
+    pool and the same arguments, when the pool's `math` is "float".
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(pool, *args, **kwargs):
+            if pool.math == "float":
+                return float_func(pool, *args, **kwargs)
+            return method(pool, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def pool_get_D(pool, xp, A):  # pylint: disable=unused-argument
+    """Float version of :meth:`curvesim.pool.CurvePool.get_D`."""
+    return get_D(xp, A)
+
+
+def pool_get_y(pool, i, j, x, xp):
+    """Float version of :meth:`curvesim.pool.CurvePool.get_y`."""
+    xx = xp[:]
+    D = pool.D(xx)
+    xx[i] = x
+    return get_y(pool.A, j, xx, D)
+
+
+def pool_get_y_batch(pool, i, j, xs, xp):
+    """Float version of :meth:`curvesim.pool.CurvePool.get_y_batch`."""
+    xx = xp[:]
+    D = pool.D(xx)
+    xx[i] = array(xs, dtype=float)
+    return get_y_batch(pool.A, j, xx, D)
+
+
+def pool_get_y_D(pool, A, i, xp, D):  # pylint: disable=unused-argument
+    """Float version of :meth:`curvesim.pool.CurvePool.get_y_D`."""
+    return get_y(A, i, xp, D)
+
+
+def get_D(xp, A):
+    """
+    Calculate the stableswap invariant.
+
+    See :meth:`curvesim.pool.CurvePool.get_D`.
+
+    Parameters
+    ----------
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+
+    Returns
+    -------
+    int
+        The stableswap invariant, `D`.
+    """
+    S = sum(xp)
+    if S == 0:
+        return 0
+
+    S = float(S)
+    n = len(xp)
+    x = [_x / S for _x in xp]
+    Ann = A * n
+
+    D = 1.0
+    for _ in range(MAX_ITERATIONS):
+        D_P = D
+        for _x in x:
+            D_P = D_P * D / (n * _x)
+        D_prev = D
+        D = (Ann + D_P * n) * D / ((Ann - 1) * D + (n + 1) * D_P)
+        if abs(D - D_prev) <= D * TOLERANCE:
+            return int(D * S)
+
+    raise CalculationError("Did not converge")
+
+
+def get_y(A, i, xp, D):
+    """
+    Calculate x[i] given the other balances and the invariant.
+
+    See :meth:`curvesim.pool.CurvePool.get_y_D`.
+
+    Parameters
+    ----------
+    A: int
+        Amplification coefficient
+    i: int
+        Index of coin to calculate balance for
+    xp: list of int
+        Coin balances in units of D; the i-th balance is ignored
+    D: int
+        The stableswap invariant
+
+    Returns
+    -------
+    int
+        The balance of the i-th coin, in units of D
+    """
+    D = float(D)
+    n = len(xp)
+    xx = [xp[k] / D for k in range(n) if k != i]
+    Ann = A * n
+
+    c = 1.0
+    for _x in xx:
+        c = c / (_x * n)
+    c = c / (n * Ann)
+    b = sum(xx) + 1 / Ann - 1
+
+    # The integer Newton iteration converges to the positive root of
+    # y**2 + b*y - c = 0, so solve directly, avoiding cancellation.
+    sqrt_disc = sqrt(b * b + 4 * c)
+    if b >= 0:
+        y = 2 * c / (b + sqrt_disc)
+    else:
+        y = (sqrt_disc - b) / 2
+
+    return int(y * D)
+
+
+def get_y_batch(A, i, xp, D):
+    """
+    Vectorized version of `get_y`, where the balances other than the i-th
+    may be arrays.
+
+    Parameters
+    ----------
+    A: int
+        Amplification coefficient
+    i: int
+        Index of coin to calculate balance for
+    xp: list of int or numpy.ndarray
+        Coin balances in units of D; the i-th balance is ignored
+    D: int
+        The stableswap invariant
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of the balance of the i-th coin, in units of D,
+        for each set of balances.
+    """
+    D = float(D)
+    n = len(xp)
+    xx = [np.asarray(xp[k]) / D for k in range(n) if k != i]
+    Ann = A * n
+
+    c = 1.0
+    for _x in xx:
+        c = c / (_x * n)
+    c = c / (n * Ann)
+    b = sum(xx) + 1 / Ann - 1
+
+    sqrt_disc = np.sqrt(b * b + 4 * c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(b >= 0, 2 * c / (b + sqrt_disc), (sqrt_disc - b) / 2)
+
+    return array([int(_y) for _y in (y * D).ravel()], dtype=object)
+
+
+def dydx(i, j, xp, A, D):
+    """
+    Spot price of the i-th coin quoted in the j-th coin, without fees.
+
+    See :meth:`curvesim.pool.CurvePool.dydx`.
+
+    Parameters
+    ----------
+    i: int
+        Index of coin to be priced
+    j: int
+        Index of quote currency
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    float
+        Price of i-th coin quoted in j-th coin
+    """
+    D = float(D)
+    n = len(xp)
+    x = [_x / D for _x in xp]
+    xi = x[i]
+    xj = x[j]
+    x_prod = prod(x)
+    A_pow = A * n ** (n + 1)
+    return (xj * (xi * A_pow * x_prod + 1)) / (xi * (xj * A_pow * x_prod + 1))
+
+
+def dydx_matrix(xp, A, D):
+    """
+    Spot prices of each coin quoted in each other coin, without fees.
+
+    See :func:`curvesim.pool.stableswap.calcs.dydx_matrix`.
+
+    Parameters
+    ----------
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    numpy.ndarray
+        Square float array of prices.
+    """
+    D = float(D)
+    n = len(xp)
+    x = [_x / D for _x in xp]
+    A_pow = A * n ** (n + 1)
+    x_prod = prod(x)
+
+    # dydx(i, j) = (xj * terms[i]) / (xi * terms[j])
+    terms = [_x * A_pow * x_prod + 1 for _x in x]
+    return array(
+        [
+            [(xj * term_i) / (xi * term_j) for xj, term_j in zip(x, terms)]
+            for xi, term_i in zip(x, terms)
+        ]
+    )
+
+
+def dydx_log_derivative(i, j, xp, A, D):
+    """
+    Derivative of the log of the spot price `dydx(i, j)` with respect to
+    the i-th balance, moving along the invariant curve.
+
+    This gives the price impact of trading the i-th coin for the j-th coin.
+
+    Parameters
+    ----------
+    i: int
+        Index of coin to be priced
+    j: int
+        Index of quote currency
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant
+
+    Returns
+    -------
+    float
+        Relative change in price per unit of the i-th coin, in units of D
+    """
+    D = float(D)
+    n = len(xp)
+    x = [_x / D for _x in xp]
+    xi = x[i]
+    xj = x[j]
+    Ann = A * n
+
+    # With D = 1, the invariant is F(x) = Ann * sum(x) - (Ann - 1) - Q,
+    # Q = 1 / (n**n * prod(x)), and the price is F_i / F_j.
+    Q = 1 / (n**n * prod(x))
+    F_i = Ann + Q / xi
+    F_j = Ann + Q / xj
+    F_ii = -2 * Q / xi**2
+    F_ij = -Q / (xi * xj)
+    F_jj = -2 * Q / xj**2
+
+    p = F_i / F_j
+    dpdx = (F_ii - 2 * F_ij * p + F_jj * p**2) / F_j
+    return dpdx / p / D
+
+
+# pylint: disable-next=too-many-arguments
+def dynamic_fee_log_derivative(i, j, xp, A, D, fee, fee_mul):
+    """
+    Derivative of the log of one minus the dynamic fee for trading the i-th
+    coin for the j-th coin, with respect to the i-th balance, moving along
+    the invariant curve.
+
+    Adding this to :func:`dydx_log_derivative` gives the price impact of
+    the trade net of fees.
+
+    Parameters
+    ----------
+    i: int
+        Index of "in" coin
+    j: int
+        Index of "out" coin
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant
+    fee: int
+        The dynamic fee at `xp`, with 10**10 precision
+    fee_mul: int
+        Fee multiplier, with 10**10 precision
+
+    Returns
+    -------
+    float
+        Relative change in one minus the fee per unit of the i-th coin, in
+        units of D
+    """
+    xi = xp[i]
+    xj = xp[j]
+    s = xi + xj
+    p = dydx(i, j, xp, A, D)
+    r = 4 * xi * xj / s**2
+    dr = 4 * (xj * (xj - xi) - p * xi * (xi - xj)) / s**3
+    fee_mul = fee_mul - 10**10
+    dfee = -fee * fee_mul / (fee_mul * r + 10**10) * dr
+    return -dfee / (10**10 - fee)
+
+
+def dydx_log_gradient(i, j, xp, A, D):
+    """
+    Gradient of the log of the spot price `dydx(i, j)` with respect to
+    all balances, with the invariant changing to match.
+
+    Unlike :func:`dydx_log_derivative`, this applies to any change in
+    balances, such as from deposits and withdrawals, not only trades.
+
+    Parameters
+    ----------
+    i: int
+        Index of coin to be priced
+    j: int
+        Index of quote currency
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    list of float
+        Relative change in price per unit of each coin, in units of D
+    """
+    G_x, G_xx, G_D, G_xD, _ = _invariant_partials(xp, A, D)
+    D_x = [-G_m / G_D for G_m in G_x]
+
+    D = float(D)
+    return [
+        ((G_xx[i][m] + G_xD[i] * D_m) / G_x[i] - (G_xx[j][m] + G_xD[j] * D_m) / G_x[j])
+        / D
+        for m, D_m in enumerate(D_x)
+    ]
+
+
+def get_D_gradient(xp, A, D):
+    """
+    Derivatives of the invariant with respect to each balance.
+
+    Parameters
+    ----------
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    list of float
+        `dD/dx_k` for each coin k
+    """
+    G_x, _, G_D, _, _ = _invariant_partials(xp, A, D)
+    return [-G_k / G_D for G_k in G_x]
+
+
+def get_D_derivatives(k, xp, A, D):
+    """
+    Derivative of the invariant with respect to the k-th balance and
+    the gradient of that derivative with respect to all balances.
+
+    Parameters
+    ----------
+    k: int
+        Index of coin to differentiate by
+    xp: list of int
+        Coin balances in units of D
+    A: int
+        Amplification coefficient
+    D: int
+        The stableswap invariant for `xp`
+
+    Returns
+    -------
+    (float, list of float)
+        `dD/dx_k` and `d^2D/dx_k dx_m` for each coin m, per unit of coin
+        in units of D
+    """
+    G_x, G_xx, G_D, G_xD, G_DD = _invariant_partials(xp, A, D)
+    D_x = [-G_m / G_D for G_m in G_x]
+    D_k = D_x[k]
+
+    D = float(D)
+    D_kx = [
+        -(G_xx[k][m] + G_xD[k] * D_m + G_xD[m] * D_k + G_DD * D_k * D_m) / G_D / D
+        for m, D_m in enumerate(D_x)
+    ]
+    return D_k, D_kx
+
+
+def _invariant_partials(xp, A, D):
+    """
+    First and second partial derivatives of the invariant function,
+    with balances normalized by D.
+    """
+    D = float(D)
+    n = len(xp)
+    x = [_x / D for _x in xp]
+    Ann = A * n
+
+    # With D = 1, the invariant is G(x, D) = Ann * sum(x) - (Ann - 1) * D - Q,
+    # Q = D**(n + 1) / (n**n * prod(x)), and dD/dx_k = -G_k / G_D.
+    Q = 1 / (n**n * prod(x))
+    G_x = [Ann + Q / _x for _x in x]
+    G_xx = [
+        [-Q / (x_k * x_m) - (Q / x_k**2 if k == m else 0) for m, x_m in enumerate(x)]
+        for k, x_k in enumerate(x)
+    ]
+    G_D = -(Ann - 1) - (n + 1) * Q
+    G_xD = [(n + 1) * Q / _x for _x in x]
+    G_DD = -(n + 1) * n * Q
+
+    return G_x, G_xx, G_D, G_xD, G_DD
@@ -1,21 +1,35 @@
 """
 Mainly a module to house the `MetaPool`, a metapool stableswap implementation in Python.
 """
+from contextlib import contextmanager
 from math import prod
 
 from gmpy2 import mpz
+from numpy import array
 
 from curvesim.pool.snapshot import CurveMetaPoolBalanceSnapshot
 
 from ..base import Pool
+from . import calcs, float_math
+from .calcs_mixin import StableswapCalcsMixin
 
 
-class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
+# pylint: disable-next=too-many-instance-attributes
+class CurveMetaPool(StableswapCalcsMixin, Pool):
     """
     Basic stableswap metapool implementation in Python.
     """
 
     snapshot_class = CurveMetaPoolBalanceSnapshot
+    journaled = (
+        "exchange",
+        "exchange_underlying",
+        "add_liquidity",
+        "remove_liquidity_one_coin",
+    )
+
+    # Max number of invariant values kept by `D`; set to 0 to disable caching.
+    D_cache_size = 16
 
     __slots__ = (
         "A",
@@ -30,6 +44,8 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         "tokens",
         "fee_mul",
         "admin_balances",
+        "_D_cache",
+        "_math",
     )
 
     # pylint: disable-next=too-many-arguments
@@ -44,6 +60,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         fee=4 * 10**6,
         fee_mul=None,
         admin_fee=0 * 10**9,
+        math="exact",
     ):
         """
         Parameters
@@ -66,10 +83,15 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             fee multiplier for dynamic fee pools
         admin_fee: int, optional
             percentage of `fee` with 10**10 precision (default = 50%)
+        math: str, optional
+            calculation engine, "exact" (default) or "float", for both this pool
+            and the basepool; see `math`
         """
         # FIXME: set admin_fee default back to 5 * 10**9
         # once sim code is updated.  Right now we use 0
         # to pass the CI tests.
+        self._D_cache = {}
+
         self.A = A
         self.n = n
         self.max_coin = self.n - 1
@@ -83,6 +105,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             if _p > 10**30:
                 raise ValueError(f"{_p} too high: decimals must be >= 6.")
         self.basepool = basepool
+        self.math = math
 
         self.rate_multiplier = rate_multiplier
 
@@ -96,6 +119,26 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         self.fee_mul = fee_mul
         self.admin_balances = [0] * n
 
+    @Pool.math.setter
+    def math(self, math):
+        """Sets the engine for both this pool and the basepool."""
+        Pool.math.fset(self, math)
+        self.basepool.math = math
+
+    def _journaled_pools(self):
+        """Journals the basepool along with the metapool."""
+        return (self, self.basepool)
+
+    @contextmanager
+    def _use_exact_math(self):
+        """Context manager to temporarily use exact math for this pool and basepool."""
+        math = self._math
+        self.math = "exact"
+        try:
+            yield
+        finally:
+            self.math = math
+
     def D(self, xp=None):
         """
         `D` is the stableswap invariant; this can be thought of as the value of
@@ -117,13 +160,36 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         Note
         ----
         This is a "view" function; it doesn't change the state of the pool.
+
+        Results are cached by `math`, `A`, and `xp`, so any change to balances,
+        rates, or `A` (including reverting to a snapshot) gives a fresh
+        computation.
         """
         A = self.A
         if not xp:
             rates = self.rates
             xp = [x * p // 10**18 for x, p in zip(self.balances, rates)]
-        return self.get_D(xp, A)
 
+        max_size = self.D_cache_size
+        if max_size <= 0:
+            return self.get_D(xp, A)
+
+        key = (self._math, A, *xp)
+        D_cache = self._D_cache
+        try:
+            return D_cache[key]
+        except KeyError:
+            pass
+
+        D = self.get_D(xp, A)
+
+        if len(D_cache) >= max_size:
+            del D_cache[next(iter(D_cache))]
+        D_cache[key] = D
+
+        return D
+
+    @float_math.float_method(float_math.pool_get_D)
     def get_D(self, xp, A):
         r"""
         Calculate D invariant iteratively using non-overflowing integer operations.
@@ -206,6 +272,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         xp = self._xp_mem(rates, balances)
         return self.get_D(xp, A)
 
+    @float_math.float_method(float_math.pool_get_y)
     def get_y(self, i, j, x, xp):
         r"""
         Calculate x[j] if one makes x[i] = x.
@@ -268,6 +335,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         y = int(y)
         return y  # result is in units for D
 
+    @float_math.float_method(float_math.pool_get_y_D)
     def get_y_D(self, A, i, xp, D):
         """
         Calculate x[i] if one uses a reduced `D` than one calculated for given `xp`.
@@ -337,26 +405,9 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         >>> pool.exchange(0, 1, 150 * 10**6)
         (149939820, 59999)
         """
-        rates = self.rates
-        xp = self._xp_mem(rates, self.balances)
-        x = xp[i] + dx * rates[i] // 10**18
-        y = self.get_y(i, j, x, xp)
-        dy = xp[j] - y - 1
-
-        if self.fee_mul is None:
-            fee = dy * self.fee // 10**10
-        else:
-            fee = dy * self.dynamic_fee((xp[i] + x) // 2, (xp[j] + y) // 2) // 10**10
-
-        admin_fee = fee * self.admin_fee // 10**10
-
-        # Convert all to real units
-        rate = rates[j]
-        dy = (dy - fee) * 10**18 // rate
-        fee = fee * 10**18 // rate
-        admin_fee = admin_fee * 10**18 // rate
-        assert dy >= 0
+        dy, fee, admin_fee = self._exchange_amounts(i, j, dx)
 
+        self._journal_attrs("balances", "admin_balances")
         self.balances[i] += dx
         self.balances[j] -= dy + admin_fee
         self.admin_balances[j] += admin_fee
@@ -431,6 +482,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             dy_fee = dy_fee * 10**18 // rates[meta_j]
 
             # Change balances exactly in same way as we change actual ERC20 coin amounts
+            self._journal_attrs("balances", "admin_balances")
             self.balances[meta_i] += dx
             # When rounding errors happen, we undercharge admin fee in favor of LP
             self.balances[meta_j] -= dy + dy_admin_fee
@@ -446,6 +498,57 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
 
         return dy, dy_fee
 
+    def get_dy_underlying_batch(self, i, j, dxs, use_fee=True):
+        """
+        Calculate the results of exchanging each of the given amounts,
+        with each exchange done separately on the current pool state.
+
+        Index values include underlyer indices, as in `exchange_underlying`.
+
+        Exchanges between basepool coins are vectorized through the basepool.
+        Exchanges with the primary coin go through basepool deposits or
+        withdrawals, so are instead computed one amount at a time.
+
+        Parameters
+        ----------
+        i : int
+            Index of "in" coin.
+        j : int
+            Index of "out" coin.
+        dxs : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received and trading fees, as arrays of int,
+            and post-trade prices of coin `i` in coin `j`, as an array of float.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        base_i = i - self.max_coin
+        base_j = j - self.max_coin
+
+        if base_i >= 0 and base_j >= 0:
+            return self.basepool.get_dy_batch(base_i, base_j, dxs, use_fee=use_fee)
+
+        dys = []
+        fees = []
+        prices = []
+        for dx in dxs:
+            with self.use_snapshot_context():
+                dy, fee = self.exchange_underlying(i, j, int(dx))
+                price = self.dydx(i, j, use_fee=use_fee)
+            dys.append(dy)
+            fees.append(fee)
+            prices.append(price)
+
+        return calcs.int_array(dys), calcs.int_array(fees), array(prices, dtype=float)
+
     # pylint: disable-next=too-many-locals
     def calc_withdraw_one_coin(self, token_amount, i, use_fee=True):
         """
@@ -518,6 +621,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             LP token amount received for the deposit amounts.
         """
         mint_amount, fees = self.calc_token_amount(amounts, use_fee=True)
+        self._journal_attrs("balances", "admin_balances", "tokens")
         self.tokens += mint_amount
 
         balances = self.balances
@@ -549,6 +653,7 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         dy, dy_fee = self.calc_withdraw_one_coin(token_amount, i, use_fee=True)
         admin_fee = dy_fee * self.admin_fee // 10**10
+        self._journal_attrs("balances", "admin_balances", "tokens")
         self.balances[i] -= dy + admin_fee
         self.admin_balances[i] += admin_fee
         self.tokens -= token_amount
@@ -780,14 +885,17 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
             base_inputs = [0] * self.basepool.n
             base_inputs[base_i] = dx * 10**18 // self.basepool.rates[base_i]
 
-            dw, _ = self.basepool.calc_token_amount(base_inputs, use_fee=True)
-            # Convert lp token amount to virtual units
-            dw = dw * rates[self.max_coin] // 10**18
-            x = xp[self.max_coin] + dw
+            # The difference quotient is over too small a trade for float
+            # math to resolve, so it always uses exact math.
+            with self._use_exact_math():
+                dw, _ = self.basepool.calc_token_amount(base_inputs, use_fee=True)
+                # Convert lp token amount to virtual units
+                dw = dw * rates[self.max_coin] // 10**18
+                x = xp[self.max_coin] + dw
 
-            meta_i = self.max_coin
-            meta_j = j
-            y = self.get_y(meta_i, meta_j, x, xp)
+                meta_i = self.max_coin
+                meta_j = j
+                y = self.get_y(meta_i, meta_j, x, xp)
 
             dy = xp[meta_j] - y - 1
             if use_fee:
@@ -836,15 +944,9 @@ class CurveMetaPool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         xi = xp[i]
         xj = xp[j]
-        n = self.n
         A = self.A
         D = self.D(xp)
-        D_pow = mpz(D) ** (n + 1)
-        x_prod = prod(xp)
-        A_pow = A * n ** (n + 1)
-        dydx = (xj * (xi * A_pow * x_prod + D_pow)) / (
-            xi * (xj * A_pow * x_prod + D_pow)
-        )
+        dydx = self._calcs.dydx(i, j, xp, A, D)
 
         if use_fee:
             if self.fee_mul is None:
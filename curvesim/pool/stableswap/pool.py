@@ -1,21 +1,26 @@
 """
 Mainly a module to house the `Pool`, a basic stableswap implementation in Python.
 """
-from math import prod
-
 from gmpy2 import mpz
 
 from curvesim.pool.snapshot import CurvePoolBalanceSnapshot
 
 from ..base import Pool
+from . import float_math
+from .calcs_mixin import StableswapCalcsMixin
 
 
-class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
+# pylint: disable-next=too-many-instance-attributes
+class CurvePool(StableswapCalcsMixin, Pool):
     """
     Basic stableswap implementation in Python.
     """
 
     snapshot_class = CurvePoolBalanceSnapshot
+    journaled = ("exchange", "add_liquidity", "remove_liquidity_one_coin")
+
+    # Max number of invariant values kept by `D`; set to 0 to disable caching.
+    D_cache_size = 16
 
     __slots__ = (
         "A",
@@ -29,6 +34,8 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         "r",
         "n_total",
         "admin_balances",
+        "_D_cache",
+        "_math",
     )
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -41,6 +48,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         fee=4 * 10**6,
         fee_mul=None,
         admin_fee=0 * 10**9,
+        math="exact",
     ):
         """
         Parameters
@@ -61,6 +69,8 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
             fee multiplier for dynamic fee pools
         admin_fee: int, optional
             percentage of `fee` with 10**10 precision (default = 50%)
+        math: str, optional
+            calculation engine, "exact" (default) or "float"; see `math`
         """
         # FIXME: set admin_fee default back to 5 * 10**9
         # once sim code is updated.  Right now we use 0
@@ -72,6 +82,9 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         else:
             balances = [D // n * 10**18 // _p for _p in rates]
 
+        self._D_cache = {}
+        self.math = math
+
         self.A = A
         self.n = n
         self.fee = fee
@@ -113,11 +126,34 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         Note
         ----
         This is a "view" function; it doesn't change the state of the pool.
+
+        Results are cached by `math`, `A`, and `xp`, so any change to balances,
+        rates, or `A` (including reverting to a snapshot) gives a fresh
+        computation.
         """
         A = self.A
         xp = xp or self._xp()
-        return self.get_D(xp, A)
 
+        max_size = self.D_cache_size
+        if max_size <= 0:
+            return self.get_D(xp, A)
+
+        key = (self._math, A, *xp)
+        D_cache = self._D_cache
+        try:
+            return D_cache[key]
+        except KeyError:
+            pass
+
+        D = self.get_D(xp, A)
+
+        if len(D_cache) >= max_size:
+            del D_cache[next(iter(D_cache))]
+        D_cache[key] = D
+
+        return D
+
+    @float_math.float_method(float_math.pool_get_D)
     def get_D(self, xp, A):
         r"""
         Calculate D invariant iteratively using non-overflowing integer operations.
@@ -193,6 +229,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         xp = [x * p // 10**18 for x, p in zip(balances, self.rates)]
         return self.get_D(xp, A)
 
+    @float_math.float_method(float_math.pool_get_y)
     def get_y(self, i, j, x, xp):
         r"""
         Calculate x[j] if one makes x[i] = x.
@@ -256,6 +293,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         y = int(y)
         return y  # result is in units for D
 
+    @float_math.float_method(float_math.pool_get_y_D)
     def get_y_D(self, A, i, xp, D):
         """
         Calculate x[i] if one uses a reduced `D` than one calculated for given `xp`.
@@ -327,25 +365,9 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         >>> pool.exchange(0, 1, 150 * 10**6)
         (149939820, 59999)
         """
-        xp = self._xp()
-        x = xp[i] + dx * self.rates[i] // 10**18
-        y = self.get_y(i, j, x, xp)
-        dy = xp[j] - y - 1
-
-        if self.fee_mul is None:
-            fee = dy * self.fee // 10**10
-        else:
-            fee = dy * self.dynamic_fee((xp[i] + x) // 2, (xp[j] + y) // 2) // 10**10
-
-        admin_fee = fee * self.admin_fee // 10**10
-
-        # Convert all to real units
-        rate = self.rates[j]
-        dy = (dy - fee) * 10**18 // rate
-        fee = fee * 10**18 // rate
-        admin_fee = admin_fee * 10**18 // rate
-        assert dy >= 0
+        dy, fee, admin_fee = self._exchange_amounts(i, j, dx)
 
+        self._journal_attrs("balances", "admin_balances")
         self.balances[i] += dx
         self.balances[j] -= dy + admin_fee
         self.admin_balances[j] += admin_fee
@@ -422,6 +444,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
             LP token amount received for the deposit amounts.
         """
         mint_amount, fees = self.calc_token_amount(amounts, use_fee=True)
+        self._journal_attrs("balances", "admin_balances", "tokens")
         self.tokens += mint_amount
 
         balances = self.balances
@@ -453,6 +476,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         dy, dy_fee = self.calc_withdraw_one_coin(token_amount, i, use_fee=True)
         admin_fee = dy_fee * self.admin_fee // 10**10
+        self._journal_attrs("balances", "admin_balances", "tokens")
         self.balances[i] -= dy + admin_fee
         self.admin_balances[i] += admin_fee
         self.tokens -= token_amount
@@ -488,7 +512,7 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
         """
         A = self.A
         old_balances = self.balances
-        D0 = self.get_D_mem(old_balances, A)
+        D0 = self.D()
 
         new_balances = self.balances[:]
         for i in range(self.n):
@@ -600,15 +624,9 @@ class CurvePool(Pool):  # pylint: disable=too-many-instance-attributes
     def _dydx(self, i, j, xp, use_fee):
         xi = xp[i]
         xj = xp[j]
-        n = self.n
         A = self.A
         D = self.D(xp)
-        D_pow = mpz(D) ** (n + 1)
-        x_prod = prod(xp)
-        A_pow = A * n ** (n + 1)
-        dydx = (xj * (xi * A_pow * x_prod + D_pow)) / (
-            xi * (xj * A_pow * x_prod + D_pow)
-        )
+        dydx = self._calcs.dydx(i, j, xp, A, D)
 
         if use_fee:
             if self.fee_mul is None:
@@ -44,3 +44,17 @@ class CurveRaiPool(CurveMetaPool):
         dydx = super()._dydx(i, j, xp, use_fee=use_fee)
         rates = self.rates
         return dydx * rates[i] / rates[j]
+
+    def _dydx_batch(self, i, j, xp, use_fee=False):
+        dydx = super()._dydx_batch(i, j, xp, use_fee=use_fee)
+        rates = self.rates
+        return dydx * float(rates[i]) / float(rates[j])
+
+    def _dydx_matrix(self, xp, use_fee=False):
+        dydx = super()._dydx_matrix(xp, use_fee=use_fee)
+        rates = self.rates
+        for i, r_i in enumerate(rates):
+            for j, r_j in enumerate(rates):
+                if i != j:
+                    dydx[i, j] = float(dydx[i, j]) * r_i / r_j
+        return dydx
@@ -0,0 +1,155 @@
+"""
+Immutable states of stableswap pools, with pure functions to quote trades
+and prices on them.
+
+The functions use the same integer operations as the pool methods (see
+:mod:`.calcs`), so they match `exchange` and `dydx` exactly, but they never
+change a pool: a trade returns the state after it as a new object.  Solvers
+can evaluate candidate trades on a state without taking snapshots, and keep
+or discard the resulting states freely.
+"""
+from dataclasses import replace
+from typing import Optional, Tuple
+
+from curvesim.utils import dataclass
+
+from . import calcs
+
+
+@dataclass(frozen=True, slots=True)
+class CurvePoolState:
+    """
+    The parameters and balances of a stableswap pool at one point in time.
+
+    Get the current state of a pool with :meth:`.SimCurvePool.get_state`.
+    """
+
+    A: int
+    fee: int
+    fee_mul: Optional[int]
+    admin_fee: int
+    rates: Tuple[int, ...]
+    balances: Tuple[int, ...]
+    admin_balances: Tuple[int, ...]
+
+    @classmethod
+    def from_pool(cls, pool):
+        """Returns the current state of a :class:`.CurvePool`."""
+        return cls(
+            A=pool.A,
+            fee=pool.fee,
+            fee_mul=pool.fee_mul,
+            admin_fee=pool.admin_fee,
+            rates=tuple(pool.rates),
+            balances=tuple(pool.balances),
+            admin_balances=tuple(pool.admin_balances),
+        )
+
+    @property
+    def xp(self):
+        """Coin balances in units of D."""
+        return [x * p // 10**18 for x, p in zip(self.balances, self.rates)]
+
+
+def quote_trade(state, i, j, dx):
+    """
+    Quotes exchanging `dx` of coin `i` for coin `j`, as in
+    :meth:`.CurvePool.exchange`.
+
+    Parameters
+    ----------
+    state : :class:`CurvePoolState`
+        Pool state to trade on.
+    i : int
+        Index of "in" coin.
+    j : int
+        Index of "out" coin.
+    dx : int
+        Amount of coin `i` being exchanged.
+
+    Returns
+    -------
+    (int, int, :class:`CurvePoolState`)
+        Amount of coin `j` received, trading fee, and the state after the
+        exchange.  `state` is unchanged.
+    """
+    rates = state.rates
+    xp = state.xp
+    x = xp[i] + dx * rates[i] // 10**18
+    y = int(calcs.get_y(i, j, x, xp, state.A, _get_D(state, xp))[0])
+    dy = xp[j] - y - 1
+
+    if state.fee_mul is None:
+        fee = dy * state.fee // 10**10
+    else:
+        fee = dy * _dynamic_fee(state, (xp[i] + x) // 2, (xp[j] + y) // 2) // 10**10
+
+    admin_fee = fee * state.admin_fee // 10**10
+
+    # Convert all to real units
+    rate = rates[j]
+    dy = (dy - fee) * 10**18 // rate
+    fee = fee * 10**18 // rate
+    admin_fee = admin_fee * 10**18 // rate
+    assert dy >= 0
+
+    balances = list(state.balances)
+    balances[i] += dx
+    balances[j] -= dy + admin_fee
+    admin_balances = list(state.admin_balances)
+    admin_balances[j] += admin_fee
+
+    new_state = replace(
+        state, balances=tuple(balances), admin_balances=tuple(admin_balances)
+    )
+    return dy, fee, new_state
+
+
+def spot_price(state, i, j, use_fee=False):
+    """
+    Returns the spot price of the i-th coin quoted in the j-th coin, as in
+    :meth:`.CurvePool.dydx`.
+
+    Parameters
+    ----------
+    state : :class:`CurvePoolState`
+        Pool state to price.
+    i : int
+        Index of coin to be priced; in a swapping context, this is
+        the "in"-token.
+    j : int
+        Index of quote currency; in a swapping context, this is the
+        "out"-token.
+    use_fee : bool, default=False
+        Deduct fees.
+
+    Returns
+    -------
+    float
+        Price of i-th coin quoted in j-th coin.
+    """
+    xp = state.xp
+    dydx = calcs.dydx(i, j, xp, state.A, _get_D(state, xp))
+
+    if use_fee:
+        if state.fee_mul is None:
+            fee_factor = state.fee / 10**10
+        else:
+            fee_factor = _dynamic_fee(state, xp[i], xp[j]) / 10**10
+    else:
+        fee_factor = 0
+
+    dydx *= 1 - fee_factor
+    return float(dydx)
+
+
+def _get_D(state, xp):
+    return int(calcs.get_D(xp, state.A)[0])
+
+
+def _dynamic_fee(state, xpi, xpj):
+    xps2 = xpi + xpj
+    xps2 *= xps2
+    return (state.fee_mul * state.fee) // (
+        (state.fee_mul - 10**10) * 4 * xpi * xpj // xps2 + 10**10
+    )
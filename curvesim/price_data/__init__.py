@@ -1,6 +1,7 @@
 """
 Tools for retrieving price data.
-Currently supports Coingecko and locally stored data.
+Currently supports Coingecko and locally stored data, either as CSVs or in a
+memory-mapped :class:`~curvesim.price_data.store.PriceStore`.
 
 Note
 -----
@@ -9,7 +10,7 @@ Nomics data is deprecated.
 
 from curvesim.exceptions import NetworkError
 
-from .sources import coingecko, local
+from .sources import coingecko, local, store
 
 
 def get(
@@ -35,10 +36,10 @@ def get(
         Number of days to pull data for.
 
     data_dir : str, default="data"
-        Directory to load local data from.
+        Directory to load local data from, or of the price store.
 
     src : str, default="coingecko"
-        Data source ("coingecko", "nomics", or "local").
+        Data source ("coingecko", "nomics", "local", or "store").
 
 
     Returns
@@ -62,4 +63,7 @@ def get(
     elif src == "local":
         prices, volumes, pzero = local(coins, data_dir=data_dir, end=end)
 
+    elif src == "store":
+        prices, volumes, pzero = store(coins, data_dir=data_dir, days=days, end=end)
+
     return prices, volumes, pzero
@@ -0,0 +1,122 @@
+"""
+Cache of price and volume data parsed from local CSVs.
+
+Loading local data parses each pair's CSV, fills zero prices, and infers the
+data's frequency, on every call and in every worker process that builds a
+price sampler.  :func:`local_pool_prices` instead saves the parsed data in a
+`.curvesim_cache` directory next to the CSVs, and loads it from there until
+a CSV is modified.
+
+Entries are keyed by the loading arguments (coins, `t_end`, `resample`, etc.)
+and store the path, modification time, and size of each CSV they were parsed
+from; an entry is reparsed and overwritten if any of these change.
+"""
+import pickle
+from hashlib import sha256
+from pathlib import Path
+
+import pandas as pd
+
+from curvesim.logging import get_logger
+from curvesim.network import nomics
+from curvesim.utils import atomic_write
+from curvesim.version import __version__
+
+logger = get_logger(__name__)
+
+CACHE_DIR = ".curvesim_cache"
+
+
+def local_pool_prices(coins=None, *, data_dir="data", cache=True, **kwargs):
+    """
+    Loads and formats price/volume data from CSVs, using the cached data if
+    the CSVs haven't changed since it was saved.
+
+    Parameters
+    ----------
+    coins : list of str, optional
+        List of coin names/addresses to load. Data loaded for pairwise
+        combinations.
+
+    data_dir : str, default="data"
+        Directory of the CSVs, in which the cache directory is kept.
+
+    cache : bool, default=True
+        Whether to use and update the cache.
+
+    **kwargs
+        Other arguments of :func:`curvesim.network.nomics.local_pool_prices`,
+        e.g., `t_end` or `resample`.
+
+    Returns
+    -------
+    prices : pandas.DataFrame
+        Timestamped prices for each pair of coins.
+
+    volumes : pandas.DataFrame
+        Timestamped volumes for each pair of coins.
+
+    pzero : pandas.Series
+        Proportion of timestamps with zero volume.
+    """
+    if not cache:
+        return nomics.local_pool_prices(coins, data_dir=data_dir, **kwargs)
+
+    filepaths = nomics.local_price_files(
+        coins=coins,
+        quote=kwargs.get("quote"),
+        pairs=kwargs.get("pairs"),
+        data_dir=data_dir,
+        custom_suffix=kwargs.get("custom_suffix", ""),
+    )
+    sources = [_file_signature(filepath) for filepath in filepaths]
+    path = Path(data_dir) / CACHE_DIR / f"{_args_key(coins, kwargs)}.pickle"
+
+    entry = _load(path)
+    if entry is not None and entry["sources"] == sources:
+        logger.debug("Loaded cached price data from %s", path)
+        return entry["data"]
+
+    data = nomics.local_pool_prices(coins, data_dir=data_dir, **kwargs)
+    if _save(path, {"sources": sources, "data": data}):
+        logger.debug("Cached price data in %s", path)
+    return data
+
+
+def _file_signature(filepath):
+    filepath = Path(filepath)
+    stat = filepath.stat()
+    return (str(filepath.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def _args_key(coins, kwargs):
+    args = repr((coins, sorted(kwargs.items())))
+    versions = repr((__version__, pd.__version__))
+    return sha256((args + versions).encode()).hexdigest()
+
+
+def _load(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Ignoring unreadable price data cache %s", path)
+        return None
+
+
+def _save(path, entry):
+    """
+    Writes to a temporary file and renames it, so reads never see partial data.
+
+    Returns False, after logging a warning, if the cache can't be written,
+    e.g. in a read-only data directory.
+    """
+    try:
+        with atomic_write(path, "wb") as f:
+            pickle.dump(entry, f)
+    except OSError as e:
+        logger.warning("Could not cache price data in %s: %s", path.parent, e)
+        return False
+    return True
@@ -1,11 +1,14 @@
 """
 Helper functions for the different data sources we pull from.
 """
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
 
 from curvesim.logging import get_logger
 from curvesim.network import coingecko as _coingecko
-from curvesim.network import nomics as _nomics
+
+from .csv_cache import local_pool_prices
+from .store import PriceStore
 
 logger = get_logger(__name__)
 
@@ -42,6 +45,9 @@ def local(coins, data_dir="data", end=None):
     """
     Load data for specified coins from a local directory.
 
+    Parsed data is cached next to the CSVs until they are modified
+    (see :mod:`curvesim.price_data.csv_cache`).
+
     Parameters
     ----------
     coins : list of str
@@ -64,8 +70,48 @@ def local(coins, data_dir="data", end=None):
     else:
         t_end = None
         custom_suffix = ""
-    prices, volumes, pzero = _nomics.local_pool_prices(
+    prices, volumes, pzero = local_pool_prices(
         coins, data_dir=data_dir, t_end=t_end, custom_suffix=custom_suffix
     )
 
     return prices, volumes, pzero
+
+
+def store(coins, data_dir="data", days=None, end=None):
+    """
+    Open data for specified coins from a local :class:`.PriceStore`, without
+    loading it into memory.
+
+    Parameters
+    ----------
+    coins : list of str
+        List of coin symbols to load data for.
+    data_dir : str, optional
+        Path to the price store directory. Default is "data".
+    days : int, optional
+        Number of days before the end to use data for.
+        If None, all data up to the end is used. Default is None.
+    end : int, optional
+        End timestamp for the data in seconds since epoch.
+        If None, the end is the last timestamp in the store. Default is None.
+
+    Returns
+    -------
+    tuple of (dict, dict, int)
+        Tuple of prices, volumes, and pzero.
+    """
+    logger.info("Using local price store...")
+    t_end = None if end is None else datetime.fromtimestamp(end, tz=timezone.utc)
+
+    price_store = PriceStore(data_dir)
+    pairs = list(combinations(coins, 2))
+
+    t_start = None
+    if days is not None:
+        last = price_store.last_timestamp(pairs) if t_end is None else t_end
+        t_start = last - timedelta(days=days)
+
+    prices, volumes = price_store.read(pairs, start=t_start, end=t_end)
+    pzero = price_store.pzero(pairs)
+
+    return prices, volumes, pzero
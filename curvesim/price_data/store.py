@@ -0,0 +1,281 @@
+"""
+Local binary store for price and volume histories too large to load as CSVs.
+
+Each pair's data is kept in its own directory as `.npy` files (timestamps,
+prices, and volumes), with an `index.json` describing the pairs in the
+store.  :meth:`PriceStore.read` opens the files memory-mapped, so only the
+timestamps in the requested window are read from disk, as they are used,
+and processes reading the same store share the pages in the OS cache instead
+of each holding a copy.
+
+Stores are built from CSVs in the layout of the `data` directory, i.e. files
+named for their pair ("DAI-USDC.csv") with a timestamp index and "price" and
+"volume" columns:
+
+.. code-block::
+
+    from curvesim.price_data.store import csv_to_store
+
+    store = csv_to_store("data", "data/store")
+    prices, volumes = store.read([("DAI", "USDC"), ("DAI", "USDT")])
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.logging import get_logger
+from curvesim.utils import atomic_write
+
+logger = get_logger(__name__)
+
+INDEX_FILE = "index.json"
+COLUMNS = ("timestamps", "price", "volume")
+
+
+class PriceStore:
+    """
+    Directory of price and volume histories stored as memory-mappable arrays.
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str or path-like
+            Directory of the store; created when data is first written.
+        """
+        self.path = Path(path)
+
+    @property
+    def index(self):
+        """
+        Dict with the first and last timestamp, length, frequency, and
+        proportion of zero prices in the source data, for each pair.
+        """
+        try:
+            with open(self.path / INDEX_FILE, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @property
+    def pairs(self):
+        """Names of the pairs in the store, e.g. "DAI-USDC"."""
+        return list(self.index)
+
+    def write(self, name, prices, volumes):
+        """
+        Stores a pair's prices and volumes, replacing any stored before.
+
+        Prices of zero are replaced by the previous nonzero price (or the
+        next, at the start of the data), as when loading local CSVs.
+
+        Parameters
+        ----------
+        name : str
+            Name of the pair, e.g. "DAI-USDC".
+
+        prices : pandas.Series
+            Prices with a datetime index.
+
+        volumes : pandas.Series
+            Volumes with the same index as the prices.
+        """
+        if not prices.index.equals(volumes.index):
+            raise CurvesimValueError("Price and volume timestamps must match.")
+
+        index = pd.to_datetime(prices.index, utc=True)
+        if not index.is_monotonic_increasing:
+            raise CurvesimValueError("Timestamps must be sorted.")
+
+        pzero = float((prices == 0).mean())
+        prices = prices.mask(prices == 0).ffill().bfill()
+
+        pair_dir = self.path / name
+        pair_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "timestamps": index.asi8,
+            "price": prices.to_numpy(dtype=np.float64),
+            "volume": volumes.to_numpy(dtype=np.float64),
+        }
+        for column, array in arrays.items():
+            with atomic_write(pair_dir / f"{column}.npy", "wb") as f:
+                np.save(f, array)
+
+        self._update_index(
+            name,
+            {
+                "start": index[0].isoformat() if len(index) else None,
+                "end": index[-1].isoformat() if len(index) else None,
+                "length": len(index),
+                "freq": pd.infer_freq(index) if len(index) > 2 else None,
+                "pzero": pzero,
+            },
+        )
+        logger.debug("Stored %s timestamps for %s", len(index), name)
+
+    def read(self, pairs, start=None, end=None):
+        """
+        Returns the prices and volumes for the pairs between `start` and
+        `end`, as DataFrames backed by memory-mapped files.
+
+        If the pairs' timestamps differ, the data is aligned on all of their
+        timestamps, which copies it into memory.
+
+        Parameters
+        ----------
+        pairs : list of str or tuple
+            Pairs to read, either by name ("DAI-USDC") or as a pair of
+            symbols (("DAI", "USDC")).
+
+        start, end : datetime-like, optional
+            First and last timestamps to include.
+
+        Returns
+        -------
+        prices : pandas.DataFrame
+            Timestamped prices, with a column for each pair.
+
+        volumes : pandas.DataFrame
+            Timestamped volumes, with a column for each pair.
+        """
+        index = self.index
+        names = [_pair_name(pair) for pair in pairs]
+        missing = [name for name in names if name not in index]
+        if missing:
+            raise CurvesimValueError(
+                f"Pairs {missing} not in price store '{self.path}'; "
+                f"available pairs: {list(index)}"
+            )
+
+        data = [self._read_pair(name, start, end) for name in names]
+        freqs = {index[name]["freq"] for name in names}
+        freq = freqs.pop() if len(freqs) == 1 else None
+
+        timestamps = data[0][0]
+        if all(np.array_equal(timestamps, t) for t, _, _ in data[1:]):
+            datetime_index = _datetime_index(timestamps, freq)
+            prices = _frame([price for _, price, _ in data], datetime_index)
+            volumes = _frame([volume for _, _, volume in data], datetime_index)
+        else:
+            logger.info("Aligning timestamps of %s, copying data to memory", names)
+            prices = _aligned_frame([(t, price) for t, price, _ in data])
+            volumes = _aligned_frame([(t, volume) for t, _, volume in data])
+
+        prices.columns = volumes.columns = list(pairs)
+        return prices, volumes
+
+    def pzero(self, pairs):
+        """
+        Returns the proportion of zero prices in the source data for each pair.
+
+        Returns
+        -------
+        pandas.Series
+        """
+        index = self.index
+        return pd.Series(
+            [index[_pair_name(pair)]["pzero"] for pair in pairs], index=list(pairs)
+        )
+
+    def last_timestamp(self, pairs):
+        """
+        Returns the last timestamp in the data of any of the pairs.
+
+        Returns
+        -------
+        pandas.Timestamp
+        """
+        index = self.index
+        return max(pd.Timestamp(index[_pair_name(pair)]["end"]) for pair in pairs)
+
+    def _read_pair(self, name, start, end):
+        pair_dir = self.path / name
+        timestamps, prices, volumes = [
+            np.load(pair_dir / f"{column}.npy", mmap_mode="r") for column in COLUMNS
+        ]
+
+        first = 0 if start is None else _searchsorted(timestamps, start, "left")
+        last = (
+            len(timestamps) if end is None else _searchsorted(timestamps, end, "right")
+        )
+        window = slice(first, last)
+        return timestamps[window], prices[window], volumes[window]
+
+    def _update_index(self, name, entry):
+        index = self.index
+        index[name] = entry
+        with atomic_write(self.path / INDEX_FILE) as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+
+
+def csv_to_store(data_dir="data", store_dir=None, pairs=None):
+    """
+    Converts price/volume CSVs to a :class:`PriceStore`.
+
+    Parameters
+    ----------
+    data_dir : str or path-like, default="data"
+        Directory of CSVs named for their pair (e.g., "DAI-USDC.csv"), with a
+        timestamp index and "price" and "volume" columns.
+
+    store_dir : str or path-like, optional
+        Directory of the store.  Defaults to "store" in `data_dir`.
+
+    pairs : list of str, optional
+        Names of the pairs to convert.  Defaults to all CSVs in `data_dir`.
+
+    Returns
+    -------
+    :class:`PriceStore`
+    """
+    data_dir = Path(data_dir)
+    store = PriceStore(data_dir / "store" if store_dir is None else store_dir)
+
+    if pairs is None:
+        pairs = sorted(path.stem for path in data_dir.glob("*.csv"))
+
+    for name in pairs:
+        data = pd.read_csv(data_dir / f"{name}.csv", index_col=0)
+        data.index = pd.to_datetime(data.index, utc=True)
+        store.write(name, data["price"], data["volume"])
+        logger.info("Converted %s to price store '%s'", name, store.path)
+
+    return store
+
+
+def _datetime_index(timestamps, freq=None):
+    return pd.DatetimeIndex(timestamps.view("datetime64[ns]"), tz="UTC", freq=freq)
+
+
+def _frame(columns, index):
+    """
+    DataFrame of the columns without copying memory-mapped data.
+
+    Columns are passed as Series: with `copy=False`, pandas keeps Series in a
+    dict as they are, while some versions consolidate arrays into one block.
+    """
+    series = [pd.Series(column, index=index, copy=False) for column in columns]
+    return pd.DataFrame(dict(enumerate(series)), copy=False)
+
+
+def _aligned_frame(series_data):
+    """DataFrame of series with different timestamps, aligned on all of them."""
+    series = [pd.Series(values, _datetime_index(t)) for t, values in series_data]
+    return pd.concat(series, axis=1, ignore_index=True)
+
+
+def _pair_name(pair):
+    if isinstance(pair, str):
+        return pair
+    return "-".join(pair)
+
+
+def _searchsorted(timestamps, time, side):
+    time = pd.Timestamp(time)
+    if time.tzinfo is None:
+        time = time.tz_localize("UTC")
+    return int(np.searchsorted(timestamps, time.value, side=side))
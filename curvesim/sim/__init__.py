@@ -38,6 +38,13 @@ def autosim(
     Curve pools from any chain supported by the Convex Community Subgraphs
     can be simulated directly by inputting the pool's address.
 
+    .. note::
+        Responses from data providers can be cached on disk (see
+        :mod:`curvesim.network.cache`), in which case calls within the
+        cache's time-to-live simulate the same pool and volume snapshots.
+        Caching is off unless enabled with ``CURVESIM_HTTP_CACHE_DIR`` or
+        ``curvesim.network.cache.configure_response_cache``.
+
     Parameters
     ----------
     pool: str, optional
@@ -115,7 +122,8 @@ def autosim(
         Number of days to fetch data for.
 
     src: str, default='coingecko'
-        Valid values for data source are 'coingecko' or 'local'
+        Valid values for data source are 'coingecko', 'local', or 'store'
+        (a local :class:`~curvesim.price_data.store.PriceStore` in `data_dir`)
 
     data_dir: str, default='data'
         Relative path to saved data folder.
@@ -139,6 +147,43 @@ def autosim(
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    math : str, default="exact"
+        Calculation engine for the pool: "exact" for integer arithmetic
+        matching the smart contract or "float" for faster float64 arithmetic,
+        which approximates the integer results to ~1e-13 relative error.
+
+    sink : :class:`~curvesim.pipelines.sinks.ResultSink`, optional
+        Receives each run's metrics as soon as the run finishes, instead of
+        keeping all runs in memory (see :mod:`curvesim.pipelines.sinks`).
+        Unless it is a :class:`~curvesim.pipelines.sinks.MemorySink`, the
+        output of the sink's `close` method is returned instead of results.
+
+    progress : callable, optional
+        Called with the number of finished runs and the total number of runs
+        after each run finishes.
+
+    checkpoint_dir : str, optional
+        Directory to save each run's results in as it finishes.  Rerunning
+        with the same arguments and directory loads the saved runs instead of
+        simulating them again, e.g. to resume an interrupted sweep.
+
+    cache_dir : str, optional
+        Directory of a result cache shared across calls.  Runs with the same
+        pool, parameters, price data, and settings as a cached run return
+        its results without simulating.  The cache is limited in size,
+        evicting the least recently used results.
+
+    cost_history : str, optional
+        JSON file of run times from previous calls.  With `ncpu` above one,
+        the runs expected to take longest are started first, so no worker
+        is left finishing a slow run after the others are idle.
+
+    executor : :class:`~curvesim.pipelines.executor.Executor` or \
+    :class:`concurrent.futures.Executor`, optional
+        Worker pool reused across calls, avoiding the startup cost of new
+        worker processes for each call, or the executor of a job runner to
+        run on instead of starting a process pool.
+
     env: str, default='prod'
         Environment for the Curve subgraph, which pulls pool and volume snapshots.
 
@@ -5,6 +5,7 @@ Functions and interfaces used in the simulation pipeline framework.
 __all__ = [
     "Trader",
     "Strategy",
+    "StrategyRun",
     "SimAssets",
     "SimPool",
     "Trade",
@@ -18,5 +19,5 @@ from .param_samplers import ParameterSampler
 from .price_samplers import PriceSample, PriceSampler
 from .sim_assets import SimAssets
 from .sim_pool import SimPool
-from .strategy import Strategy
+from .strategy import Strategy, StrategyRun
 from .trader import Trade, Trader, TradeResult
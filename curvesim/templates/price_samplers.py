@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
 
 from curvesim.logging import get_logger
@@ -36,3 +37,19 @@ class PriceSampler(ABC):
         class:`PriceSample`
         """
         raise NotImplementedError
+
+    @contextmanager
+    def shared(self):
+        """
+        Context manager giving a version of the sampler that is cheap to
+        send to other processes, e.g. by storing its data in shared memory.
+        Used by :func:`curvesim.pipelines.run_pipeline` for parallel runs.
+
+        Any resources it uses are freed on exit.  By default, the sampler
+        itself is given.
+
+        Yields
+        -------
+        :class:`PriceSampler`
+        """
+        yield self
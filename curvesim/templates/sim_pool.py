@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from numpy import ones
+
 from curvesim.logging import get_logger
 
 logger = get_logger(__name__)
@@ -69,6 +71,61 @@ class SimPool(ABC):
         """
         raise NotImplementedError
 
+    def price_matrix(self, use_fee=True):
+        """
+        Returns the spot prices of each coin quoted in each other coin,
+        as in `price`, computed together.
+
+        The (i, j) entry is the price of the coin with index `i` quoted in
+        the coin with index `j`, where indices are those returned by
+        `get_asset_indices`.  Used by the arbitrage pipelines to price all
+        coin pairs at once.
+
+        Base implementation calls `price` for each pair of coins in `assets`;
+        pools can override it to share calculations across pairs.
+
+        Parameters
+        ----------
+        use_fee: bool, default=True
+            Deduct fees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of prices, with ones on the diagonal.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        symbols = self.assets.symbols
+        prices = ones((len(symbols), len(symbols)))
+        for i, coin_in in enumerate(symbols):
+            for j, coin_out in enumerate(symbols):
+                if i != j:
+                    prices[i, j] = self.price(coin_in, coin_out, use_fee=use_fee)
+        return prices
+
+    def get_asset_indices(self, *asset_ids):
+        """
+        Returns the indices of the given coins in `price_matrix`.
+
+        Base implementation indexes string IDs by their position in
+        `assets.symbols` and returns integer IDs as they are.
+
+        Parameters
+        ----------
+        asset_ids : str, int
+            IDs of coins, as in `price`.
+
+        Returns
+        -------
+        list of int
+            The index of each coin.
+        """
+        symbols = self.assets.symbols
+        return [symbols.index(ID) if isinstance(ID, str) else ID for ID in asset_ids]
+
     @abstractmethod
     def trade(self, coin_in, coin_out, size):
         """
@@ -98,6 +155,121 @@ class SimPool(ABC):
         """
         raise NotImplementedError
 
+    def quote_batch(self, coin_in, coin_out, sizes, use_fee=True):
+        """
+        Calculate the results of trading each of the given sizes,
+        with each trade done separately on the current pool state.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Amounts are normalized as in `trade`.
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        sizes : array-like of int
+            Amounts of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade prices.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Amounts of coin `j` received, trading fees, and post-trade prices
+            of `coin_in` quoted in `coin_out`, one entry for each size.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        raise NotImplementedError
+
+    def post_trade_price(self, coin_in, coin_out, size, use_fee=True):
+        """
+        Returns the spot price of `coin_in` quoted in terms of `coin_out`
+        after trading `size` of `coin_in` for `coin_out`, along with the
+        derivative of that price with respect to `size`.
+
+        The price should match calling `price` after `trade`.  The derivative
+        only needs to be a close approximation; it is used to size arbitrage
+        trades, which fall back to a derivative-free search for pools that
+        don't implement this.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        coin_in : str, int
+            ID of "in" coin.
+        coin_out : str, int
+            ID of "out" coin.
+        size : int
+            Amount of coin `i` being exchanged.
+        use_fee: bool, default=True
+            Deduct fees from the post-trade price.
+
+        Returns
+        -------
+        (float, float)
+            Post-trade price of `coin_in` quoted in `coin_out` and its
+            derivative with respect to `size`.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        raise NotImplementedError
+
+    def price_jacobian(self, pairs):
+        """
+        Returns the derivatives of the spot prices of each coin pair with
+        respect to the size of a trade in each pair.
+
+        The (k, m) entry is the derivative of `price(*pairs[k])` with respect
+        to the amount of `pairs[m][0]` traded for `pairs[m][1]`, at the
+        current pool state.  The derivatives only need to be close
+        approximations; they are used to optimize multiple arbitrage trades
+        at once, which falls back to finite differences for pools that don't
+        implement this.
+
+        Coin IDs should be strings but as a legacy feature integer indices
+        corresponding to the pool implementation are allowed (caveat lector).
+
+        Parameters
+        ----------
+        pairs : list of (str, str) or (int, int)
+            IDs of the "in" and "out" coins for each pair.
+
+        Returns
+        -------
+        numpy.ndarray
+            Square array of price derivatives.
+
+        Note
+        ----
+        This is a "view" function; it doesn't change the state of the pool.
+        """
+        raise NotImplementedError
+
+    def get_state(self):
+        """
+        Returns the pool's current state as an immutable value, which pure
+        functions can quote trades and prices on without changing the pool.
+
+        See :mod:`curvesim.pool.stableswap.state` for stableswap pools.
+
+        Returns
+        -------
+        object
+            The pool state.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def get_max_trade_size(self, coin_in, coin_out, out_balance_perc):
         """
@@ -1,10 +1,24 @@
 from abc import ABC, abstractmethod
 
 from curvesim.logging import get_logger
+from curvesim.utils import dataclass
 
 logger = get_logger(__name__)
 
 
+@dataclass(slots=True)
+class StrategyRun:
+    """
+    Data container for a simulation run in progress, so the run can be
+    advanced through the price data in steps.
+    """
+
+    pool: object
+    trader: object
+    state_log: object
+    n_steps: int = 0
+
+
 class Strategy(ABC):
     """
     A Strategy defines the trading approach used during each step of a simulation.
@@ -60,6 +74,21 @@ class Strategy(ABC):
         -------
         metrics : tuple of lists
 
+        """
+        run = self.start(pool, parameters, price_sampler)
+        self.advance(run, price_sampler)
+        return self.finish(run)
+
+    def start(self, pool, parameters, price_sampler):
+        """
+        Prepares a run that can be advanced through the price data in steps,
+        e.g. to compare runs part way through and stop the worst early.
+
+        Parameters are as for :meth:`__call__`.
+
+        Returns
+        -------
+        :class:`StrategyRun`
         """
         # pylint: disable=not-callable
         trader = self.trader_class(pool)
@@ -68,14 +97,44 @@ class Strategy(ABC):
         logger.info("[%s] Simulating with %s", pool.symbol, parameters)
 
         pool.prepare_for_run(price_sampler.prices)
+        return StrategyRun(pool, trader, state_log)
 
-        for sample in price_sampler:
+    def advance(self, run, samples):
+        """
+        Computes and executes trades for each of the samples, continuing
+        from where the run left off.
+
+        Parameters
+        ----------
+        run : :class:`StrategyRun`
+            Run returned by :meth:`start`.
+
+        samples : iterable
+            The next price samples, e.g. a slice of the price sampler.
+        """
+        pool, trader, state_log = run.pool, run.trader, run.state_log
+        for sample in samples:
             pool.prepare_for_trades(sample.timestamp)
             trader_args = self._get_trader_inputs(sample)
             trade_data = trader.process_time_sample(*trader_args)
             state_log.update(price_sample=sample, trade_data=trade_data)
+            run.n_steps += 1
+
+    def finish(self, run):
+        """
+        Computes the run's metrics for all the steps taken so far.
+
+        Returns
+        -------
+        metrics : tuple of lists
+        """
+        logger.debug(
+            "[%s] Skipped %s timesteps with nothing to trade",
+            run.pool.symbol,
+            run.trader.skipped_steps,
+        )
 
-        return state_log.compute_metrics()
+        return run.state_log.compute_metrics()
 
     @abstractmethod
     def _get_trader_inputs(self, sample):
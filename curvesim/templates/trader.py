@@ -59,6 +59,8 @@ class Trader(ABC):
 
         """
         self.pool = pool
+        # timesteps with nothing to trade, skipped before computing trades
+        self.skipped_steps = 0
 
     @abstractmethod
     def compute_trades(self, *args):
@@ -13,6 +13,7 @@ from curvesim.pool import CurveMetaPool
 D_UNIT = 10**18
 
 
+# pylint: disable-next=too-many-locals
 def bonding_curve(pool, *, truncate=0.0005, resolution=1000, plot=False):
     """
     Computes and optionally plots a pool's bonding curve and current reserves.
@@ -61,11 +62,8 @@ def bonding_curve(pool, *, truncate=0.0005, resolution=1000, plot=False):
         x_max = pool.get_y(j, i, truncated_D, xp)
         xs = linspace(truncated_D, x_max, resolution).round()
 
-        curve = []
-        for x in xs:
-            y = pool.get_y(i, j, int(x), xp)
-            curve.append((x, y))
-        curve = [(x / D_UNIT, y / D_UNIT) for x, y in curve]
+        ys = pool.get_y_batch(i, j, xs, xp)
+        curve = [(x / D_UNIT, int(y) / D_UNIT) for x, y in zip(xs, ys)]
         pair_to_curve[(i, j)] = curve
 
     if plot:
@@ -4,8 +4,11 @@ import inspect
 import os
 import re
 import sys
+from contextlib import contextmanager
 from dataclasses import dataclass as _dataclass
 from itertools import combinations
+from pathlib import Path
+from tempfile import NamedTemporaryFile
 
 from dotenv import load_dotenv
 
@@ -156,3 +159,57 @@ def dataclass(*args, **kwargs):
         del kwargs["slots"]
 
     return _dataclass(*args, **kwargs)
+
+
+@contextmanager
+def atomic_write(path, mode="w", encoding=None):
+    """
+    Context manager for writing a file atomically.
+
+    Yields a temporary file in the same directory as `path` (created if
+    needed).  When the block exits, the file is flushed to disk and renamed
+    to `path`, replacing any existing file, so readers see either the old
+    file or the complete new one.  If the block raises, the temporary file
+    is deleted and `path` is left unchanged.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to write.
+
+    mode : str, default="w"
+        Mode to open the temporary file with, "w" or "wb".
+
+    encoding : str, optional
+        Encoding for text mode.  Defaults to "utf-8".
+
+    Example
+    -------
+    .. code-block::
+
+        with atomic_write(path, "wb") as f:
+            pickle.dump(data, f)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if "b" not in mode:
+        encoding = encoding or "utf-8"
+
+    with NamedTemporaryFile(
+        mode,
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+        encoding=encoding,
+    ) as f:
+        try:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+
+    os.replace(f.name, path)
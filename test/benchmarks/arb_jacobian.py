@@ -0,0 +1,98 @@
+"""
+Benchmark for the analytic price Jacobian used by the volume-limited
+arbitrage optimizer.
+
+Runs `multipair_optimal_arbitrage` over a series of random price moves,
+with the pools' analytic `price_jacobian` and with the finite-difference
+Jacobian used for pools without one, and reports the time per timestep
+and the largest relative post-trade price error for each.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.arb_jacobian
+"""
+import random
+from itertools import combinations
+from time import perf_counter
+from unittest.mock import patch
+
+from curvesim.pipelines.vol_limited_arb.trader import multipair_optimal_arbitrage
+from curvesim.pool.sim_interface import SimCurveMetaPool
+from curvesim.templates import SimPool
+
+from .float_math import make_local_pools
+
+N_TIMESTEPS = 20
+PRICE_VOLATILITY = 0.003
+VOLUME_LIMIT = 0.01
+
+
+def make_timesteps(pool, seed=0):
+    """Random market prices around the pool's prices, with volume limits."""
+    names = pool.asset_names
+    if isinstance(pool, SimCurveMetaPool):
+        # the basepool LP token isn't traded against the basepool coins
+        names = names[:-1]
+
+    rng = random.Random(seed)
+    balances = pool.asset_balances
+    timesteps = []
+    for _ in range(N_TIMESTEPS):
+        prices = {}
+        limits = {}
+        for pair in combinations(names, 2):
+            shock = 1 + rng.gauss(0, PRICE_VOLATILITY)
+            prices[pair] = pool.price(*pair, use_fee=False) * shock
+
+            limit = min(balances[coin] for coin in pair) * VOLUME_LIMIT / 10**18
+            limits[pair] = limit
+            limits[pair[::-1]] = limit
+        timesteps.append((prices, limits))
+
+    return timesteps
+
+
+def run(pool, timesteps):
+    """Optimize the arbitrage trades for each timestep on the same pool state."""
+    results = []
+    start = perf_counter()
+    for prices, limits in timesteps:
+        trades, _, _ = multipair_optimal_arbitrage(pool, prices, limits)
+        results.append(trades)
+    elapsed = perf_counter() - start
+
+    max_error = 0
+    for (prices, _), trades in zip(timesteps, results):
+        with pool.use_snapshot_context():
+            for trade in trades:
+                pool.trade(trade.coin_in, trade.coin_out, trade.amount_in)
+            for pair, price in prices.items():
+                error = abs(pool.price(*pair, use_fee=False) / price - 1)
+                max_error = max(max_error, error)
+
+    return elapsed / len(timesteps), max_error
+
+
+def main():
+    """Compare analytic and finite-difference Jacobians on each pool."""
+    for name, pool in make_local_pools("exact").items():
+        timesteps = make_timesteps(pool)
+
+        t_analytic, error_analytic = run(pool, timesteps)
+        with patch.object(type(pool), "price_jacobian", SimPool.price_jacobian):
+            t_fd, error_fd = run(pool, timesteps)
+
+        print(f"{name}:")
+        print(
+            f"    analytic: {t_analytic * 1000:.1f}ms per timestep, "
+            f"max error {error_analytic:.2e}"
+        )
+        print(
+            f"    finite differences: {t_fd * 1000:.1f}ms per timestep, "
+            f"max error {error_fd:.2e}"
+        )
+        print(f"    speedup: {t_fd / t_analytic:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Validation harness for the float64 (``math="float"``) pool engine.
+
+Builds each pool with the exact and the float engine, then runs the same
+prices, batch quotes, and trades against both and reports the maximum
+relative divergence of the float results from the exact ones, along with
+timings for each engine.
+
+By default, this uses the pools in `test.simple_ci`, whose results are
+saved in `test/data`, which requires network access to pull their
+metadata.  The `--local` option instead uses pools of similar sizes
+built locally.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.float_math [--local]
+"""
+import argparse
+from copy import deepcopy
+from itertools import permutations
+from time import perf_counter
+
+from curvesim.pool import get_sim_pool
+from curvesim.pool.sim_interface import (
+    SimCurveCryptoPool,
+    SimCurveMetaPool,
+    SimCurvePool,
+)
+
+from ..simple_ci import pools as CI_POOLS
+
+TRADE_FRACTIONS = [10**-6, 10**-4, 10**-2, 10**-1]
+
+
+def make_local_pools(math):
+    """Pools similar in size to the `test.simple_ci` pools."""
+    pool = SimCurvePool(
+        A=2000, D=[400 * 10**24, 390 * 10**24, 410 * 10**24], n=3, math=math
+    )
+    pool.metadata = {"coins": {"names": ["DAI", "USDC", "USDT"]}}
+
+    basepool = SimCurvePool(
+        A=2000, D=[400 * 10**24, 390 * 10**24, 410 * 10**24], n=3
+    )
+    basepool.metadata = {"coins": {"names": ["DAI", "USDC", "USDT"]}}
+    metapool = SimCurveMetaPool(
+        A=1500, D=[50 * 10**24, 45 * 10**24], n=2, basepool=basepool, math=math
+    )
+    metapool.metadata = {"coins": {"names": ["FRAX", "3CRV"]}}
+
+    tricrypto = SimCurveCryptoPool(
+        A=1707629,
+        gamma=11809167828997,
+        n=3,
+        precisions=[1, 1, 1],
+        mid_fee=3000000,
+        out_fee=30000000,
+        allowed_extra_profit=2000000000000,
+        fee_gamma=500000000000000,
+        adjustment_step=490000000000000,
+        admin_fee=5000000000,
+        ma_half_time=865,
+        price_scale=[30453123431671769818574, 1871140849377954208512],
+        D=3 * 18418434882428000000000000,
+        tokens=47986553926751950746367000,
+        xcp_profit=1000448625854298803,
+        xcp_profit_a=1000440033249679801,
+        math=math,
+    )
+    tricrypto.metadata = {"coins": {"names": ["USDC", "WBTC", "WETH"]}}
+
+    return {"stableswap": pool, "metapool": metapool, "tricrypto": tricrypto}
+
+
+def make_ci_pools(math):
+    """The `test.simple_ci` pools, pulled from the subgraph."""
+    return {
+        pool["address"]: get_sim_pool(
+            pool["address"],
+            end_ts=pool["end_timestamp"],
+            env=pool.get("env", "prod"),
+            math=math,
+        )
+        for pool in CI_POOLS
+    }
+
+
+def invariant(pool):
+    """Return the pool's invariant, `D`."""
+    return pool.D() if callable(pool.D) else pool.D
+
+
+def run(pool):
+    """
+    Price, quote, and trade every coin pair, returning the results
+    by category and the elapsed time.
+    """
+    results = {"D": [], "price": [], "quote": [], "trade": []}
+    names = pool.asset_names
+    if isinstance(pool, SimCurveMetaPool):
+        # the basepool LP token isn't traded against the basepool coins
+        names = names[:-1]
+
+    start = perf_counter()
+    results["D"].append(invariant(pool))
+    for coin_in, coin_out in permutations(names, 2):
+        results["price"].append(pool.price(coin_in, coin_out))
+        results["price"].append(pool.price(coin_in, coin_out, use_fee=False))
+
+        balance = pool.asset_balances[coin_in]
+        sizes = [int(balance * f) for f in TRADE_FRACTIONS]
+        for arr in pool.quote_batch(coin_in, coin_out, sizes):
+            results["quote"].extend(arr)
+
+        # trades compound on the same pool to exercise changing states
+        for size in sizes[:-1]:
+            results["trade"].extend(pool.trade(coin_in, coin_out, size))
+            results["price"].append(pool.price(coin_in, coin_out))
+            results["D"].append(invariant(pool))
+    elapsed = perf_counter() - start
+
+    return results, elapsed
+
+
+def max_divergence(exact, approx):
+    """Maximum relative difference, skipping exact zeros."""
+    return max(
+        (abs(float(a) - float(b)) / abs(float(a)) for a, b in zip(exact, approx) if a),
+        default=0.0,
+    )
+
+
+def main(local=False):
+    """Compare the float engine against the exact engine on each pool."""
+    make_pools = make_local_pools if local else make_ci_pools
+    exact_pools = make_pools("exact")
+    float_pools = make_pools("float")
+
+    for name, exact_pool in exact_pools.items():
+        exact, t_exact = run(deepcopy(exact_pool))
+        approx, t_float = run(deepcopy(float_pools[name]))
+
+        print(f"{name}:")
+        for key, values in exact.items():
+            error = max_divergence(values, approx[key])
+            print(f"    {key:<6} max rel. error: {error:.2e}")
+        print(f"    exact: {t_exact:.3f}s, float: {t_float:.3f}s")
+        print(f"    speedup: {t_exact / t_float:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare float and exact pool engines.",
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Use locally built pools instead of pulling the CI pools.",
+    )
+    args = parser.parse_args()
+
+    main(local=args.local)
@@ -0,0 +1,69 @@
+"""
+Benchmark for the shared HTTP session.
+
+Sends batches of concurrent requests to a local server, as the network
+connectors do when paginating the subgraph or fetching prices for several
+coins, with a new session per request (`aiohttp.request`) and with the
+shared session, and reports the time per batch for each.  The local server
+uses plain HTTP, so the savings from skipping TLS handshakes on real
+providers are larger.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.http_session
+"""
+import asyncio
+from time import perf_counter
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from curvesim.network.session import get_session
+
+N_BATCHES = 20
+BATCH_SIZE = 50
+
+
+async def per_request(url):
+    async with aiohttp.request("GET", url) as resp:
+        return await resp.json()
+
+
+async def shared_session(url):
+    session = await get_session()
+    async with await session.request("GET", url) as resp:
+        return await resp.json()
+
+
+async def time_batches(request, url):
+    """Returns the mean time per batch, in seconds."""
+    start = perf_counter()
+    for _ in range(N_BATCHES):
+        await asyncio.gather(*[request(url) for _ in range(BATCH_SIZE)])
+    return (perf_counter() - start) / N_BATCHES
+
+
+async def run():
+    async def handler(_):
+        return web.json_response({"data": list(range(100))})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    async with TestServer(app) as server:
+        url = server.make_url("/")
+        per_request_time = await time_batches(per_request, url)
+        shared_time = await time_batches(shared_session, url)
+
+    print(f"session per request: {per_request_time * 1000:8.2f} ms")
+    print(f"shared session:      {shared_time * 1000:8.2f} ms")
+    print(f"speedup:             {per_request_time / shared_time:8.1f}x")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
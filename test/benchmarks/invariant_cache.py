@@ -0,0 +1,90 @@
+"""
+Benchmark for the stableswap invariant (`D`) cache.
+
+Runs the arbitrage sizing used by the pipelines, which repeatedly
+trades and prices against a snapshotted pool, with and without
+the cache and reports timings and the number of `get_D` evaluations.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.invariant_cache
+"""
+import cProfile
+import pstats
+from time import perf_counter
+
+from curvesim.pipelines.common import get_arb_trades
+from curvesim.pool.sim_interface import SimCurveMetaPool, SimCurvePool
+
+
+def make_pools():
+    """Pools similar in size to 3CRV and a 3CRV metapool."""
+    pool = SimCurvePool(A=2000, D=[400 * 10**24, 390 * 10**24, 410 * 10**24], n=3)
+    pool.metadata = {"coins": {"names": ["DAI", "USDC", "USDT"]}}
+
+    basepool = SimCurvePool(
+        A=2000, D=[400 * 10**24, 390 * 10**24, 410 * 10**24], n=3
+    )
+    basepool.metadata = {"coins": {"names": ["DAI", "USDC", "USDT"]}}
+    metapool = SimCurveMetaPool(
+        A=1500, D=[50 * 10**24, 45 * 10**24], n=2, basepool=basepool
+    )
+    metapool.metadata = {"coins": {"names": ["FRAX", "3CRV"]}}
+
+    return {"stableswap": pool, "metapool": metapool}
+
+
+PRICES = {
+    "stableswap": {
+        ("DAI", "USDC"): 1.002,
+        ("DAI", "USDT"): 0.997,
+        ("USDC", "USDT"): 0.999,
+    },
+    "metapool": {
+        ("FRAX", "DAI"): 0.995,
+        ("FRAX", "USDC"): 1.004,
+        ("DAI", "USDC"): 1.001,
+    },
+}
+
+
+def run(pool, prices, repeat):
+    """Time `get_arb_trades` and count invariant calculations."""
+    profiler = cProfile.Profile()
+    start = perf_counter()
+    profiler.enable()
+    for _ in range(repeat):
+        get_arb_trades(pool, prices)
+    profiler.disable()
+    elapsed = perf_counter() - start
+
+    stats = pstats.Stats(profiler)
+    n_get_D = sum(
+        calls[1]
+        for (_, _, name), calls in stats.stats.items()  # pylint: disable=no-member
+        if name == "get_D"
+    )
+    return elapsed, n_get_D
+
+
+def main(repeat=5):
+    """Compare cached and uncached runs for each pool type."""
+    pool_classes = [SimCurvePool, SimCurveMetaPool]
+
+    for name, pool in make_pools().items():
+        prices = PRICES[name]
+        results = {}
+        for cache_size in (0, SimCurvePool.D_cache_size):
+            for cls in pool_classes:
+                cls.D_cache_size = cache_size
+            results[cache_size] = run(pool, prices, repeat)
+
+        (t_off, n_off), (t_on, n_on) = results.values()
+        print(f"{name}:")
+        print(f"    no cache: {t_off:.3f}s, {n_off} get_D calls")
+        print(f"    cache:    {t_on:.3f}s, {n_on} get_D calls")
+        print(f"    speedup:  {t_off / t_on:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark for the cache of price data parsed from local CSVs.
+
+Loads the CSVs in the `data` directory, as pipelines do with
+`src="local"`, without the cache, and with a warm cache, and reports the
+time per load for each.  The CSVs are copied to a temporary directory so
+no cache is written to `data`.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.local_price_cache
+"""
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from curvesim.price_data.csv_cache import local_pool_prices
+
+COINS = ["DAI", "USDC", "USDT"]
+N_LOADS = 20
+
+
+def time_loads(data_dir, cache):
+    """Returns the mean time per load, in seconds."""
+    start = perf_counter()
+    for _ in range(N_LOADS):
+        local_pool_prices(COINS, data_dir=data_dir, cache=cache)
+    return (perf_counter() - start) / N_LOADS
+
+
+def main():
+    with TemporaryDirectory() as data_dir:
+        for path in Path("data").glob("*.csv"):
+            shutil.copy(path, data_dir)
+
+        start = perf_counter()
+        local_pool_prices(COINS, data_dir=data_dir)
+        first_time = perf_counter() - start
+
+        parse_time = time_loads(data_dir, cache=False)
+        cached_time = time_loads(data_dir, cache=True)
+
+    print(f"parse CSVs:          {parse_time * 1000:8.2f} ms")
+    print(f"parse and cache:     {first_time * 1000:8.2f} ms")
+    print(f"load from cache:     {cached_time * 1000:8.2f} ms")
+    print(f"speedup:             {parse_time / cached_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
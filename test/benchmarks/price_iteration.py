@@ -0,0 +1,70 @@
+"""
+Benchmark for iterating over a :class:`PriceVolume` sampler.
+
+Times a full pass over a year of hourly prices and volumes for three coin
+pairs, as each simulation run does, with the sampler's iterator and with
+the previous per-row `iterrows` implementation, and checks that both give
+the same samples.
+
+Run from the repo root with::
+
+    python -m test.benchmarks.price_iteration
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from curvesim.iterators.price_samplers import PriceVolume, PriceVolumeSample
+
+N_TIMESTAMPS = 365 * 24
+PAIRS = [("DAI", "USDC"), ("DAI", "USDT"), ("USDC", "USDT")]
+N_PASSES = 5
+
+
+def make_sampler(seed=0):
+    """PriceVolume sampler with random prices and volumes."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-01-01", periods=N_TIMESTAMPS, freq="1h", tz="UTC")
+    shape = (N_TIMESTAMPS, len(PAIRS))
+
+    sampler = PriceVolume.__new__(PriceVolume)
+    sampler.prices = pd.DataFrame(1 + rng.normal(0, 1e-3, shape), index, PAIRS)
+    sampler.volumes = pd.DataFrame(rng.random(shape) * 10**6, index, PAIRS)
+    return sampler
+
+
+def iterrows_samples(sampler):
+    """Samples as yielded before the sampler converted rows in bulk."""
+    for (timestamp, prices), (_, volumes) in zip(
+        sampler.prices.iterrows(), sampler.volumes.iterrows()
+    ):
+        yield PriceVolumeSample(timestamp, prices.to_dict(), volumes.to_dict())
+
+
+def time_passes(iterate):
+    """Returns the fastest of `N_PASSES` full passes, in seconds."""
+    times = []
+    for _ in range(N_PASSES):
+        start = perf_counter()
+        for _ in iterate():
+            pass
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sampler = make_sampler()
+    assert list(sampler) == list(iterrows_samples(sampler))
+
+    iterrows_time = time_passes(lambda: iterrows_samples(sampler))
+    sampler_time = time_passes(lambda: sampler)
+
+    print(f"{N_TIMESTAMPS} timestamps, {len(PAIRS)} pairs")
+    print(f"iterrows: {iterrows_time * 1000:8.1f} ms")
+    print(f"sampler:  {sampler_time * 1000:8.1f} ms")
+    print(f"speedup:  {iterrows_time / sampler_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
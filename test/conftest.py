@@ -1 +1,5 @@
-pytest_plugins = ["test.fixtures.pool", "test.fixtures.sim_pools"]
+pytest_plugins = [
+    "test.fixtures.pipelines",
+    "test.fixtures.pool",
+    "test.fixtures.sim_pools",
+]
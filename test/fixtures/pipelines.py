@@ -0,0 +1,98 @@
+"""
+Toy strategies, samplers, and assertions shared by the pipeline tests.
+"""
+# pylint: disable=redefined-outer-name
+import numpy as np
+import pandas as pd
+import pytest
+
+from curvesim.iterators.param_samplers import ParameterizedPoolIterator
+from curvesim.iterators.price_samplers import PriceVolume
+from curvesim.metrics import init_metrics
+from curvesim.pipelines.common import DEFAULT_METRICS
+from curvesim.pipelines.simple.strategy import SimpleStrategy
+from curvesim.pool.sim_interface import SimCurvePool
+
+PARAMS = [{"A": A, "fee": fee} for A in [10, 100, 1000] for fee in [1, 2]]
+
+
+def param_sampler(params=None):
+    """Run numbers and parameters, as yielded by a parameter sampler."""
+    return list(enumerate(params or PARAMS))
+
+
+def toy_results(pool, params, prices, **summary):
+    """
+    Per-run, per-trade, and summary DataFrames, as returned by a strategy.
+    The summary holds `pool` and any keyword arguments.
+    """
+    data_per_run = pd.DataFrame([params])
+    data_per_trade = pd.DataFrame(
+        {"price": [p * params["A"] for p in prices]}, dtype=float
+    )
+    summary_data = pd.DataFrame([{"pool": pool, **summary}])
+    return data_per_run, data_per_trade, summary_data
+
+
+def strategy(pool, params, price_sampler):
+    """Toy strategy scaling each price by `A`."""
+    return toy_results(pool, params, price_sampler, fee=params["fee"])
+
+
+def assert_results_equal(results, expected):
+    """Asserts each DataFrame of each run matches the expected results."""
+    for result_data, expected_data in zip(results, expected):
+        assert len(result_data) == len(expected_data)
+        for data, expected_df in zip(result_data, expected_data):
+            pd.testing.assert_frame_equal(data, expected_df)
+
+
+def make_price_volume(pairs, periods=100, random_walk=False):
+    """
+    PriceVolume sampler with random volumes and random prices, or a random
+    walk of prices near one.
+    """
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=periods, freq="30min", tz="UTC")
+    shape = (periods, len(pairs))
+    if random_walk:
+        prices = 1 + np.cumsum(rng.normal(0, 1e-3, shape), axis=0)
+    else:
+        prices = rng.random(shape)
+
+    sampler = PriceVolume.__new__(PriceVolume)
+    sampler.prices = pd.DataFrame(prices, index=index, columns=pairs)
+    sampler.volumes = pd.DataFrame(rng.random(shape), index=index, columns=pairs)
+    return sampler
+
+
+def make_test_pool():
+    """Stableswap pool with the metadata needed by the strategies."""
+    pool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    pool.metadata = {
+        "coins": {"names": ["USDC", "USDT"], "addresses": ["0x0", "0x1"]},
+        "chain": "mainnet",
+        "symbol": "TEST",
+    }
+    return pool
+
+
+def make_simple_pipeline(variable_params):
+    """Parameter sampler and simple strategy for a sweep over a test pool."""
+    pool = make_test_pool()
+    # pylint: disable-next=abstract-class-instantiated
+    param_sampler = ParameterizedPoolIterator(pool, variable_params)
+    strategy = SimpleStrategy(init_metrics(DEFAULT_METRICS, pool=pool))
+    return param_sampler, strategy
+
+
+@pytest.fixture(scope="function")
+def price_volume():
+    """PriceVolume sampler with random data for two coin pairs."""
+    return make_price_volume([("A", "B"), ("A", "C")])
+
+
+@pytest.fixture(scope="module")
+def random_walk_price_volume():
+    """PriceVolume sampler with a random walk of prices for one coin pair."""
+    return make_price_volume([("USDC", "USDT")], periods=200, random_walk=True)
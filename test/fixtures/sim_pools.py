@@ -14,8 +14,8 @@ def sim_curve_pool():
     return SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
 
 
-@pytest.fixture(scope="function")
-def sim_curve_meta_pool():
+def make_sim_curve_meta_pool():
+    """Metapool over a stableswap basepool, built anew on each call."""
     basepool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
 
     kwargs = {
@@ -29,6 +29,11 @@ def sim_curve_meta_pool():
     return SimCurveMetaPool(**kwargs)
 
 
+@pytest.fixture(scope="function")
+def sim_curve_meta_pool():
+    return make_sim_curve_meta_pool()
+
+
 @pytest.fixture(scope="function")
 def sim_curve_rai_pool():
     basepool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
@@ -45,8 +50,8 @@ def sim_curve_rai_pool():
     return SimCurveRaiPool(**kwargs)
 
 
-@pytest.fixture(scope="function")
-def sim_curve_crypto_pool():
+def make_sim_curve_crypto_pool():
+    """Two-coin cryptoswap pool, built anew on each call."""
     kwargs = {
         "A": 400000,
         "gamma": 72500000000000,
@@ -69,6 +74,11 @@ def sim_curve_crypto_pool():
     return SimCurveCryptoPool(**kwargs)
 
 
+@pytest.fixture(scope="function")
+def sim_curve_crypto_pool():
+    return make_sim_curve_crypto_pool()
+
+
 @pytest.fixture(scope="function")
 def sim_curve_tricrypto_pool():
     kwargs = {
@@ -95,3 +105,28 @@ def sim_curve_tricrypto_pool():
     }
 
     return SimCurveCryptoPool(**kwargs)
+
+
+@pytest.fixture(scope="function")
+def sim_curve_balanced_tricrypto_pool():
+    """Tricrypto pool with balances and LP supply consistent with D, for trading."""
+    kwargs = {
+        "A": 1707629,
+        "gamma": 11809167828997,
+        "n": 3,
+        "precisions": [1, 1, 1],
+        "mid_fee": 3000000,
+        "out_fee": 30000000,
+        "allowed_extra_profit": 2000000000000,
+        "fee_gamma": 500000000000000,
+        "adjustment_step": 490000000000000,
+        "admin_fee": 5000000000,
+        "ma_half_time": 865,
+        "price_scale": [30453123431671769818574, 1871140849377954208512],
+        "D": 3 * 18418434882428000000000000,
+        "tokens": 47986553926751950746367000,
+        "xcp_profit": 1000448625854298803,
+        "xcp_profit_a": 1000440033249679801,
+    }
+
+    return SimCurveCryptoPool(**kwargs)
@@ -0,0 +1,92 @@
+"""Unit tests for the adaptive parameter sampler."""
+import numpy as np
+import pytest
+
+from curvesim.exceptions import ParameterSamplerError
+from curvesim.iterators.param_samplers import AdaptivePoolSampler
+from curvesim.metrics import init_metrics
+from curvesim.pipelines.common import DEFAULT_METRICS
+from curvesim.pipelines.search import adaptive_search
+from curvesim.pipelines.simple.strategy import SimpleStrategy
+
+from ..fixtures.pipelines import make_price_volume, make_test_pool
+
+BOUNDS = {"A": (10, 10000), "fee": (10**6, 10**8)}
+
+
+def objective(params):
+    """Smooth objective with its maximum at A=1000, fee=0.1%."""
+    return -np.log10(params["A"] / 1000) ** 2 - np.log10(params["fee"] / 10**7) ** 2
+
+
+def run_sampler(sampler, n_batches):
+    for _ in range(n_batches):
+        sampler.tell([objective(params) for _, params in sampler])
+    return sampler
+
+
+def test_proposals():
+    """Test proposals are within bounds, rounded, and set on the pools."""
+    sampler = AdaptivePoolSampler(make_test_pool(), BOUNDS, batch_size=4, seed=0)
+    run_sampler(sampler, 3)
+
+    history = sampler.history
+    assert len(history) == 12
+    assert list(history.columns) == ["A", "fee", "score"]
+    for name, (low, high) in BOUNDS.items():
+        assert history[name].between(low, high).all()
+        assert all(isinstance(value, int) for value in history[name])
+
+    for pool, params in sampler:
+        assert pool.A == params["A"]
+        assert pool.fee == params["fee"]
+
+    # proposals stay the same until scores are received
+    assert sampler.proposals == [params for _, params in sampler]
+
+
+def test_improves_on_random():
+    """Test the surrogate model finds better parameters than random search."""
+    adaptive = AdaptivePoolSampler(make_test_pool(), BOUNDS, batch_size=4, seed=1)
+    random = AdaptivePoolSampler(
+        make_test_pool(), BOUNDS, batch_size=4, n_initial=40, seed=1
+    )
+    run_sampler(adaptive, 10)
+    run_sampler(random, 10)
+
+    assert adaptive.best[1] > random.best[1]
+    assert adaptive.best[1] > -0.05
+
+
+def test_minimize():
+    """Test the lowest objective value is best when minimizing."""
+    sampler = AdaptivePoolSampler(make_test_pool(), BOUNDS, maximize=False, seed=0)
+    sampler.tell([3.0, np.nan, 1.0, 2.0])
+    assert sampler.best == (sampler.observed_params[2], 1.0)
+
+
+def test_invalid_scores():
+    """Test an error is raised if scores don't match the proposals."""
+    sampler = AdaptivePoolSampler(make_test_pool(), BOUNDS, batch_size=4)
+    with pytest.raises(ParameterSamplerError):
+        sampler.tell([1.0, 2.0])
+
+    with pytest.raises(ParameterSamplerError):
+        AdaptivePoolSampler(make_test_pool(), {"A": (100, 10)})
+
+
+def test_adaptive_search():
+    """Test batches are run and their summary statistics passed back."""
+    price_sampler = make_price_volume([("USDC", "USDT")], random_walk=True)
+
+    pool = make_test_pool()
+    sampler = AdaptivePoolSampler(pool, BOUNDS, batch_size=2, n_initial=2, seed=0)
+    strategy = SimpleStrategy(init_metrics(DEFAULT_METRICS, pool=pool))
+
+    best, history = adaptive_search(sampler, price_sampler, strategy, 2, ncpu=1)
+
+    assert len(history) == 4
+    assert best == (
+        history.iloc[history["score"].idxmax()][["A", "fee"]].to_dict(),
+        history["score"].max(),
+    )
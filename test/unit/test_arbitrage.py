@@ -0,0 +1,144 @@
+"""Unit tests for the arbitrage sizing and traders in the pipelines"""
+from copy import deepcopy
+from unittest.mock import patch
+
+import pytest
+
+from curvesim.pipelines import common
+from curvesim.pipelines.common import get_arb_pairs, get_arb_trades
+from curvesim.pipelines.simple import trader as simple_trader
+from curvesim.pipelines.simple.trader import SimpleArbitrageur
+from curvesim.pipelines.vol_limited_arb import trader as vol_limited_trader
+from curvesim.pipelines.vol_limited_arb.trader import (
+    VolumeLimitedArbitrageur,
+    multipair_optimal_arbitrage,
+)
+from curvesim.pool.sim_interface import SimCurvePool
+from curvesim.templates import SimPool
+
+
+def test_get_arb_trades(sim_curve_pool):
+    """Test Newton's method arbitrage sizes against Brent's method."""
+    pool = sim_curve_pool
+    pool.trade(0, 1, 10**23)
+    price = pool.price(0, 1, use_fee=False)
+
+    for deviation in [0.999, 0.99, 1.001, 1.01]:
+        prices = {(0, 1): price * deviation}
+        trades = get_arb_trades(pool, prices)
+        with patch.object(common, "_newton_arb_size", return_value=None):
+            expected_trades = get_arb_trades(pool, prices)
+
+        for (size, coins, target), (
+            expected_size,
+            expected_coins,
+            expected_target,
+        ) in zip(trades, expected_trades):
+            assert size == pytest.approx(expected_size, rel=1e-8)
+            assert coins == expected_coins
+            assert target == expected_target
+
+    # pools without post-trade prices fall back to Brent's method
+    with patch.object(SimCurvePool, "post_trade_price", SimPool.post_trade_price):
+        assert get_arb_trades(pool, prices) == expected_trades
+
+
+def test_multipair_optimal_arbitrage():
+    """Test the analytic Jacobian against finite differences in the optimizer."""
+    pool = SimCurvePool(A=250, D=[10**24, 2 * 10**24, 3 * 10**24], n=3)
+    prices = {(0, 1): 1.002, (0, 2): 1.001, (1, 2): 1.004}
+    limits = {pair: 10**5 for pair in prices}
+    limits.update({pair[::-1]: limit for pair, limit in limits.items()})
+
+    trades, errors, _ = multipair_optimal_arbitrage(pool, prices, limits)
+    with patch.object(SimCurvePool, "price_jacobian", SimPool.price_jacobian):
+        expected_trades, expected_errors, _ = multipair_optimal_arbitrage(
+            pool, prices, limits
+        )
+
+    # the optimum is flat, so sizes are less precise than the price errors
+    assert len(trades) == len(expected_trades)
+    for trade, expected in zip(trades, expected_trades):
+        assert (trade.coin_in, trade.coin_out) == (expected.coin_in, expected.coin_out)
+        assert trade.amount_in == pytest.approx(expected.amount_in, rel=1e-2)
+    assert list(errors) == pytest.approx(list(expected_errors), rel=1e-2)
+    assert sum(errors**2) == pytest.approx(sum(expected_errors**2), rel=1e-6)
+
+
+def test_arbitrageur_limited_pairs():
+    """Test that trades at their volume limits start there in the next timestep."""
+    pool = SimCurvePool(A=250, D=[10**24, 2 * 10**24, 3 * 10**24], n=3)
+    trader = VolumeLimitedArbitrageur(pool)
+    limits = {(0, 1): 1000, (0, 2): 3 * 10**5, (1, 2): 3 * 10**5}
+    limits.update({pair[::-1]: limit for pair, limit in limits.items()})
+
+    search_counts = []
+    for prices in [
+        {(0, 1): 1.002, (0, 2): 1.001, (1, 2): 1.004},
+        {(0, 1): 1.0, (0, 2): 0.999, (1, 2): 1.001},
+    ]:
+        expected_trades, expected_errors, _ = multipair_optimal_arbitrage(
+            deepcopy(pool), prices, limits
+        )
+        with patch.object(common, "_newton_search", wraps=common._newton_search) as f:
+            trades, data = trader.compute_trades(prices, limits)
+        search_counts.append(f.call_count)
+
+        assert trades == expected_trades
+        assert list(data["price_errors"]) == list(expected_errors)
+        assert data["optimizer_iterations"] > 0
+        assert data["optimizer_nfev"] >= data["optimizer_iterations"]
+        assert data["skipped_steps"] == 0
+        assert trader.optimizer_state.limited_pairs == {(0, 1), (0, 2)}
+        trader.do_trades(trades)
+
+    # limited pairs aren't searched for in the second timestep
+    assert search_counts == [3, 1]
+
+
+def test_arbitrageur_skipped_steps():
+    """Test that timesteps with prices inside the fee band are skipped."""
+    pool = SimCurvePool(A=250, D=[10**24, 2 * 10**24, 3 * 10**24], n=3)
+    pairs = [(0, 1), (0, 2), (1, 2)]
+    limits = {pair: 10**5 for pair in pairs}
+    limits.update({pair[::-1]: limit for pair, limit in limits.items()})
+
+    # geometric mean of the pool's bid and ask prices
+    prices = {
+        pair: (pool.price(*pair) / pool.price(*pair[::-1])) ** 0.5 for pair in pairs
+    }
+    arb_pairs, errors = get_arb_pairs(pool, prices)
+    assert not arb_pairs.any()
+
+    _, expected_errors, _ = multipair_optimal_arbitrage(pool, prices, limits)
+    assert list(errors) == list(expected_errors)
+
+    vol_limited_arbitrageur = VolumeLimitedArbitrageur(pool)
+    simple_arbitrageur = SimpleArbitrageur(pool)
+    with patch.object(vol_limited_trader, "least_squares") as least_squares:
+        trades, data = vol_limited_arbitrageur.compute_trades(prices, limits)
+        assert trades == []
+        assert list(data["price_errors"]) == list(expected_errors)
+        assert data["skipped_steps"] == 1
+        least_squares.assert_not_called()
+
+    with patch.object(simple_trader, "get_arb_trades") as get_arb_trades_mock:
+        assert simple_arbitrageur.compute_trades(prices) == (
+            [],
+            {"price_errors": [], "skipped_steps": 1},
+        )
+        get_arb_trades_mock.assert_not_called()
+
+    prices[(0, 2)] *= 1.01
+    arb_pairs, _ = get_arb_pairs(pool, prices)
+    assert list(arb_pairs) == [False, True, False]
+
+    trades, data = vol_limited_arbitrageur.compute_trades(prices, limits)
+    assert trades
+    assert data["skipped_steps"] == 0
+    trades, data = simple_arbitrageur.compute_trades(prices)
+    assert trades
+    assert data["skipped_steps"] == 0
+
+    assert vol_limited_arbitrageur.skipped_steps == 1
+    assert simple_arbitrageur.skipped_steps == 1
@@ -0,0 +1,35 @@
+"""Unit tests for atomic file writes."""
+import pytest
+
+from curvesim.utils import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    """Test files are replaced whole, creating parent directories."""
+    path = tmp_path / "sub" / "data.json"
+    with atomic_write(path) as f:
+        f.write("old")
+    with atomic_write(path) as f:
+        f.write("new")
+        assert path.read_text() == "old"
+
+    assert path.read_text() == "new"
+    assert [p.name for p in path.parent.iterdir()] == ["data.json"]
+
+    with atomic_write(path, "wb") as f:
+        f.write(b"\x00")
+    assert path.read_bytes() == b"\x00"
+
+
+def test_atomic_write_error(tmp_path):
+    """Test a failed write leaves the file unchanged and no temporary file."""
+    path = tmp_path / "data.json"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write("partial")
+            raise RuntimeError("Interrupted")
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
@@ -0,0 +1,194 @@
+"""Unit tests for checkpointing pipeline runs."""
+import os
+
+import pytest
+
+from curvesim.iterators.param_samplers import ParameterizedPoolIterator
+from curvesim.metrics.metrics import PriceDepth
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.checkpoint import Checkpoint
+from curvesim.pipelines.simple.strategy import SimpleStrategy
+
+from ..fixtures.pipelines import (
+    PARAMS,
+    assert_results_equal,
+    make_test_pool,
+    param_sampler,
+    toy_results,
+)
+from ..fixtures.sim_pools import make_sim_curve_crypto_pool, make_sim_curve_meta_pool
+
+
+class Strategy:
+    """Strategy that records its runs and can fail on a given run."""
+
+    runs = []
+    fail_on = None
+
+    def __init__(self, scale):
+        self.scale = scale
+
+    def __call__(self, pool, params, price_sampler):
+        if pool == self.fail_on:
+            raise RuntimeError("Simulated failure")
+        self.runs.append(pool)
+        return toy_results(pool, params, [p * self.scale for p in price_sampler])
+
+
+@pytest.fixture(autouse=True)
+def reset_strategy():
+    Strategy.runs = []
+    Strategy.fail_on = None
+    PoolStrategy.runs = []
+    PoolStrategy.fail_on = None
+
+
+def test_resume(tmp_path):
+    """Test an interrupted sweep resumes from the completed runs."""
+    checkpoint_dir = str(tmp_path)
+    prices = [1, 2, 3]
+    expected = run_pipeline(param_sampler(), prices, Strategy(2), ncpu=1)
+
+    Strategy.runs = []
+    Strategy.fail_on = 4
+    with pytest.raises(RuntimeError):
+        run_pipeline(
+            param_sampler(), prices, Strategy(2), ncpu=1, checkpoint_dir=checkpoint_dir
+        )
+    assert Strategy.runs == [0, 1, 2, 3]
+    assert len(os.listdir(checkpoint_dir)) == 4
+
+    Strategy.runs = []
+    Strategy.fail_on = None
+    progress = []
+    results = run_pipeline(
+        param_sampler(),
+        prices,
+        Strategy(2),
+        ncpu=1,
+        checkpoint_dir=checkpoint_dir,
+        progress=lambda done, total: progress.append(done),
+    )
+    assert Strategy.runs == [4, 5]
+    assert progress == [1, 2, 3, 4, 5, 6]
+    assert_results_equal(results, expected)
+
+    # loaded runs are reported, even if no run is left to simulate
+    progress = []
+    results = run_pipeline(
+        param_sampler(),
+        prices,
+        Strategy(2),
+        ncpu=2,
+        checkpoint_dir=checkpoint_dir,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert Strategy.runs == [4, 5]
+    assert progress == [(n, len(PARAMS)) for n in range(1, len(PARAMS) + 1)]
+    assert_results_equal(results, expected)
+
+
+def test_key_changes(tmp_path):
+    """Test runs aren't reused when the price data or strategy change."""
+    checkpoint_dir = str(tmp_path)
+    run_pipeline(
+        param_sampler(), [1, 2], Strategy(2), ncpu=1, checkpoint_dir=checkpoint_dir
+    )
+    assert len(Strategy.runs) == len(PARAMS)
+
+    run_pipeline(
+        param_sampler(), [1, 3], Strategy(2), ncpu=1, checkpoint_dir=checkpoint_dir
+    )
+    assert len(Strategy.runs) == 2 * len(PARAMS)
+
+    run_pipeline(
+        param_sampler(), [1, 2], Strategy(3), ncpu=1, checkpoint_dir=checkpoint_dir
+    )
+    assert len(Strategy.runs) == 3 * len(PARAMS)
+
+    assert len(os.listdir(checkpoint_dir)) == 3 * len(PARAMS)
+
+
+def test_metric_settings_key(tmp_path):
+    """Test runs aren't reused when metric settings change."""
+    pool = make_test_pool()
+    keys = []
+    for factor in [10**8, 10**8, 10**6]:
+        # metrics bound to different pools with the same settings match
+        strategy = SimpleStrategy([PriceDepth(make_test_pool(), factor=factor)])
+        keys.append(Checkpoint(str(tmp_path), [1, 2], strategy).key(pool, {}))
+
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+
+
+def new_session_pool(make_pool):
+    """
+    Builds the pool as a new session would, with a later block timestamp
+    and, for stableswap pools, a primed invariant cache.
+    """
+    pool = make_pool()
+    if hasattr(pool, "_block_timestamp"):
+        pool._block_timestamp += 3600  # pylint: disable=protected-access
+    if hasattr(pool, "_D_cache"):
+        pool.D()
+    return pool
+
+
+class PoolStrategy:
+    """Strategy for real pools that records its runs and can fail on a run."""
+
+    runs = []
+    fail_on = None
+
+    def __call__(self, pool, params, price_sampler):
+        if params == self.fail_on:
+            raise RuntimeError("Simulated failure")
+        self.runs.append(params)
+        return toy_results(pool.A, params, price_sampler)
+
+
+POOL_CASES = [
+    (
+        make_sim_curve_crypto_pool,
+        {"A": [400000, 800000], "gamma": [10**13, 10**14]},
+    ),
+    (make_sim_curve_meta_pool, {"A": [100, 250], "fee": [10**6, 4 * 10**6]}),
+]
+
+
+@pytest.mark.parametrize("make_pool, variable_params", POOL_CASES)
+def test_pool_key_stable(tmp_path, make_pool, variable_params):
+    """Test the same pool built in separate sessions has the same key."""
+    checkpoint = Checkpoint(str(tmp_path), [1, 2], PoolStrategy())
+    params = {name: values[0] for name, values in variable_params.items()}
+
+    pool = make_pool()
+    other_pool = new_session_pool(make_pool)
+    assert checkpoint.key(pool, params) == checkpoint.key(other_pool, params)
+
+    other_pool.balances = [balance + 1 for balance in other_pool.balances]
+    assert checkpoint.key(pool, params) != checkpoint.key(other_pool, params)
+
+
+@pytest.mark.parametrize("make_pool, variable_params", POOL_CASES)
+def test_pool_resume(tmp_path, make_pool, variable_params):
+    """Test a sweep over real pools resumes with pools built anew."""
+    checkpoint_dir = str(tmp_path)
+    prices = [1, 2, 3]
+    sampler = ParameterizedPoolIterator(make_pool(), variable_params)
+    params = [params for _, params in sampler]
+
+    PoolStrategy.runs = []
+    PoolStrategy.fail_on = params[-1]
+    with pytest.raises(RuntimeError):
+        run_pipeline(
+            sampler, prices, PoolStrategy(), ncpu=1, checkpoint_dir=checkpoint_dir
+        )
+    assert PoolStrategy.runs == params[:-1]
+
+    PoolStrategy.runs = []
+    PoolStrategy.fail_on = None
+    sampler = ParameterizedPoolIterator(new_session_pool(make_pool), variable_params)
+    run_pipeline(sampler, prices, PoolStrategy(), ncpu=1, checkpoint_dir=checkpoint_dir)
+    assert PoolStrategy.runs == params[-1:]
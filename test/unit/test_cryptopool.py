@@ -1,5 +1,6 @@
 """Unit tests for CurveCryptoPool"""
 import boa
+import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis import strategies as st
 
@@ -775,3 +776,25 @@ def test_dydxfee(vyper_cryptopool):
     dx *= precisions[i]
     dy *= precisions[j]
     assert abs(dydx - dy / dx) < 1e-6
+
+
+def test_float_math(vyper_cryptopool):
+    """Test float math results against exact math."""
+    pool = initialize_pool(vyper_cryptopool)
+    float_pool = initialize_pool(vyper_cryptopool)
+    float_pool.math = "float"
+
+    for i, j in [(0, 1), (1, 0)]:
+        assert float_pool.dydxfee(i, j) == pytest.approx(pool.dydxfee(i, j), rel=1e-12)
+
+        tol = pool.D * 1e-14
+        dx = pool.balances[i] // 100
+        dy, fee = pool.exchange(i, j, dx)
+        float_dy, float_fee = float_pool.exchange(i, j, dx)
+
+        # amount errors scale with the pool balances rather than the trade size
+        assert float_dy == pytest.approx(dy, abs=tol)
+        assert float_fee == pytest.approx(fee, abs=tol)
+        assert float_pool.D == pytest.approx(pool.D, rel=1e-13)
+        for p, float_p in zip(pool.price_scale, float_pool.price_scale):
+            assert float_p == pytest.approx(p, rel=1e-12)
@@ -0,0 +1,102 @@
+"""Unit tests for the cache of parsed local price data."""
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from curvesim.network import nomics
+from curvesim.price_data.csv_cache import CACHE_DIR, local_pool_prices
+
+COINS = ["DAI", "USDC", "USDT"]
+DATA_DIR = Path(__file__).parents[2] / "data"
+
+
+@pytest.fixture(scope="function")
+def data_dir(tmp_path):
+    """Copy of the local price data CSVs."""
+    for path in DATA_DIR.glob("*.csv"):
+        shutil.copy(path, tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="function")
+def parse_count(monkeypatch):
+    """Counts calls to the CSV parser."""
+    calls = []
+    parse = nomics.local_pool_prices
+
+    def counted_parse(*args, **kwargs):
+        calls.append(args)
+        return parse(*args, **kwargs)
+
+    monkeypatch.setattr(nomics, "local_pool_prices", counted_parse)
+    return calls
+
+
+def assert_data_equal(data, expected):
+    for frame, expected_frame in zip(data[:2], expected[:2]):
+        pd.testing.assert_frame_equal(frame, expected_frame)
+        assert frame.index.freq == expected_frame.index.freq
+    pd.testing.assert_series_equal(data[2], expected[2])
+
+
+def test_cache(data_dir, parse_count):
+    """Test cached data is reused until the arguments or CSVs change."""
+    expected = nomics.local_pool_prices(COINS, data_dir=data_dir)
+    parse_count.clear()
+
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert len(parse_count) == 1
+    assert len(list((data_dir / CACHE_DIR).glob("*.pickle"))) == 1
+
+    t_end = datetime(2022, 6, 1, tzinfo=timezone.utc)
+    data = local_pool_prices(COINS, data_dir=data_dir, t_end=t_end)
+    assert data[0].index[-1] == t_end
+    assert len(parse_count) == 2
+
+    # rewriting a CSV invalidates the entries that use it
+    csv_path = data_dir / "DAI-USDC.csv"
+    csv_data = pd.read_csv(csv_path, index_col=0)
+    csv_data["price"] *= 2
+    csv_data.to_csv(csv_path)
+
+    data = local_pool_prices(COINS, data_dir=data_dir)
+    assert len(parse_count) == 3
+    pd.testing.assert_series_equal(
+        data[0].iloc[:, 0], expected[0].iloc[:, 0] * 2, check_freq=False
+    )
+    assert len(list((data_dir / CACHE_DIR).glob("*.pickle"))) == 2
+
+
+def test_no_cache(data_dir, parse_count):
+    """Test the cache can be bypassed."""
+    local_pool_prices(COINS, data_dir=data_dir, cache=False)
+    local_pool_prices(COINS, data_dir=data_dir, cache=False)
+    assert len(parse_count) == 2
+    assert not (data_dir / CACHE_DIR).exists()
+
+
+def test_unreadable_cache(data_dir, parse_count):
+    """Test corrupt cache entries are replaced."""
+    local_pool_prices(COINS, data_dir=data_dir)
+    (entry,) = (data_dir / CACHE_DIR).glob("*.pickle")
+    entry.write_bytes(b"not a pickle")
+
+    expected = nomics.local_pool_prices(COINS, data_dir=data_dir)
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert len(parse_count) == 3
+
+
+def test_unwritable_cache(data_dir, parse_count, caplog):
+    """Test data is still loaded if the cache directory can't be written."""
+    (data_dir / CACHE_DIR).write_text("not a directory")
+
+    expected = nomics.local_pool_prices(COINS, data_dir=data_dir)
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert_data_equal(local_pool_prices(COINS, data_dir=data_dir), expected)
+    assert len(parse_count) == 3
+    assert "Could not cache price data" in caplog.text
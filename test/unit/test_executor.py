@@ -0,0 +1,175 @@
+"""Unit tests for the reusable pipeline executor."""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.pipelines import Executor, run_pipeline
+from curvesim.pipelines.executor import SerialExecutor
+
+from ..fixtures.pipelines import (
+    PARAMS,
+    assert_results_equal,
+    make_simple_pipeline,
+    param_sampler,
+    toy_results,
+)
+
+
+def strategy(pool, params, price_sampler):
+    """Returns DataFrames for the params, including the worker's process id."""
+    prices = price_sampler.prices.sum()
+    return toy_results(pool, params, prices, pid=os.getpid())
+
+
+def failing_strategy(pool, params, price_sampler):
+    """Logs a message for each run, then fails for one set of params."""
+    logging.getLogger("curvesim.test").warning("Running A=%s", params["A"])
+    if params == {"A": 100, "fee": 2}:
+        raise CurvesimValueError("Failed run")
+    return strategy(pool, params, price_sampler)
+
+
+def test_executor_reuse(price_volume):
+    """Test workers and shared data are reused across pipeline calls."""
+    expected = run_pipeline(param_sampler(), price_volume, strategy, ncpu=1)
+    expected_pid = expected[2][0]["pid"].iloc[0]
+
+    pids = set()
+    with Executor(ncpu=2) as executor:
+        for sampler in [price_volume, copy(price_volume)]:
+            results = run_pipeline(
+                param_sampler(), sampler, strategy, executor=executor
+            )
+
+            assert_results_equal(results[:2], expected[:2])
+
+            pids.update(summary["pid"].iloc[0] for summary in results[2])
+            assert len(executor._shared) == 1
+
+        ((_, shared_sampler),) = executor._shared.values()
+        names = [frame._values.name for frame in shared_sampler._shared_frames]
+
+    assert len(pids) <= 2 and expected_pid not in pids
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_max_shared(price_volume):
+    """Test the least recently used price data is freed beyond `max_shared`."""
+    with Executor(ncpu=2, max_shared=1) as executor:
+        first = executor.share(price_volume)
+        names = [frame._values.name for frame in first._shared_frames]
+
+        other = copy(price_volume)
+        other.prices = price_volume.prices * 2
+        executor.share(other)
+
+        assert len(executor._shared) == 1
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                SharedMemory(name=name)
+
+
+BACKENDS = [
+    ("multiprocessing", "fork"),
+    ("multiprocessing", "spawn"),
+    ("process", "forkserver"),
+    ("thread", None),
+    ("serial", None),
+]
+
+
+@pytest.mark.parametrize("backend,start_method", BACKENDS)
+def test_backends(price_volume, backend, start_method):
+    """Test each backend gives the same results and propagates errors."""
+    expected = run_pipeline(param_sampler(), price_volume, strategy, ncpu=1)
+
+    with Executor(2, backend=backend, start_method=start_method) as executor:
+        results = run_pipeline(
+            param_sampler(), price_volume, strategy, executor=executor
+        )
+        assert_results_equal(results[:2], expected[:2])
+
+        with pytest.raises(CurvesimValueError, match="Failed run"):
+            run_pipeline(
+                param_sampler(), price_volume, failing_strategy, executor=executor
+            )
+
+
+@pytest.mark.parametrize("backend", [ThreadPoolExecutor(2), SerialExecutor()])
+def test_futures_executor(price_volume, caplog, backend):
+    """Test concurrent.futures executors can be passed to pipelines directly."""
+    with pytest.raises(CurvesimValueError, match="Failed run"):
+        run_pipeline(
+            param_sampler(), price_volume, failing_strategy, ncpu=2, executor=backend
+        )
+    assert "Running A=10" in caplog.text
+
+    results = run_pipeline(param_sampler(), price_volume, strategy, executor=backend)
+    assert len(results[0]) == len(PARAMS)
+    assert set(summary["pid"].iloc[0] for summary in results[2]) == {os.getpid()}
+    backend.shutdown()
+
+
+@pytest.mark.parametrize("backend", ["thread", ThreadPoolExecutor(4)])
+def test_thread_metrics(random_walk_price_volume, backend):
+    """
+    Test concurrent runs of a strategy in threads each compute their metrics
+    from their own pool, matching serial runs.
+    """
+    variable_params = {"A": [10, 100, 1000, 5000]}
+    sampler, simple_strategy = make_simple_pipeline(variable_params)
+    expected = run_pipeline(sampler, random_walk_price_volume, simple_strategy, ncpu=1)
+
+    sampler, simple_strategy = make_simple_pipeline(variable_params)
+    with Executor(4, backend=backend) as executor:
+        results = run_pipeline(
+            sampler, random_walk_price_volume, simple_strategy, executor=executor
+        )
+    assert_results_equal(results, expected)
+    if isinstance(backend, ThreadPoolExecutor):
+        backend.shutdown()
+
+
+@pytest.mark.parametrize("backend", ["multiprocessing", "thread", "serial", None])
+def test_lazy_param_sampler(price_volume, backend):
+    """Test pools are drawn from the parameter sampler as workers are free."""
+    drawn = []
+
+    def sampler():
+        for run in param_sampler():
+            drawn.append(run)
+            yield run
+
+    ncpu = 1 if backend is None else 2
+    progress = []
+
+    def callback(n_finished, n_runs):
+        progress.append((n_finished, n_runs, len(drawn)))
+
+    if backend is None:
+        run_pipeline(sampler(), price_volume, strategy, ncpu=1, progress=callback)
+    else:
+        with Executor(ncpu, backend=backend) as executor:
+            run_pipeline(
+                sampler(), price_volume, strategy, executor=executor, progress=callback
+            )
+
+    assert [n_finished for n_finished, _, _ in progress] == list(
+        range(1, len(PARAMS) + 1)
+    )
+    for n_finished, n_runs, n_drawn_then in progress:
+        assert n_runs is None
+        assert n_drawn_then <= n_finished + ncpu
+
+
+def test_invalid_backend():
+    """Test unknown backend names are rejected."""
+    with pytest.raises(CurvesimValueError):
+        Executor(backend="cluster")
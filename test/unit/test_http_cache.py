@@ -0,0 +1,178 @@
+"""Unit tests for the on-disk HTTP response cache, against a local server."""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer, unused_port
+
+from curvesim.exceptions import NetworkError
+from curvesim.network import cache as cache_module
+from curvesim.network.cache import (
+    ResponseCache,
+    configure_response_cache,
+    get_response_cache,
+    is_historical,
+    use_response_cache,
+)
+from curvesim.network.http import HTTP
+
+
+def make_app(requests):
+    """App echoing each request's query or body, recording requests."""
+
+    async def get(request):
+        requests.append(("GET", dict(request.query)))
+        return web.json_response({"query": dict(request.query)})
+
+    async def post(request):
+        body = await request.json()
+        requests.append(("POST", body))
+        if body.get("query") == "{ error }":
+            return web.json_response({"errors": [{"message": "Indexing error"}]})
+        return web.json_response({"data": body})
+
+    app = web.Application()
+    app.router.add_get("/data", get)
+    app.router.add_post("/graphql", post)
+    return app
+
+
+PORT = unused_port()
+
+
+def run_requests(cache, calls):
+    """Runs HTTP calls against a local server, returning responses and requests."""
+    requests = []
+
+    async def main():
+        async with TestServer(make_app(requests), port=PORT) as server:
+            return [await call(server) for call in calls]
+
+    with use_response_cache(cache):
+        responses = asyncio.run(main())
+    return responses, requests
+
+
+def get(params, immutable=False):
+    return lambda server: HTTP.get(
+        server.make_url("/data"), params=params, immutable=immutable
+    )
+
+
+def post(body, immutable=False):
+    return lambda server: HTTP.post(
+        server.make_url("/graphql"), json=body, immutable=immutable
+    )
+
+
+def test_cache(tmp_path):
+    """Test responses are reused for the same request only."""
+    cache = ResponseCache(tmp_path)
+    calls = [
+        get({"from": "1", "to": "2"}),
+        get({"to": "2", "from": "1"}),
+        get({"from": "1", "to": "3"}),
+        post({"query": "{ pools }"}),
+        post({"query": "{ pools }"}),
+        post({"query": "{ tokens }"}),
+    ]
+    responses, requests = run_requests(cache, calls)
+
+    assert responses[0] == responses[1] == {"query": {"from": "1", "to": "2"}}
+    assert responses[2] == {"query": {"from": "1", "to": "3"}}
+    assert responses[3] == responses[4] == {"data": {"query": "{ pools }"}}
+    assert len(requests) == 4
+    assert cache.stats == {"hits": 2, "misses": 4, "expired": 0, "stores": 4}
+
+    # responses persist across caches and server restarts
+    _, requests = run_requests(ResponseCache(tmp_path), calls)
+    assert not requests
+
+
+def test_errors_not_cached(tmp_path):
+    """Test GraphQL error responses are returned but not stored."""
+    cache = ResponseCache(tmp_path)
+    calls = [post({"query": "{ error }"}, immutable=True)] * 2
+    responses, requests = run_requests(cache, calls)
+
+    assert responses == [{"errors": [{"message": "Indexing error"}]}] * 2
+    assert len(requests) == 2
+    assert cache.stats["stores"] == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_expiry(tmp_path):
+    """Test responses expire after the TTL unless immutable."""
+    cache = ResponseCache(tmp_path, ttl=-1)
+    calls = [get({"a": "1"}), get({"a": "1"}), get({"b": "1"}, immutable=True)]
+    _, requests = run_requests(cache, calls + calls)
+
+    a, b = ("GET", {"a": "1"}), ("GET", {"b": "1"})
+    assert requests == [a, a, b, a, a]
+    assert cache.stats == {"hits": 1, "misses": 2, "expired": 3, "stores": 5}
+
+
+def test_offline(tmp_path):
+    """Test recorded responses stand in for the network."""
+    recorded, _ = run_requests(ResponseCache(tmp_path, ttl=-1), [get({"a": "1"})])
+
+    cache = ResponseCache(tmp_path, offline=True)
+    responses, requests = run_requests(cache, [get({"a": "1"})])
+    assert responses == recorded
+    assert not requests
+
+    with pytest.raises(NetworkError):
+        run_requests(cache, [get({"a": "2"})])
+
+
+def test_no_cache():
+    """Test requests are always sent with caching disabled."""
+    responses, requests = run_requests(None, [get({"a": "1"}), get({"a": "1"})])
+    assert responses == [{"query": {"a": "1"}}] * 2
+    assert len(requests) == 2
+
+
+def test_disabled_by_default(tmp_path, monkeypatch):
+    """Test nothing is written to disk unless caching is enabled."""
+    monkeypatch.delenv("CURVESIM_HTTP_CACHE_DIR", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(cache_module, "_response_cache", cache_module._UNSET)
+    assert get_response_cache() is None
+
+    _, requests = run_requests(get_response_cache(), [get({"a": "1"})] * 2)
+    assert len(requests) == 2
+    assert not list(tmp_path.iterdir())
+
+    cache_dir = tmp_path / "http"
+    monkeypatch.setenv("CURVESIM_HTTP_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cache_module, "_response_cache", cache_module._UNSET)
+    assert get_response_cache().directory == cache_dir
+
+    with use_response_cache(get_response_cache()):
+        configure_response_cache(None)
+        assert get_response_cache() is None
+
+
+def test_request_not_stored(tmp_path):
+    """Test request parameters and bodies, e.g. API keys, aren't written."""
+    calls = [get({"apikey": "secret-key"}), post({"query": "secret-query"})]
+    run_requests(ResponseCache(tmp_path), calls)
+
+    paths = list(tmp_path.iterdir())
+    assert len(paths) == 2
+    for path in paths:
+        entry = json.loads(path.read_text())
+        assert set(entry) == {"expires", "response"}
+        entry["response"] = None
+        assert "secret" not in json.dumps(entry)
+
+
+def test_is_historical():
+    """Test only data more than a day old is final."""
+    now = datetime.now(timezone.utc)
+    assert is_historical(now - timedelta(days=2))
+    assert is_historical((now - timedelta(days=2)).timestamp())
+    assert not is_historical(now - timedelta(hours=1))
+    assert not is_historical(None)
@@ -0,0 +1,118 @@
+"""Unit tests for the shared HTTP session, against a local server."""
+import asyncio
+from time import perf_counter
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from curvesim.network.cache import use_response_cache
+from curvesim.network.http import HTTP
+from curvesim.network.session import (
+    TokenBucket,
+    _options,
+    configure_session,
+    get_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def session_options():
+    """Restores session options changed by a test, and disables caching."""
+    options = _options.copy()
+    with use_response_cache(None):
+        yield
+    _options.update(options)
+
+
+def make_app(connections, active=None):
+    """App recording each request's client port and the peak concurrency."""
+    active = active if active is not None else {"now": 0, "max": 0}
+
+    async def get(request):
+        connections.append(request.transport.get_extra_info("peername")[1])
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/data", get)
+    return app
+
+
+def test_connection_reuse():
+    """Test sequential requests share one connection, closed with the loop."""
+    connections = []
+
+    async def main():
+        async with TestServer(make_app(connections)) as server:
+            for _ in range(5):
+                await HTTP.get(server.make_url("/data"))
+            session = await get_session()
+        return session
+
+    session = asyncio.run(main())
+    assert len(connections) == 5
+    assert len(set(connections)) == 1
+    assert session.closed
+
+    async def same_session():
+        return await get_session() is await get_session()
+
+    assert asyncio.run(same_session())
+
+
+def test_limit_per_host():
+    """Test concurrent requests to a host are limited to the pool size."""
+    configure_session(limit_per_host=2)
+    connections = []
+    active = {"now": 0, "max": 0}
+
+    async def main():
+        async with TestServer(make_app(connections, active)) as server:
+            url = server.make_url("/data")
+            await asyncio.gather(*[HTTP.get(url) for _ in range(8)])
+
+    asyncio.run(main())
+    assert len(connections) == 8
+    assert active["max"] == 2
+    assert len(set(connections)) == 2
+
+
+def test_rate_limit():
+    """Test requests beyond the burst size are spaced out at the rate."""
+    configure_session(rate_limits={"127.0.0.1": (50, 2)})
+    try:
+
+        async def main():
+            async with TestServer(make_app([]), host="127.0.0.1") as server:
+                url = server.make_url("/data")
+                start = perf_counter()
+                await asyncio.gather(*[HTTP.get(url) for _ in range(6)])
+                return perf_counter() - start
+
+        elapsed = asyncio.run(main())
+    finally:
+        configure_session(rate_limits={"127.0.0.1": None})
+
+    assert elapsed >= 4 / 50
+
+
+def test_token_bucket():
+    """Test token bucket allows a burst, then waits for tokens."""
+
+    async def acquire_times(bucket, n):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        times = []
+        for _ in range(n):
+            await bucket.acquire()
+            times.append(loop.time() - start)
+        return times
+
+    times = asyncio.run(acquire_times(TokenBucket(20, 3), 6))
+    assert times[2] < 0.02
+    assert times[3] == pytest.approx(0.05, abs=0.03)
+    assert times[5] == pytest.approx(0.15, abs=0.05)
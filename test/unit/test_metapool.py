@@ -1,4 +1,6 @@
 """Unit tests for CurveMetaPool"""
+from copy import deepcopy
+
 import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis import strategies as st
@@ -412,3 +414,111 @@ def test_dydxfee(x0, x1, b0, b1, b2, i, j):
         tol = 0.0015
 
     assert abs(price - _dydx) < tol
+
+
+def test_D_cache(sim_curve_meta_pool):
+    """Test cached invariants track basepool changes through the metapool rates."""
+    pool = sim_curve_meta_pool
+    basepool = pool.basepool
+    D = pool.D()
+    bp_D = basepool.D()
+
+    with pool.use_snapshot_context():
+        pool.exchange_underlying(0, 1, 10**24)
+        assert basepool.D() == basepool.get_D(basepool._xp(), basepool.A)
+        assert basepool.D() != bp_D
+        assert pool.D() == pool.get_D(pool._xp(), pool.A)
+        assert pool.D() != D
+
+    assert basepool.D() == bp_D
+    assert pool.D() == D
+
+
+@pytest.mark.parametrize("pool_name", ["sim_curve_meta_pool", "sim_curve_rai_pool"])
+def test_quote_batch(pool_name, request):
+    """Test batch quotes against separate trades on the current state."""
+    pool = request.getfixturevalue(pool_name)
+    pool.trade(0, 1, 10**23)
+
+    sizes = [10**18, 10**21, 10**23]
+    pairs = [(0, 1), (1, 0), (1, 2), (0, 3), (3, 0)]  # 3 is the basepool token
+    for coin_in, coin_out in pairs:
+        dys, fees, prices = pool.quote_batch(coin_in, coin_out, sizes)
+
+        for size, dy, fee, price in zip(sizes, dys, fees, prices):
+            with pool.use_snapshot_context():
+                assert pool.trade(coin_in, coin_out, size) == (dy, fee)
+                assert pool.price(coin_in, coin_out) == price
+
+
+def test_post_trade_price(sim_curve_meta_pool):
+    """Test post-trade prices and slopes against trades on the current state."""
+    pool = sim_curve_meta_pool
+    pool.trade(0, 1, 10**23)
+
+    h = 10**20
+    pairs = [(0, 1), (1, 0), (1, 2), (0, 3), (3, 0)]  # 3 is the basepool token
+    for use_fee in [True, False]:
+        for coin_in, coin_out in pairs:
+            for size in [0, 10**21, 10**23]:
+                price, slope = pool.post_trade_price(coin_in, coin_out, size, use_fee)
+
+                with pool.use_snapshot_context():
+                    if size > 0:
+                        pool.trade(coin_in, coin_out, size)
+                    assert pool.price(coin_in, coin_out, use_fee) == price
+                    pool.trade(coin_in, coin_out, h)
+                    next_price = pool.price(coin_in, coin_out, use_fee)
+
+                # slopes ignore fees, which matter most for underlying trades
+                assert slope == pytest.approx((next_price - price) / h, rel=0.05)
+
+
+def test_price_jacobian(sim_curve_meta_pool):
+    """Test price derivatives against the price changes from trades."""
+    pool = sim_curve_meta_pool
+    pool.trade(0, 1, 10**23)
+    # derivatives ignore fees, which change the basepool virtual price
+    pool.fee = 0
+    pool.basepool.fee = 0
+    pairs = [(0, 1), (2, 0), (1, 2), (0, 3)]  # 3 is the basepool token
+    jacobian = pool.price_jacobian(pairs)
+
+    h = 10**19
+    prices = [pool.price(*pair, use_fee=False) for pair in pairs]
+    for m, pair in enumerate(pairs):
+        with pool.use_snapshot_context():
+            pool.trade(*pair, h)
+            for k, price in enumerate(prices):
+                expected = (pool.price(*pairs[k], use_fee=False) - price) / h
+                assert jacobian[k, m] == pytest.approx(
+                    expected, rel=1e-3, abs=abs(jacobian[k]).max() * 1e-3
+                )
+
+
+def test_float_math(sim_curve_meta_pool):
+    """Test float math results against exact math."""
+    pool = sim_curve_meta_pool
+    pool.trade(0, 1, 10**23)
+    float_pool = deepcopy(pool)
+    float_pool.math = "float"
+
+    assert float_pool.basepool.math == "float"
+    assert float_pool.D() == pytest.approx(pool.D(), rel=1e-13)
+
+    tol = pool.D() * 1e-14
+    sizes = [10**18, 10**21, 10**23]
+    pairs = [(0, 1), (1, 0), (1, 2), (0, 3), (3, 0)]  # 3 is the basepool token
+    for coin_in, coin_out in pairs:
+        assert float_pool.price(coin_in, coin_out) == pytest.approx(
+            pool.price(coin_in, coin_out), rel=1e-10
+        )
+
+        dys, fees, prices = pool.quote_batch(coin_in, coin_out, sizes)
+        float_dys, float_fees, float_prices = float_pool.quote_batch(
+            coin_in, coin_out, sizes
+        )
+        # amount errors scale with the pool balances rather than the trade size
+        assert list(float_dys) == pytest.approx(list(dys), rel=1e-9, abs=tol)
+        assert list(float_fees) == pytest.approx(list(fees), rel=1e-9, abs=tol)
+        assert list(float_prices) == pytest.approx(list(prices), rel=1e-10)
@@ -0,0 +1,39 @@
+"""Unit tests for order_book"""
+import curvesim
+from curvesim._order_book import order_book
+
+
+def test_order_book():
+    """Test order book depths against separate exchanges on the pool."""
+    pool = curvesim.pool.make(200, [10**24, 10**24], 2)
+    bids, asks = order_book(pool, 0, 1, resolution=10**22, show=False)
+
+    assert bids.index[-1] <= bids.index[0] * 0.9 < bids.index[-2]
+    assert asks.index[-1] >= asks.index[0] * 1.1 > asks.index[-2]
+
+    for n, depth in enumerate(bids["depth"]):
+        with pool.use_snapshot_context():
+            if n:
+                pool.exchange(0, 1, n * 10**22)
+            assert bids.index[n] == pool.dydxfee(0, 1)
+        assert depth == n * 10**22 / 10**18
+
+
+def test_order_book_light_pool():
+    """
+    Test depths aren't quoted far past the order book's width, where the
+    invariant may not converge, on a pool with little liquidity.
+    """
+    pool = curvesim.pool.make(2000, [10**18, 10**18], 2)
+    quoted = []
+    get_dy_batch = pool.get_dy_batch
+
+    def recording_get_dy_batch(i, j, dxs, use_fee=True):
+        quoted.extend(dxs)
+        return get_dy_batch(i, j, dxs, use_fee=use_fee)
+
+    pool.get_dy_batch = recording_get_dy_batch
+    bids, asks = order_book(pool, 0, 1, show=False)
+
+    assert len(bids) == len(asks) == 2
+    assert quoted == [10**23, 10**23]
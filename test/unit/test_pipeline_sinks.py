@@ -0,0 +1,112 @@
+"""Unit tests for streaming pipeline results to sinks."""
+from importlib.util import find_spec
+
+import pandas as pd
+import pytest
+
+from curvesim.exceptions import ResultsError
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.sinks import (
+    PARQUET_ENGINES,
+    RESULT_NAMES,
+    CallbackSink,
+    MemorySink,
+    ParquetSink,
+)
+
+from ..fixtures.pipelines import (
+    PARAMS,
+    assert_results_equal,
+    make_price_volume,
+    make_simple_pipeline,
+    param_sampler,
+    strategy,
+)
+
+
+@pytest.mark.parametrize("ncpu", [1, 2])
+def test_memory_sink(ncpu):
+    """Test streamed results match results without a sink."""
+    expected = run_pipeline(param_sampler(), [1, 2, 3], strategy, ncpu=1)
+
+    progress = []
+    results = run_pipeline(
+        param_sampler(),
+        [1, 2, 3],
+        strategy,
+        ncpu=ncpu,
+        sink=MemorySink(),
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert_results_equal(results, expected)
+    assert progress == [(n, len(PARAMS)) for n in range(1, len(PARAMS) + 1)]
+
+
+def test_callback_sink():
+    """Test each run's result is passed to the callback once."""
+    received = {}
+
+    def callback(run_n, result):
+        assert run_n not in received
+        received[run_n] = result
+
+    results = run_pipeline(
+        param_sampler(), [1, 2], strategy, ncpu=2, sink=CallbackSink(callback)
+    )
+
+    assert results is None
+    assert sorted(received) == list(range(len(PARAMS)))
+    for run_n, (data_per_run, _, summary_data) in received.items():
+        assert data_per_run.iloc[0].to_dict() == PARAMS[run_n]
+        assert summary_data["pool"].iloc[0] == run_n
+
+
+def test_parquet_sink(tmp_path):
+    """Test results written to Parquet files are read back in run order."""
+    pytest.importorskip("pyarrow")
+
+    expected = run_pipeline(param_sampler(), [1, 2, 3], strategy, ncpu=1)
+    sink = ParquetSink(str(tmp_path))
+    directory = run_pipeline(param_sampler(), [1, 2, 3], strategy, ncpu=2, sink=sink)
+    assert directory == str(tmp_path)
+
+    for name, expected_data in zip(
+        ["data_per_run", "data_per_trade", "summary_data"], expected
+    ):
+        data = sink.read(name)
+        runs = [[n] * len(df) for n, df in enumerate(expected_data)]
+        assert data["run"].tolist() == sum(runs, [])
+        expected_df = pd.concat(expected_data, ignore_index=True)
+        pd.testing.assert_frame_equal(data.drop(columns="run"), expected_df)
+
+
+def test_parquet_sink_strategy_output(tmp_path):
+    """
+    Test a strategy's metrics (datetime indexes, multi-level summary
+    columns) round-trip through Parquet files.
+    """
+    pytest.importorskip("pyarrow")
+    prices = make_price_volume([("USDC", "USDT")], periods=50, random_walk=True)
+
+    sampler, simple_strategy = make_simple_pipeline({"A": [10, 1000]})
+    expected = run_pipeline(sampler, prices, simple_strategy, ncpu=1)
+
+    sampler, simple_strategy = make_simple_pipeline({"A": [10, 1000]})
+    sink = ParquetSink(str(tmp_path))
+    run_pipeline(sampler, prices, simple_strategy, ncpu=1, sink=sink)
+
+    for name, expected_data in zip(RESULT_NAMES, expected):
+        data = sink.read(name)
+        expected_df = pd.concat(expected_data, ignore_index=True)
+        pd.testing.assert_frame_equal(data.drop(columns="run"), expected_df)
+
+
+@pytest.mark.skipif(
+    any(find_spec(engine) for engine in PARQUET_ENGINES),
+    reason="A Parquet engine is installed.",
+)
+def test_parquet_sink_no_engine(tmp_path):
+    """Test ParquetSink fails up front without a Parquet engine."""
+    with pytest.raises(ResultsError):
+        ParquetSink(str(tmp_path))
@@ -1,8 +1,13 @@
 """Unit tests for CurvePool"""
+from copy import deepcopy
+
+import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis import strategies as st
 
+from curvesim.exceptions import CurvesimValueError
 from curvesim.pool import CurvePool
+from curvesim.pool.sim_interface import SimCurvePool
 
 
 def initialize_pool(vyper_pool):
@@ -283,3 +288,122 @@ def test_remove_liquidity_one_coin(vyper_3pool, amount, i):
 
     assert coin_balance == expected_coin_balance
     assert lp_supply == expected_lp_supply
+
+
+def test_D_cache(sim_curve_pool):
+    """Test cached invariant stays consistent with pool state changes."""
+    pool = sim_curve_pool
+    D = pool.D()
+    assert D == pool.get_D(pool._xp(), pool.A)
+
+    with pool.use_snapshot_context():
+        pool.exchange(0, 1, 10**24)
+        assert pool.D() == pool.get_D(pool._xp(), pool.A)
+        assert pool.D() != D
+
+    assert pool.D() == D
+
+    pool.exchange(0, 1, 10**24)
+    D = pool.D()
+    pool.A = pool.A * 2
+    assert pool.D() == pool.get_D(pool._xp(), pool.A)
+    assert pool.D() != D
+
+    assert len(pool._D_cache) <= pool.D_cache_size
+
+
+def test_quote_batch(sim_curve_pool):
+    """Test batch quotes against separate trades on the current state."""
+    pool = sim_curve_pool
+    pool.trade(0, 1, 10**23)
+    pool.fee_mul = 2 * 10**10
+
+    sizes = [10**18, 10**21, 10**23, 4 * 10**23]
+    for use_fee in [True, False]:
+        for coin_in, coin_out in [(0, 1), (1, 0)]:
+            dys, fees, prices = pool.quote_batch(coin_in, coin_out, sizes, use_fee)
+
+            for size, dy, fee, price in zip(sizes, dys, fees, prices):
+                with pool.use_snapshot_context():
+                    assert pool.trade(coin_in, coin_out, size) == (dy, fee)
+                    assert pool.price(coin_in, coin_out, use_fee) == price
+
+
+def test_get_y_batch(sim_curve_pool):
+    """Test batch balances against `get_y` for each math engine."""
+    pool = sim_curve_pool
+    pool.trade(0, 1, 10**23)
+    xp = pool._xp()
+    xs = [xp[0] // 10, xp[0], xp[0] * 3]
+
+    for math in ["exact", "float"]:
+        pool.math = math
+        ys = pool.get_y_batch(0, 1, xs, xp)
+        assert list(ys) == [pool.get_y(0, 1, x, xp) for x in xs]
+
+
+def test_post_trade_price(sim_curve_pool):
+    """Test post-trade prices and slopes against trades on the current state."""
+    pool = sim_curve_pool
+    pool.trade(0, 1, 10**23)
+    pool.fee_mul = 2 * 10**10
+
+    h = 10**20
+    for use_fee in [True, False]:
+        for coin_in, coin_out in [(0, 1), (1, 0)]:
+            for size in [0, 10**21, 10**23]:
+                price, slope = pool.post_trade_price(coin_in, coin_out, size, use_fee)
+
+                with pool.use_snapshot_context():
+                    if size > 0:
+                        pool.trade(coin_in, coin_out, size)
+                    assert pool.price(coin_in, coin_out, use_fee) == price
+                    pool.trade(coin_in, coin_out, h)
+                    next_price = pool.price(coin_in, coin_out, use_fee)
+
+                assert slope == pytest.approx((next_price - price) / h, rel=1e-3)
+
+
+def test_price_jacobian():
+    """Test price derivatives against the price changes from trades."""
+    pool = SimCurvePool(A=250, D=[10**24, 2 * 10**24, 3 * 10**24], n=3)
+    pairs = [(0, 1), (2, 0), (1, 2)]
+    jacobian = pool.price_jacobian(pairs)
+
+    h = 10**19
+    prices = [pool.price(*pair, use_fee=False) for pair in pairs]
+    for m, pair in enumerate(pairs):
+        with pool.use_snapshot_context():
+            pool.trade(*pair, h)
+            for k, price in enumerate(prices):
+                expected = (pool.price(*pairs[k], use_fee=False) - price) / h
+                assert jacobian[k, m] == pytest.approx(expected, rel=1e-3)
+
+
+def test_float_math(sim_curve_pool):
+    """Test float math results against exact math."""
+    pool = sim_curve_pool
+    pool.trade(0, 1, 10**23)
+    float_pool = deepcopy(pool)
+    float_pool.math = "float"
+
+    assert float_pool.D() == pytest.approx(pool.D(), rel=1e-13)
+
+    tol = pool.D() * 1e-14
+    sizes = [10**18, 10**21, 10**23, 4 * 10**23]
+    for coin_in, coin_out in [(0, 1), (1, 0)]:
+        assert float_pool.price(coin_in, coin_out) == pytest.approx(
+            pool.price(coin_in, coin_out), rel=1e-13
+        )
+
+        dys, fees, prices = pool.quote_batch(coin_in, coin_out, sizes)
+        float_dys, float_fees, float_prices = float_pool.quote_batch(
+            coin_in, coin_out, sizes
+        )
+        # amount errors scale with the pool balances rather than the trade size
+        assert list(float_dys) == pytest.approx(list(dys), rel=1e-9, abs=tol)
+        assert list(float_fees) == pytest.approx(list(fees), rel=1e-9, abs=tol)
+        assert list(float_prices) == pytest.approx(list(prices), rel=1e-10)
+
+    with pytest.raises(CurvesimValueError):
+        pool.math = "fast"
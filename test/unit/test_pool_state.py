@@ -0,0 +1,76 @@
+"""Unit tests for immutable pool states and pure quotes on them."""
+from copy import deepcopy
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from curvesim.pool import CurvePool
+from curvesim.pool.sim_interface import SimCurvePool
+from curvesim.pool.stableswap.state import CurvePoolState, quote_trade, spot_price
+
+
+def make_pools():
+    """Stableswap pools with static and dynamic fees and mixed precisions."""
+    return [
+        CurvePool(
+            A=250,
+            D=[10**24, 2 * 10**12, 3 * 10**12],
+            n=3,
+            rates=[10**18, 10**30, 10**30],
+            admin_fee=5 * 10**9,
+        ),
+        CurvePool(
+            A=1000,
+            D=[5 * 10**23, 10**24],
+            n=2,
+            fee=3 * 10**7,
+            fee_mul=2 * 10**10,
+            admin_fee=5 * 10**9,
+        ),
+    ]
+
+
+@pytest.mark.parametrize("pool", make_pools())
+def test_quote_trade(pool):
+    """Test quotes match exchanges without changing the state."""
+    state = CurvePoolState.from_pool(pool)
+    n = pool.n
+    for i, j in [(i, j) for i in range(n) for j in range(n) if i != j]:
+        dx = pool.balances[i] // 10
+        dy, fee, new_state = quote_trade(state, i, j, dx)
+
+        traded_pool = deepcopy(pool)
+        assert (dy, fee) == traded_pool.exchange(i, j, dx)
+        assert new_state == CurvePoolState.from_pool(traded_pool)
+        assert state == CurvePoolState.from_pool(pool)
+
+        for use_fee in [False, True]:
+            assert spot_price(state, i, j, use_fee) == pool.dydx(i, j, use_fee)
+            assert spot_price(new_state, i, j, use_fee) == traded_pool.dydx(
+                i, j, use_fee
+            )
+
+
+def test_trades_chain():
+    """Test quoting on quoted states matches successive exchanges."""
+    pool = make_pools()[0]
+    state = CurvePoolState.from_pool(pool)
+    for i, j, dx in [(0, 1, 10**23), (2, 0, 5 * 10**11), (1, 2, 10**11)]:
+        dy, fee, state = quote_trade(state, i, j, dx)
+        assert (dy, fee) == pool.exchange(i, j, dx)
+
+    assert state == CurvePoolState.from_pool(pool)
+
+
+def test_sim_pool_state():
+    """Test sim pools expose their state, which can't be changed."""
+    pool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    state = pool.get_state()
+    assert state == CurvePoolState.from_pool(pool)
+
+    pool.trade(0, 1, 10**22)
+    assert state != pool.get_state()
+    assert spot_price(pool.get_state(), 0, 1, True) == pool.price(0, 1)
+
+    with pytest.raises(FrozenInstanceError):
+        state.balances = pool.balances
@@ -0,0 +1,131 @@
+"""Unit tests for the price matrices of the simulation pools."""
+from math import isnan
+
+import pytest
+
+from pandas import DataFrame
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.pipelines.common import get_arb_pairs, get_arb_target
+from curvesim.pool.sim_interface import SimCurveMetaPool, SimCurvePool, SimCurveRaiPool
+from curvesim.templates import SimAssets, SimPool
+
+POOL_TRADES = {
+    "sim_curve_pool": (0, 1, 10**21),
+    "sim_curve_meta_pool": (0, 1, 10**21),
+    "sim_curve_rai_pool": (0, 2, 10**21),
+    "sim_curve_balanced_tricrypto_pool": (0, 2, 10**24),
+}
+
+
+@pytest.mark.parametrize("pool_name", POOL_TRADES)
+@pytest.mark.parametrize("use_fee", [True, False])
+def test_price_matrix(pool_name, use_fee, request):
+    """Test the price matrix matches the pool's price for each coin pair."""
+    pool = request.getfixturevalue(pool_name)
+    pool.trade(*POOL_TRADES[pool_name])
+
+    prices = pool.price_matrix(use_fee=use_fee)
+    n = len(prices)
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                assert prices[i, j] == 1
+                continue
+            try:
+                expected = pool.price(i, j, use_fee=use_fee)
+            except CurvesimValueError:
+                # metapool LP token isn't priced in the basepool coins
+                assert isnan(prices[i, j])
+                continue
+            if pool_name == "sim_curve_balanced_tricrypto_pool":
+                assert prices[i, j] == pytest.approx(expected, rel=1e-12)
+            else:
+                assert prices[i, j] == expected
+
+
+@pytest.mark.parametrize("pool_name", ["sim_curve_meta_pool", "sim_curve_rai_pool"])
+@pytest.mark.parametrize("use_fee", [True, False])
+def test_metapool_price_matrix(pool_name, use_fee, request):
+    """
+    Test the metapool's price matrix exactly equals its price and batch quotes
+    for each coin pair, including after trades, so arbitrage targets from the
+    matrix agree with the prices used to size the trades.
+    """
+    pool = request.getfixturevalue(pool_name)
+    pool.trade(*POOL_TRADES[pool_name])
+    n_total = pool.n_total
+
+    for trade in [None, (0, n_total - 1, 10**21), (n_total - 1, 1, 10**21)]:
+        if trade:
+            pool.trade(*trade)
+        prices = pool.price_matrix(use_fee=use_fee)
+        for i in range(n_total + 1):
+            for j in range(n_total + 1):
+                if i == j or isnan(prices[i, j]):
+                    continue
+                assert prices[i, j] == pool.price(i, j, use_fee=use_fee)
+                _, _, (price,) = pool.quote_batch(i, j, [0], use_fee=use_fee)
+                assert prices[i, j] == price
+
+
+@pytest.mark.parametrize("redemption_price", [None, 3 * 10**18])
+def test_metapool_underlying_prices(redemption_price):
+    """
+    Test prices between primary and basepool coins against small trades,
+    with the basepool's virtual price above one.
+    """
+    basepool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, fee=0)
+    kwargs = {"A": 250, "D": 4000000 * 10**18, "n": 2, "basepool": basepool, "fee": 0}
+    if redemption_price is None:
+        pool = SimCurveMetaPool(**kwargs)
+    else:
+        prices = DataFrame([redemption_price], columns=["price"])
+        pool = SimCurveRaiPool(redemption_prices=prices, **kwargs)
+    basepool.tokens = basepool.tokens * 9 // 10
+
+    size = 10**14
+    for i, j in [(0, 1), (0, 2), (1, 0), (2, 0)]:
+        with pool.use_snapshot_context():
+            dy, _ = pool.trade(i, j, size)
+        assert pool.price(i, j, use_fee=False) == pytest.approx(dy / size, rel=1e-9)
+
+
+class PricedPool(SimPool):
+    """Sim pool implementing only the required methods, with coin symbols."""
+
+    symbols = ["X", "Y", "Z"]
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def price(self, coin_in, coin_out, use_fee=True):
+        i, j = self.symbols.index(coin_in), self.symbols.index(coin_out)
+        return self.pool.price(i, j, use_fee=use_fee)
+
+    def trade(self, coin_in, coin_out, size):
+        raise NotImplementedError
+
+    def get_max_trade_size(self, coin_in, coin_out, out_balance_perc=0.01):
+        raise NotImplementedError
+
+    @property
+    def assets(self):
+        return SimAssets(self.symbols, ["0x1", "0x2", "0x3"], "mainnet")
+
+
+def test_default_price_matrix():
+    """Test pools implementing only `price` get a price matrix and indices."""
+    curve_pool = SimCurvePool(A=250, D=3 * 10**24, n=3)
+    pool = PricedPool(curve_pool)
+
+    for use_fee in [True, False]:
+        prices = pool.price_matrix(use_fee=use_fee)
+        assert (prices == curve_pool.price_matrix(use_fee=use_fee)).all()
+
+    assert pool.get_asset_indices("Z", "X", 1) == [2, 0, 1]
+
+    market_prices = {("X", "Y"): 1.1, ("X", "Z"): 1.0, ("Y", "Z"): 1.0}
+    arb_pairs, _ = get_arb_pairs(pool, market_prices)
+    assert list(arb_pairs) == [True, False, False]
+    assert get_arb_target(pool, ("X", "Y"), 1.1) == (("Y", "X"), 1 / 1.1)
@@ -0,0 +1,60 @@
+"""Unit tests for price samplers."""
+import pickle
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import pandas as pd
+import pytest
+
+from curvesim.iterators.price_samplers import PriceVolumeSample
+from curvesim.iterators.price_samplers import price_volume as price_volume_module
+
+
+def total_volumes(sampler):
+    return sampler.total_volumes()
+
+
+def test_shared(price_volume):
+    """Test shared samplers unpickle to views of the same data."""
+    with price_volume.shared() as sampler:
+        data = pickle.dumps(sampler)
+        assert len(data) < price_volume.prices.to_numpy().nbytes
+
+        unpickled = pickle.loads(data)
+        pd.testing.assert_frame_equal(unpickled.prices, price_volume.prices)
+        pd.testing.assert_frame_equal(unpickled.volumes, price_volume.volumes)
+        assert not unpickled.prices.to_numpy().flags.writeable
+
+        samples = list(zip(price_volume, unpickled))
+        assert len(samples) == 100
+        for expected, sample in samples:
+            assert sample == expected
+
+        with Pool(2) as pool:
+            results = pool.map(total_volumes, [sampler] * 4)
+        assert results == [price_volume.total_volumes()] * 4
+
+        names = [frame._values.name for frame in sampler._shared_frames]
+        del unpickled, samples
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_iteration(price_volume, monkeypatch):
+    """Test samples match the rows of the price and volume DataFrames."""
+    monkeypatch.setattr(price_volume_module, "CHUNK_SIZE", 32)
+    samples = list(price_volume)
+    assert len(samples) == 100
+
+    rows = zip(price_volume.prices.iterrows(), price_volume.volumes.iterrows())
+    for sample, ((timestamp, prices), (_, volumes)) in zip(samples, rows):
+        assert sample == PriceVolumeSample(
+            timestamp, prices.to_dict(), volumes.to_dict()
+        )
+        assert all(type(price) is float for price in sample.prices.values())
+
+    price_volume.volumes = price_volume.volumes.iloc[1:]
+    with pytest.raises(AssertionError):
+        next(iter(price_volume))
@@ -0,0 +1,147 @@
+"""Unit tests for the memory-mapped price store."""
+import pickle
+from multiprocessing import Pool
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.iterators.price_samplers import PriceVolume
+from curvesim.network.nomics import local_pool_prices
+from curvesim.price_data import get
+from curvesim.price_data.store import PriceStore, csv_to_store
+
+COINS = ["DAI", "USDC", "USDT"]
+PAIRS = [("DAI", "USDC"), ("DAI", "USDT"), ("USDC", "USDT")]
+
+
+@pytest.fixture(scope="function")
+def data_dir(tmp_path):
+    """Directory of CSVs in the layout of the `data` directory."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=200, freq="30min", tz="UTC")
+    for pair in PAIRS:
+        data = pd.DataFrame(
+            {"price": 1 + rng.normal(0, 1e-3, 200), "volume": rng.random(200)},
+            index=index,
+        )
+        data.iloc[[0, 50, 51], 0] = 0
+        data.to_csv(tmp_path / f"{'-'.join(pair)}.csv")
+    return tmp_path
+
+
+def total_volumes(sampler):
+    return sampler.total_volumes()
+
+
+def test_csv_to_store(data_dir):
+    """Test stored data matches the data loaded from CSVs, without copies."""
+    store = csv_to_store(data_dir)
+    assert store.path == data_dir / "store"
+    assert store.pairs == ["DAI-USDC", "DAI-USDT", "USDC-USDT"]
+
+    prices, volumes = store.read(PAIRS)
+    expected_prices, expected_volumes, pzero = local_pool_prices(
+        COINS, data_dir=data_dir
+    )
+
+    np.testing.assert_array_equal(prices.to_numpy(), expected_prices.to_numpy())
+    np.testing.assert_array_equal(volumes.to_numpy(), expected_volumes.to_numpy())
+    pd.testing.assert_index_equal(prices.index, expected_prices.index)
+    assert prices.index.freq == expected_prices.index.freq
+    assert list(prices.columns) == PAIRS
+    assert store.pzero(PAIRS).tolist() == pzero.tolist()
+
+    for pair in PAIRS:
+        assert isinstance(prices[pair].to_numpy().base, np.memmap)
+
+
+def test_read_window(data_dir):
+    """Test reading a window of timestamps."""
+    store = csv_to_store(data_dir)
+    prices, volumes = store.read(["DAI-USDC"], "2023-01-02", "2023-01-03 00:00")
+
+    assert prices.index[0] == pd.Timestamp("2023-01-02", tz="UTC")
+    assert prices.index[-1] == pd.Timestamp("2023-01-03", tz="UTC")
+    assert len(prices) == len(volumes) == 49
+
+
+def test_read_days(data_dir):
+    """Test a `days` window returns only the rows in the last days."""
+    csv_to_store(data_dir, data_dir)
+    end = pd.Timestamp("2023-01-03 12:00", tz="UTC")
+
+    prices, volumes, _ = get(COINS, src="store", data_dir=data_dir, days=1)
+    assert prices.index[0] == pd.Timestamp("2023-01-04 03:30", tz="UTC")
+    assert prices.index[-1] == pd.Timestamp("2023-01-05 03:30", tz="UTC")
+    assert len(prices) == len(volumes) == 49
+
+    prices, _, _ = get(
+        COINS, src="store", data_dir=data_dir, days=1, end=end.timestamp()
+    )
+    assert prices.index[0] == end - pd.Timedelta(days=1)
+    assert prices.index[-1] == end
+    assert len(prices) == 49
+
+    assets = SimpleNamespace(addresses=COINS, chain="mainnet", symbol_pairs=PAIRS)
+    sampler = PriceVolume(assets, days=1, data_dir=data_dir, src="store")
+    assert len(sampler.prices) == 49
+    assert len(pickle.loads(pickle.dumps(sampler)).prices) == 49
+
+
+def test_read_shares_memory(data_dir, monkeypatch):
+    """Test frames read from the store are views of the memory-mapped files."""
+    store = csv_to_store(data_dir)
+    mmaps = []
+    load = np.load
+
+    def recording_load(*args, **kwargs):
+        array = load(*args, **kwargs)
+        mmaps.append(array)
+        return array
+
+    monkeypatch.setattr(np, "load", recording_load)
+    prices, volumes = store.read(PAIRS)
+
+    # each pair loads its timestamps, prices, and volumes
+    for k, pair in enumerate(PAIRS):
+        _, price_mmap, volume_mmap = mmaps[3 * k : 3 * k + 3]
+        assert np.shares_memory(prices[pair].to_numpy(), price_mmap)
+        assert np.shares_memory(volumes[pair].to_numpy(), volume_mmap)
+
+
+def test_unaligned_pairs(tmp_path):
+    """Test pairs with different timestamps are aligned on all of them."""
+    store = PriceStore(tmp_path)
+    index = pd.date_range("2023-01-01", periods=4, freq="1h", tz="UTC")
+    store.write("A-B", pd.Series([1.0, 2, 3, 4], index), pd.Series(1.0, index))
+    store.write("A-C", pd.Series([5.0, 6], index[2:]), pd.Series(1.0, index[2:]))
+
+    prices, _ = store.read(["A-B", "A-C"])
+    assert prices.index.equals(index)
+    assert prices["A-C"].isna().tolist() == [True, True, False, False]
+
+    with pytest.raises(CurvesimValueError):
+        store.read(["B-C"])
+
+
+def test_price_volume(data_dir):
+    """Test PriceVolume samplers reopen the store when unpickled."""
+    csv_to_store(data_dir, data_dir)
+    assets = SimpleNamespace(addresses=COINS, chain="mainnet", symbol_pairs=PAIRS)
+    sampler = PriceVolume(assets, data_dir=data_dir, src="store")
+
+    data = pickle.dumps(sampler)
+    assert len(data) < sampler.prices.to_numpy().nbytes
+    unpickled = pickle.loads(data)
+    pd.testing.assert_frame_equal(unpickled.prices, sampler.prices)
+    pd.testing.assert_frame_equal(unpickled.volumes, sampler.volumes)
+    assert list(unpickled) == list(sampler)
+
+    with sampler.shared() as shared_sampler:
+        assert shared_sampler is sampler
+        with Pool(2) as pool:
+            results = pool.map(total_volumes, [shared_sampler] * 2)
+    assert results == [sampler.total_volumes()] * 2
@@ -0,0 +1,79 @@
+"""Unit tests for the Sobol and Latin-hypercube parameter samplers."""
+import numpy as np
+import pytest
+
+from curvesim.exceptions import ParameterSamplerError
+from curvesim.iterators.param_samplers import QuasiRandomPoolIterator
+from curvesim.iterators.param_samplers.bounds import ParameterBounds
+from curvesim.iterators.param_samplers.quasi_random import (
+    QuasiRandomCurveCryptoPoolIterator,
+    QuasiRandomCurvePoolIterator,
+)
+
+CRYPTOPOOL_BOUNDS = {
+    "A": (4000, 4000000),
+    "gamma": (10**10, 2 * 10**16),
+    "mid_fee": (5 * 10**5, 10**8),
+    "out_fee": (5 * 10**5, 10**9),
+    "fee_gamma": (10**10, 10**16),
+    "ma_half_time": (60, 604800),
+}
+
+
+def test_crypto_pool(sim_curve_crypto_pool):
+    """Test 6-D samples are in bounds, rounded, and set on the pools."""
+    param_sampler = QuasiRandomPoolIterator(
+        sim_curve_crypto_pool, CRYPTOPOOL_BOUNDS, n_samples=256, seed=0
+    )
+    assert isinstance(param_sampler, QuasiRandomCurveCryptoPoolIterator)
+    assert len(param_sampler.parameter_sequence) == 256
+
+    for pool, params in param_sampler:
+        assert list(params) == list(CRYPTOPOOL_BOUNDS)
+        for name, (low, high) in CRYPTOPOOL_BOUNDS.items():
+            assert isinstance(params[name], int)
+            assert low <= params[name] <= high
+            assert getattr(pool, name) == params[name]
+
+
+@pytest.mark.parametrize("method", ["sobol", "lhs"])
+def test_stratification(sim_curve_pool, method):
+    """Test each parameter's samples fall in distinct equal-width strata."""
+    bounds = {"A": (10.0, 10000.0), "fee": (0.0, 1.0)}
+    param_sampler = QuasiRandomPoolIterator(
+        sim_curve_pool, bounds, n_samples=64, method=method, seed=0
+    )
+    assert isinstance(param_sampler, QuasiRandomCurvePoolIterator)
+
+    unit = ParameterBounds(bounds)
+    points = np.array([unit.to_unit(p) for p in param_sampler.parameter_sequence])
+    for column in points.T:
+        strata = np.floor(column * 64 + 1e-9).astype(int)
+        assert sorted(strata) == list(range(64))
+
+    # A is log-scale by default, fee is not
+    a_values = [p["A"] for p in param_sampler.parameter_sequence]
+    assert np.median(a_values) < 1000
+
+
+def test_duplicates_after_rounding(sim_curve_pool):
+    """Test parameter sets that round to the same integers are run once."""
+    param_sampler = QuasiRandomPoolIterator(
+        sim_curve_pool, {"A": (1, 4)}, n_samples=32, seed=0
+    )
+    assert sorted(p["A"] for p in param_sampler.parameter_sequence) == [1, 2, 3, 4]
+
+
+def test_invalid_inputs(sim_curve_pool):
+    """Test invalid methods and bounds are rejected."""
+    with pytest.raises(ParameterSamplerError):
+        QuasiRandomPoolIterator(sim_curve_pool, {"A": (10, 100)}, method="grid")
+
+    with pytest.raises(ParameterSamplerError):
+        QuasiRandomPoolIterator(sim_curve_pool, {"A": (100, 10)})
+
+    with pytest.raises(ParameterSamplerError):
+        QuasiRandomPoolIterator(sim_curve_pool, {"fee": (0, 10)}, log_scale=["fee"])
+
+    with pytest.raises(ParameterSamplerError):
+        QuasiRandomPoolIterator(sim_curve_pool, {"not_a_param": (1, 10)})
@@ -0,0 +1,121 @@
+"""Unit tests for the pipeline result cache."""
+import os
+
+import pytest
+
+from curvesim.iterators.param_samplers import ParameterizedPoolIterator
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.cache import ResultCache
+
+from ..fixtures.pipelines import assert_results_equal, toy_results
+from ..fixtures.sim_pools import make_sim_curve_crypto_pool, make_sim_curve_meta_pool
+
+POOL_CASES = [
+    (
+        make_sim_curve_crypto_pool,
+        {"A": [400000, 800000], "gamma": [10**13, 10**14]},
+    ),
+    (make_sim_curve_meta_pool, {"A": [100, 250], "fee": [10**6, 4 * 10**6]}),
+]
+
+
+class Strategy:
+    """Strategy that counts its runs."""
+
+    n_runs = 0
+
+    def __call__(self, pool, params, price_sampler):
+        Strategy.n_runs += 1
+        return toy_results(pool.A, params, price_sampler)
+
+
+def make_sampler(make_pool, variable_params):
+    """
+    Parameter sampler over a pool built anew, as in a new session, with a
+    later block timestamp and, for stableswap pools, a primed invariant cache.
+    """
+    pool = make_pool()
+    if hasattr(pool, "_block_timestamp"):
+        pool._block_timestamp += 3600  # pylint: disable=protected-access
+    if hasattr(pool, "_D_cache"):
+        pool.D()
+    return ParameterizedPoolIterator(pool, variable_params)
+
+
+@pytest.mark.parametrize("make_pool, variable_params", POOL_CASES)
+def test_cache_hits(tmp_path, make_pool, variable_params):
+    """
+    Test repeated runs are loaded from the cache, across pipeline calls
+    with pools built anew.
+    """
+    cache_dir = str(tmp_path)
+    n_params = len(list(make_sampler(make_pool, variable_params)))
+    Strategy.n_runs = 0
+    expected = run_pipeline(
+        make_sampler(make_pool, variable_params), [1, 2], Strategy(), ncpu=1
+    )
+
+    run_pipeline(
+        make_sampler(make_pool, variable_params),
+        [1, 2],
+        Strategy(),
+        ncpu=1,
+        cache_dir=cache_dir,
+    )
+    assert Strategy.n_runs == 2 * n_params
+
+    results = run_pipeline(
+        make_sampler(make_pool, variable_params),
+        [1, 2],
+        Strategy(),
+        ncpu=2,
+        cache_dir=cache_dir,
+    )
+    assert Strategy.n_runs == 2 * n_params
+    assert_results_equal(results, expected)
+
+    # one new run, with the rest cached
+    name, values = next(iter(variable_params.items()))
+    params = {**variable_params, name: values + [values[-1] * 2]}
+    run_pipeline(
+        make_sampler(make_pool, params), [1, 2], Strategy(), ncpu=1, cache_dir=cache_dir
+    )
+    n_new = len(list(make_sampler(make_pool, params))) - n_params
+    assert Strategy.n_runs == 2 * n_params + n_new
+
+    cache = ResultCache(cache_dir, [1, 2], Strategy())
+    assert cache.stats["entries"] == n_params + n_new
+    pool, run_params = next(iter(make_sampler(make_pool, variable_params)))
+    assert cache.load(cache.key(pool, run_params)) is not None
+    pool.balances = [balance + 1 for balance in pool.balances]
+    assert cache.load(cache.key(pool, run_params)) is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_lru_eviction(tmp_path):
+    """Test the least recently used results are evicted when over size."""
+    cache = ResultCache(str(tmp_path), [1, 2], Strategy())
+    runs = list(make_sampler(*POOL_CASES[0]))
+    result = Strategy()(*runs[0], [1, 2])
+
+    keys = [cache.key(pool, params) for pool, params in runs]
+    for n, key in enumerate(keys[:3]):
+        cache.save(key, result)
+        os.utime(cache._path(key), (n, n))
+
+    entry_size = cache.stats["size"] // 3
+    cache.max_size = 3 * entry_size
+
+    # using the oldest result makes the second oldest the least recently used
+    assert cache.load(keys[0]) is not None
+    cache.save(keys[3], result)
+
+    assert cache.load(keys[1]) is None
+    for key in [keys[0], keys[2], keys[3]]:
+        assert cache.load(key) is not None
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["size"] <= cache.max_size
+
+    cache.clear()
+    assert cache.stats["entries"] == 0
@@ -0,0 +1,88 @@
+"""Unit tests for cost-aware scheduling of pipeline runs."""
+import json
+import time
+
+import numpy as np
+
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.scheduler import CostModel, WorkerUtilization
+
+from ..fixtures.pipelines import (
+    PARAMS,
+    assert_results_equal,
+    param_sampler,
+    toy_results,
+)
+
+
+def strategy(pool, params, price_sampler):
+    """Returns DataFrames for the params, taking longer for larger A."""
+    time.sleep(params["A"] / 20000)
+    return toy_results(pool, params, price_sampler)
+
+
+def test_cost_model_order(tmp_path):
+    """Test runs are ordered longest first, estimating unseen runs."""
+    path = str(tmp_path / "history.json")
+    cost_model = CostModel(path)
+    cost_model.record(0, {"A": 10, "fee": 1}, 1.0)
+    cost_model.record(0, {"A": 300, "fee": 1}, 5.0)
+    cost_model.save()
+
+    cost_model = CostModel(path)
+    assert cost_model.estimate(0, {"A": 300, "fee": 1}) == 5.0
+    assert cost_model.estimate(0, {"A": 1000, "fee": 2}) == 5.0
+    assert cost_model.estimate(0, {"A": 20, "fee": 1}) == 1.0
+    assert cost_model.estimate(0, {"A": 20}) is None
+    assert cost_model.estimate(0.0, {"A": 20, "fee": 1}) is None
+
+    runs = [(n, (0, params)) for n, params in enumerate(PARAMS)]
+    ordered = [run_n for run_n, _ in cost_model.order(runs)]
+    assert ordered == [2, 3, 4, 5, 0, 1]
+
+    runs.append((6, (0, {"A": 20})))
+    assert cost_model.order(runs)[-1][0] == 6
+
+
+def test_cost_model_steps():
+    """Test run times are scaled to the number of timesteps."""
+    cost_model = CostModel(n_steps=100)
+    cost_model.record(0, {"A": np.int64(10)}, 2.0)
+    cost_model.n_steps = 300
+
+    assert cost_model.estimate(0, {"A": 10}) == 6.0
+    assert cost_model.estimate(0, {"A": np.int64(20)}) == 6.0
+    assert cost_model.estimate(0, {"A": True}) is None
+    assert cost_model.history["int"]["[('A', 10)]"]["params"] == {"A": 10}
+
+
+def test_run_pipeline_history(tmp_path):
+    """Test run times are recorded, without changing the results."""
+    path = str(tmp_path / "history.json")
+    expected = run_pipeline(param_sampler(), [1, 2], strategy, ncpu=1)
+
+    for _ in range(2):
+        results = run_pipeline(
+            param_sampler(), [1, 2], strategy, ncpu=2, cost_history=path
+        )
+        assert_results_equal(results, expected)
+
+    with open(path, "r", encoding="utf-8") as f:
+        history = json.load(f)
+    assert len(history["int"]) == len(PARAMS)
+
+    runs = list(enumerate(param_sampler()))
+    ordered = [params["A"] for _, (_, params) in CostModel(path).order(runs)]
+    assert ordered[:2] == [1000, 1000]
+
+
+def test_worker_utilization():
+    """Test busy time is reported as a fraction of the wall-clock time."""
+    utilization = WorkerUtilization()
+    utilization.record("a", 0.0, 3.0)
+    utilization.record("a", 3.0, 4.0)
+    utilization.record("b", 0.0, 2.0)
+
+    report = utilization.report()
+    assert report["a"] == {"runs": 2, "busy_time": 4.0, "utilization": 1.0}
+    assert report["b"] == {"runs": 1, "busy_time": 2.0, "utilization": 0.5}
@@ -0,0 +1,92 @@
+"""Unit tests for successive-halving parameter search."""
+import pandas as pd
+import pytest
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.pipelines import run_pipeline
+from curvesim.pipelines.search import (
+    _budgets,
+    _window,
+    advance_run,
+    successive_halving,
+)
+
+from ..fixtures.pipelines import make_simple_pipeline
+
+VARIABLE_PARAMS = {"A": [10, 100, 1000, 5000], "fee": [1 * 10**6, 4 * 10**6]}
+
+
+def test_budgets():
+    """Test each rung doubles the timesteps, ending with all timesteps."""
+    assert _budgets(64, 6400, 0.5, 1) == [100, 200, 400, 800, 1600, 3200, 6400]
+    assert _budgets(8, 200, 0.5, 2) == [50, 100, 200]
+    assert _budgets(2, 200, 0.5, 2) == [200]
+
+
+def test_window(random_walk_price_volume):
+    """Test windows iterate over their timesteps only."""
+    samples = list(random_walk_price_volume)
+    window = list(_window(random_walk_price_volume, 50, 100))
+    assert window == samples[50:100]
+    assert len(random_walk_price_volume.prices) == 200
+
+
+@pytest.mark.parametrize("ncpu,executor", [(1, None), (2, None), (4, "thread")])
+def test_successive_halving(random_walk_price_volume, ncpu, executor):
+    """
+    Test finalists match full runs and the best runs are kept, including
+    with runs advanced concurrently in threads.
+    """
+    param_sampler, strategy = make_simple_pipeline(VARIABLE_PARAMS)
+    expected = run_pipeline(param_sampler, random_walk_price_volume, strategy, ncpu=1)
+
+    param_sampler, strategy = make_simple_pipeline(VARIABLE_PARAMS)
+    results, history = successive_halving(
+        param_sampler,
+        random_walk_price_volume,
+        strategy,
+        n_final=2,
+        ncpu=ncpu,
+        executor=executor,
+    )
+
+    assert history.groupby("rung")["run"].count().tolist() == [8, 4, 2]
+    assert history.groupby("rung")["steps"].first().tolist() == [50, 100, 200]
+    assert history.groupby("rung")["kept"].sum().tolist() == [4, 2, 2]
+
+    first_rung = history[history["rung"] == 0].sort_values("score", ascending=False)
+    assert first_rung["kept"].tolist() == [True] * 4 + [False] * 4
+
+    finalists = sorted(history[history["rung"] == 2]["run"])
+    for result_data, expected_data in zip(results, expected):
+        assert len(result_data) == len(finalists)
+        for data, run_n in zip(result_data, finalists):
+            pd.testing.assert_frame_equal(data, expected_data[run_n])
+
+
+def test_advance_run(random_walk_price_volume):
+    """Test workers are sent and return only the run's state for the window."""
+    param_sampler, strategy = make_simple_pipeline({"A": [100]})
+    ((pool, params),) = param_sampler
+    run = strategy.start(pool, params, random_walk_price_volume)
+
+    args = (strategy, None, 0, run.pool, run.trader, random_walk_price_volume, 50, 80)
+    run_n, new_pool, trader, log_entries = advance_run(args)
+
+    assert run_n == 0
+    assert new_pool is pool and trader is run.trader
+    assert len(log_entries) == 30
+    assert not run.state_log.state_per_trade
+    timestamps = random_walk_price_volume.prices.index[50:80]
+    assert [entry["price_sample"].timestamp for entry in log_entries] == list(
+        timestamps
+    )
+
+
+def test_invalid_metric(random_walk_price_volume):
+    """Test an error is raised for metrics not in the summary data."""
+    param_sampler, strategy = make_simple_pipeline(VARIABLE_PARAMS)
+    with pytest.raises(CurvesimValueError):
+        successive_halving(
+            param_sampler, random_walk_price_volume, strategy, metric=("x", "y")
+        )
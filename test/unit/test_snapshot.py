@@ -3,7 +3,27 @@ import pytest
 
 from curvesim.exceptions import SnapshotError
 from curvesim.pool.sim_interface import SimCurveMetaPool, SimCurvePool
-from curvesim.pool.snapshot import SnapshotMixin
+from curvesim.pool.snapshot import (
+    CurveMetaPoolBalanceSnapshot,
+    CurvePoolBalanceSnapshot,
+    JournalSnapshot,
+    SnapshotMixin,
+)
+
+CRYPTO_STATE = [
+    "balances",
+    "D",
+    "tokens",
+    "price_scale",
+    "_price_oracle",
+    "last_prices",
+    "last_prices_timestamp",
+    "_block_timestamp",
+    "virtual_price",
+    "xcp_profit",
+    "xcp_profit_a",
+    "not_adjusted",
+]
 
 
 def test_snapshot_raises_exception():
@@ -99,3 +119,146 @@ def test_snapshot_context():
 
     assert pool.balances == pre_balances
     assert pool.admin_balances == pre_admin_balances
+
+
+def test_nested_snapshot_context():
+    """Test nested contexts each revert to the state on entry."""
+    pool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+
+    pre_state = (pool.balances.copy(), pool.admin_balances.copy(), pool.tokens)
+
+    with pool.use_snapshot_context() as snapshot:
+        assert isinstance(snapshot, JournalSnapshot)
+        pool.exchange(0, 1, 10**12)
+        mid_state = (pool.balances.copy(), pool.admin_balances.copy(), pool.tokens)
+
+        with pool.use_snapshot_context():
+            pool.exchange(1, 0, 10**15)
+            pool.add_liquidity([10**18, 0])
+            assert pool.tokens != pre_state[2]
+
+        assert (pool.balances, pool.admin_balances, pool.tokens) == mid_state
+
+    assert (pool.balances, pool.admin_balances, pool.tokens) == pre_state
+
+
+def test_metapool_snapshot_context():
+    """Test contexts revert basepool changes for SimCurveMetaPool."""
+    basepool = SimCurvePool(A=1000, D=2750000 * 10**18, n=2, admin_fee=5 * 10**9)
+    pool = SimCurveMetaPool(
+        A=250, D=4000000 * 10**18, n=2, admin_fee=5 * 10**9, basepool=basepool
+    )
+
+    def get_state():
+        return (
+            pool.balances.copy(),
+            pool.admin_balances.copy(),
+            basepool.balances.copy(),
+            basepool.admin_balances.copy(),
+            basepool.tokens,
+        )
+
+    pre_state = get_state()
+
+    with pool.use_snapshot_context():
+        pool.exchange(0, 1, 10**12)
+        mid_state = get_state()
+
+        with pool.use_snapshot_context():
+            pool.exchange_underlying(0, 1, 157 * 10**18)
+            pool.exchange_underlying(2, 0, 157 * 10**18)
+            assert basepool.tokens != pre_state[4]
+
+        assert get_state() == mid_state
+
+    assert get_state() == pre_state
+
+
+def test_cryptopool_snapshot_context(sim_curve_balanced_tricrypto_pool):
+    """Test contexts revert oracle and profit state for SimCurveCryptoPool."""
+    pool = sim_curve_balanced_tricrypto_pool
+
+    def get_state():
+        state = {attr: getattr(pool, attr) for attr in CRYPTO_STATE}
+        return {k: v.copy() if isinstance(v, list) else v for k, v in state.items()}
+
+    pre_state = get_state()
+
+    with pool.use_snapshot_context():
+        pool.trade(0, 2, 10**24)
+        pool._increment_timestamp(timestamp=pool._block_timestamp + 3600)
+        pool.trade(2, 1, 10**21)
+        mid_state = get_state()
+        assert mid_state["_price_oracle"] != pre_state["_price_oracle"]
+        assert mid_state["_block_timestamp"] != pre_state["_block_timestamp"]
+
+        with pool.use_snapshot_context():
+            pool.trade(1, 0, 10**19)
+            pool.add_liquidity([10**24, 0, 0])
+            pool.remove_liquidity(10**22, [0, 0, 0])
+            assert pool.tokens != mid_state["tokens"]
+
+        assert get_state() == mid_state
+
+    assert get_state() == pre_state
+
+
+def test_journal_snapshot_restore_order():
+    """Test journal snapshots can't be restored out of order."""
+    pool = SimCurvePool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+
+    outer = JournalSnapshot.create(pool)
+    JournalSnapshot.create(pool)
+
+    with pytest.raises(SnapshotError):
+        pool.revert_to_snapshot(outer)
+
+
+class DonatingPool(SimCurvePool):
+    """Pool whose exchange changes balances that it doesn't journal."""
+
+    def exchange(self, i, j, dx):
+        self.balances[j] += 10**18
+        return super().exchange(i, j, dx)
+
+
+def test_unjournaled_override():
+    """Test pools overriding journaled methods fall back to copying snapshots."""
+    pool = DonatingPool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    assert not pool.journaled
+
+    pre_balances = pool.balances.copy()
+    with pool.use_snapshot_context() as snapshot:
+        assert isinstance(snapshot, CurvePoolBalanceSnapshot)
+        pool.exchange(0, 1, 10**12)
+    assert pool.balances == pre_balances
+
+    basepool = DonatingPool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    pool = SimCurveMetaPool(
+        A=250, D=4000000 * 10**18, n=2, admin_fee=5 * 10**9, basepool=basepool
+    )
+    assert pool.journaled
+
+    pre_balances = basepool.balances.copy()
+    with pool.use_snapshot_context() as snapshot:
+        assert isinstance(snapshot, CurveMetaPoolBalanceSnapshot)
+        pool.trade(1, 2, 10**12)
+    assert basepool.balances == pre_balances
+
+
+def test_journaled_override():
+    """Test pools declaring their journaled methods keep journal snapshots."""
+
+    class JournaledPool(DonatingPool):
+        journaled = SimCurvePool.journaled
+
+        def exchange(self, i, j, dx):
+            self._journal_attrs("balances")
+            return super().exchange(i, j, dx)
+
+    pool = JournaledPool(A=250, D=1000000 * 10**18, n=2, admin_fee=5 * 10**9)
+    pre_balances = pool.balances.copy()
+    with pool.use_snapshot_context() as snapshot:
+        assert isinstance(snapshot, JournalSnapshot)
+        pool.exchange(0, 1, 10**12)
+    assert pool.balances == pre_balances
@@ -109,6 +109,10 @@ def test_get_pool_state_curve_pool(sim_curve_pool):
     state = get_pool_state(pool)
     assert state == expected_state
 
+    # later trades change balances in place
+    pool.balances[0] += 1
+    assert state["balances"][0] == pool.balances[0] - 1
+
 
 def test_get_pool_state_curve_crypto_pool(sim_curve_crypto_pool):
     """Test that get_pool_state returns the right data for SimCurveCryptoPool."""
@@ -7,6 +7,7 @@ import os
 from itertools import permutations
 
 import boa
+import pytest
 from hypothesis import HealthCheck, assume, given, settings
 from hypothesis import strategies as st
 
@@ -21,6 +22,7 @@ from curvesim.pool.cryptoswap.calcs.tricrypto_ng import (
     _newton_y,
     wad_exp,
 )
+from curvesim.pool.sim_interface import SimCurveCryptoPool
 
 
 def get_math(tricrypto):
@@ -450,3 +452,101 @@ def test_dydxfee(vyper_tricrypto):
         dx *= precisions[i]
         dy *= precisions[j]
         assert abs(dydx - dy / dx) / (dy / dx) < 1e-4
+
+
+def test_dydx_log_derivative(vyper_tricrypto):
+    """Test price slopes against the price change from a small exchange."""
+    pool = initialize_pool(vyper_tricrypto)
+
+    for i, j in permutations([0, 1, 2], 2):
+        for use_fee in [True, False]:
+            price = pool.dydx(i, j, use_fee=use_fee)
+            log_slope = pool._dydx_log_derivative(i, j, pool._xp(), pool.D, use_fee)
+
+            dx = pool.balances[i] // 10**4
+            with pool.use_snapshot_context():
+                xp = pool._xp()
+                pool.exchange(i, j, dx)
+                dxp = pool._xp()[i] - xp[i]
+                next_price = pool.dydx(i, j, use_fee=use_fee)
+
+            expected = (next_price - price) / price / dxp
+            assert log_slope == pytest.approx(expected, rel=1e-2)
+
+
+def make_sim_pool():
+    """Returns a tricrypto sim pool with typical parameters."""
+    return SimCurveCryptoPool(
+        A=1707629,
+        gamma=11809167828997,
+        n=3,
+        precisions=[1, 1, 1],
+        mid_fee=3000000,
+        out_fee=30000000,
+        allowed_extra_profit=2000000000000,
+        fee_gamma=500000000000000,
+        adjustment_step=490000000000000,
+        admin_fee=5000000000,
+        ma_half_time=865,
+        price_scale=[30453123431671769818574, 1871140849377954208512],
+        D=3 * 18418434882428000000000000,
+        tokens=47986553926751950746367000,
+        xcp_profit=1000448625854298803,
+        xcp_profit_a=1000440033249679801,
+    )
+
+
+def test_quote_batch():
+    """Test batch quotes against separate trades on the current state."""
+    pool = make_sim_pool()
+
+    for i, j in permutations([0, 1, 2], 2):
+        sizes = [pool.balances[i] * perc // 1000 for perc in [1, 10, 100]]
+        dys, fees, prices = pool.quote_batch(i, j, sizes)
+
+        for size, dy, fee, price in zip(sizes, dys, fees, prices):
+            with pool.use_snapshot_context():
+                assert (dy, fee) == pool.trade(i, j, size)
+                assert price == pool.price(i, j)
+
+
+def test_price_jacobian():
+    """Test price derivatives against the price changes from trades."""
+    pool = make_sim_pool()
+    pool.trade(0, 1, 10**23)
+    pairs = [(0, 1), (2, 0), (1, 2)]
+    jacobian = pool.price_jacobian(pairs)
+
+    prices = [pool.price(*pair, use_fee=False) for pair in pairs]
+    for m, pair in enumerate(pairs):
+        h = pool.balances[pair[0]] // 10**6
+        with pool.use_snapshot_context():
+            pool.trade(*pair, h)
+            for k, price in enumerate(prices):
+                expected = (pool.price(*pairs[k], use_fee=False) - price) / h
+                # derivatives ignore fees
+                assert jacobian[k, m] == pytest.approx(
+                    expected, rel=1e-2, abs=abs(jacobian[k]).max() * 1e-2
+                )
+
+
+def test_float_math(vyper_tricrypto):
+    """Test float math results against exact math."""
+    pool = initialize_pool(vyper_tricrypto)
+    float_pool = initialize_pool(vyper_tricrypto)
+    float_pool.math = "float"
+
+    for i, j in permutations([0, 1, 2], 2):
+        assert float_pool.dydxfee(i, j) == pytest.approx(pool.dydxfee(i, j), rel=1e-12)
+
+        tol = pool.D * 1e-14
+        dx = pool.balances[i] // 100
+        dy, fee = pool.exchange(i, j, dx)
+        float_dy, float_fee = float_pool.exchange(i, j, dx)
+
+        # amount errors scale with the pool balances rather than the trade size
+        assert float_dy == pytest.approx(dy, abs=tol)
+        assert float_fee == pytest.approx(fee, abs=tol)
+        assert float_pool.D == pytest.approx(pool.D, rel=1e-13)
+        for p, float_p in zip(pool.price_scale, float_pool.price_scale):
+            assert float_p == pytest.approx(p, rel=1e-12)